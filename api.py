@@ -0,0 +1,295 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from flask import Blueprint, current_app, jsonify, request, url_for
+from flask_login import current_user
+from sqlalchemy.orm import joinedload, load_only
+from werkzeug.datastructures import MultiDict
+from models import db, Notification, User, Laboratuvar, BetonSantrali, get_turkey_time
+from forms import NotificationForm
+from decorators import api_login_required
+from cache import active_labs, active_plants
+from conditional import conditional_response, notification_validator
+from duplicates import form_duplicates
+from queries import (parse_notification_filters, filter_notifications, search_notifications,
+                     order_newest_first, keyset_after)
+
+api = Blueprint('api', __name__, url_prefix='/api/v1')
+
+# Doğrudan sütun alanları
+COLUMN_FIELDS = {
+    'id': Notification.id,
+    'user_id': Notification.user_id,
+    'yibf_no': Notification.yibf_no,
+    'beton_miktari': Notification.beton_miktari,
+    'beton_miktari_m3': Notification.beton_miktari_m3,
+    'kat_bolge': Notification.kat_bolge,
+    'beton_santrali_id': Notification.beton_santrali_id,
+    'laboratuvar_id': Notification.laboratuvar_id,
+    'dokum_tarihi': Notification.dokum_tarihi,
+    'dokum_zamani': Notification.dokum_zamani,
+    'aciklama': Notification.aciklama,
+    'created_at': Notification.created_at,
+    'updated_at': Notification.updated_at,
+}
+# İlişkili tablodan gelen ad alanları: alan -> (ilişki adı, sütun)
+RELATION_FIELDS = {
+    'company_name': ('user', User.company_name),
+    'beton_santrali': ('beton_santrali', BetonSantrali.ad),
+    'laboratuvar': ('laboratuvar', Laboratuvar.ad),
+}
+ALL_FIELDS = list(COLUMN_FIELDS) + list(RELATION_FIELDS)
+
+# API ile değiştirilebilen alanlar (NotificationForm alanları)
+EDITABLE_FIELDS = ('yibf_no', 'beton_miktari', 'kat_bolge', 'beton_santrali_id', 'laboratuvar_id',
+                   'dokum_tarihi', 'dokum_zamani', 'aciklama')
+
+
+def api_error(status, message, **extra):
+    return jsonify({'error': message, **extra}), status
+
+
+# ==================== YARDIMCI FONKSİYONLAR ====================
+
+def _requested_fields():
+    """?fields=id,yibf_no,... parametresi (verilmezse tüm alanlar)"""
+    value = request.args.get('fields', '').strip()
+    if not value:
+        return ALL_FIELDS, []
+    fields = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in fields if name not in COLUMN_FIELDS and name not in RELATION_FIELDS]
+    return fields, unknown
+
+
+def _with_fields(query, fields):
+    """Yalnızca istenen sütunları ve ilişkileri yükle"""
+    # id ve sıralama sütunları imleç için her zaman gerekir
+    columns = {Notification.id, Notification.dokum_tarihi, Notification.dokum_dakika}
+    columns.update(COLUMN_FIELDS[name] for name in fields if name in COLUMN_FIELDS)
+    options = [load_only(*columns)]
+    for name in fields:
+        if name in RELATION_FIELDS:
+            relation, column = RELATION_FIELDS[name]
+            options.append(joinedload(getattr(Notification, relation)).load_only(column))
+    return query.options(*options)
+
+
+def _json_value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def serialize_notification(notification, fields=ALL_FIELDS):
+    data = {}
+    for name in fields:
+        if name in RELATION_FIELDS:
+            relation, column = RELATION_FIELDS[name]
+            data[name] = getattr(getattr(notification, relation), column.key)
+        else:
+            data[name] = _json_value(getattr(notification, name))
+    return data
+
+
+def encode_cursor(notification):
+    """Son satırın sıralama değerlerinden opak imleç üret"""
+    values = [notification.dokum_tarihi.isoformat(), notification.dokum_dakika, notification.id]
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """İmleci (dokum_tarihi, dokum_dakika, id) değerine çevir (geçersizse None)"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        tarih, dakika, last_id = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(last_id, int) or not (dakika is None or isinstance(dakika, int)):
+            return None
+        return date.fromisoformat(tarih), dakika, last_id
+    except (ValueError, TypeError, binascii.Error):
+        return None
+
+
+def _get_notification(id):
+    """Bildirimi yetki kontrolüyle getir: (bildirim, hata yanıtı)"""
+    notification = db.session.get(Notification, id)
+    if notification is None:
+        return None, api_error(404, 'Bildirim bulunamadı.')
+    if not notification.can_be_modified_by(current_user):
+        return None, api_error(403, 'Bu bildirime erişim yetkiniz yok.')
+    return notification, None
+
+
+def _validated_form(values):
+    """JSON verisini NotificationForm kurallarıyla doğrula: (form, hata yanıtı)"""
+    unknown = [name for name in values if name not in EDITABLE_FIELDS]
+    if unknown:
+        return None, api_error(400, 'Bilinmeyen alanlar.', fields=unknown)
+
+    formdata = MultiDict({name: str(value) for name, value in values.items() if value is not None})
+    form = NotificationForm(formdata=formdata, meta={'csrf': False})
+    form.laboratuvar_id.choices = [(lab.id, lab.ad) for lab in active_labs()]
+    form.beton_santrali_id.choices = [(santral.id, santral.ad) for santral in active_plants()]
+    if not form.validate():
+        return None, api_error(422, 'Doğrulama hatası.', errors=form.errors)
+    return form, None
+
+
+def _with_warnings(data, form):
+    """Kaydı engellemeyen form uyarılarını yanıta `warnings` olarak ekle"""
+    warning = form.beton_miktari_warning()
+    if warning:
+        data['warnings'] = {'beton_miktari': [warning]}
+    return data
+
+
+def _json_body():
+    """İstek gövdesi (application/json zorunlu - form gönderimiyle CSRF'e karşı)"""
+    if not request.is_json:
+        return None, api_error(415, 'İstek gövdesi application/json olmalıdır.')
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return None, api_error(400, 'Geçersiz JSON gövdesi.')
+    return payload, None
+
+
+# ==================== BİLDİRİMLER ====================
+
+@api.route('/notifications', methods=['GET'])
+@api_login_required
+def list_notifications():
+    """Bildirim listesi (keyset sayfalama: ?cursor=..., ?limit=..., ?fields=...)
+
+    Admin tüm bildirimleri admin filtreleriyle, kullanıcı yalnızca kendi
+    bildirimlerini görür.
+    """
+    fields, unknown = _requested_fields()
+    if unknown:
+        return api_error(400, 'Bilinmeyen alanlar.', fields=unknown)
+
+    limit = request.args.get('limit', current_app.config['ITEMS_PER_PAGE'], type=int)
+    limit = min(max(limit, 1), current_app.config['MAX_ITEMS_PER_PAGE'])
+
+    filters = parse_notification_filters(request.args)
+    # Arşiv yalnızca admin listesi ve dışa aktarımda okunur
+    filters['include_archive'] = False
+    if not current_user.is_admin():
+        filters['user_id'] = current_user.id
+
+    query = filter_notifications(Notification.query, filters, get_turkey_time().date())
+    query = search_notifications(query, request.args.get('q', '').strip())
+
+    cursor = request.args.get('cursor')
+    if cursor:
+        after = decode_cursor(cursor)
+        if after is None:
+            return api_error(400, 'Geçersiz imleç.')
+        query = keyset_after(query, after)
+
+    last_modified, count = notification_validator(query)
+
+    def render():
+        # Sonraki sayfa olup olmadığını anlamak için bir fazla satır oku
+        notifications = _with_fields(order_newest_first(query), fields).limit(limit + 1).all()
+        has_more = len(notifications) > limit
+        notifications = notifications[:limit]
+        return jsonify({
+            'data': [serialize_notification(n, fields) for n in notifications],
+            'next_cursor': encode_cursor(notifications[-1]) if has_more else None,
+            'limit': limit,
+        })
+
+    return conditional_response(render, parts=(last_modified, count),
+                                versions=('users', 'labs', 'plants'))
+
+
+@api.route('/notifications/<int:id>', methods=['GET'])
+@api_login_required
+def get_notification(id):
+    """Tek bildirim"""
+    notification, error = _get_notification(id)
+    if error:
+        return error
+
+    fields, unknown = _requested_fields()
+    if unknown:
+        return api_error(400, 'Bilinmeyen alanlar.', fields=unknown)
+    return conditional_response(lambda: jsonify(serialize_notification(notification, fields)),
+                                parts=(notification.updated_at,),
+                                versions=('users', 'labs', 'plants'))
+
+
+@api.route('/notifications', methods=['POST'])
+@api_login_required
+def create_notification():
+    """Yeni bildirim (add_notification ile aynı kurallar)"""
+    if current_user.is_admin():
+        return api_error(403, 'Admin kullanıcıları bildirim ekleyemez.')
+
+    payload, error = _json_body()
+    if error:
+        return error
+    confirm_duplicate = bool(payload.pop('confirm_duplicate', False))
+    form, error = _validated_form(payload)
+    if error:
+        return error
+    if not confirm_duplicate:
+        duplicates = form_duplicates(form, current_app.config['DUPLICATE_WINDOW_MINUTES'])
+        if duplicates:
+            return api_error(409, 'Mükerrer döküm.', duplicates=duplicates)
+
+    notification = Notification(user_id=current_user.id)
+    form.populate_obj(notification)
+    db.session.add(notification)
+    db.session.commit()
+
+    response = jsonify(_with_warnings(serialize_notification(notification), form))
+    response.status_code = 201
+    response.headers['Location'] = url_for('api.get_notification', id=notification.id)
+    return response
+
+
+@api.route('/notifications/<int:id>', methods=['PATCH'])
+@api_login_required
+def update_notification(id):
+    """Bildirim güncelleme (gönderilmeyen alanlar korunur)"""
+    notification, error = _get_notification(id)
+    if error:
+        return error
+    payload, error = _json_body()
+    if error:
+        return error
+
+    confirm_duplicate = bool(payload.pop('confirm_duplicate', False))
+    values = {name: _json_value(getattr(notification, name)) for name in EDITABLE_FIELDS}
+    values.update(payload)
+
+    form, error = _validated_form(values)
+    if error:
+        return error
+    if not confirm_duplicate:
+        duplicates = form_duplicates(form, current_app.config['DUPLICATE_WINDOW_MINUTES'], notification)
+        if duplicates:
+            return api_error(409, 'Mükerrer döküm.', duplicates=duplicates)
+
+    form.populate_obj(notification)
+    notification.updated_at = get_turkey_time()
+    db.session.commit()
+    return jsonify(_with_warnings(serialize_notification(notification), form))
+
+
+@api.route('/notifications/<int:id>', methods=['DELETE'])
+@api_login_required
+def delete_notification(id):
+    """Bildirim silme"""
+    notification, error = _get_notification(id)
+    if error:
+        return error
+
+    db.session.delete(notification)
+    db.session.commit()
+    return '', 204
+
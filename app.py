@@ -1,15 +1,43 @@
-from flask import Flask, render_template, redirect, url_for, flash, request
+from flask import (Flask, render_template, redirect, url_for, flash, request, jsonify,
+                   Response, stream_with_context, stream_template, get_flashed_messages)
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
 from flask_wtf.csrf import generate_csrf
+from werkzeug.datastructures import MultiDict
+from werkzeug.middleware.proxy_fix import ProxyFix
 from config import Config
 from models import db, User, Notification, Laboratuvar, BetonSantrali, get_turkey_time, TURKEY_TZ
 from forms import (LoginForm, ChangePasswordForm, FirstLoginPasswordForm, 
-                   NotificationForm, UserForm, LaboratuvarForm, 
+                   NotificationForm, BulkImportForm, UserForm, LaboratuvarForm, 
                    BetonSantraliForm, ResetPasswordForm)
 from decorators import admin_required, password_change_required
-from datetime import date, datetime
+from migrations import upgrade_schema
+from database import configure_sqlite, engine_options
+from auth import LoginBusy, login_retry_after, check_login_password
+from metrics import init_metrics, instrument_engine
+from assets import init_assets, download_vendor_assets, precompress_static
+from stats import (read_counters, reconcile_counters, daily_key, USERS_KEY, NOTIFICATIONS_KEY,
+                   LABS_ACTIVE_KEY, PLANTS_ACTIVE_KEY, month_range, monthly_totals, rollup_breakdown_query,
+                   rebuild_rollups)
+from cache import active_labs, active_plants, company_users, bump_version, load_cached_user
+from queries import (with_list_relations, today_notifications_query, user_notifications_query,
+                     parse_notification_filters, filter_query_args, filter_notifications,
+                     search_notifications, order_notifications, order_newest_first, keyset_after,
+                     explain_query_plan, full_table_scans)
+from conditional import conditional_response, notification_validator
+from export import export_select, iter_export_rows, generate_csv, generate_xlsx
+from backup import sqlite_database_path, backup_database, rotate_backups, list_backups, verify_backup
+from duplicates import form_duplicates, find_bulk_duplicates, duplicate_query
+from archive import (archive_notifications, delete_archived_notifications, with_archive, count_rows,
+                     archived_count)
+from api import api, encode_cursor, decode_cursor
+from live import board_rows, last_event_id, event_stream, prune_events
+from schedule import schedule_range, schedule_versions, lab_schedule, schedule_query, WEEKDAY_NAMES
+from bulk_import import IMPORT_COLUMNS, decode_upload, read_rows, validate_rows, insert_notifications
+from datetime import date, datetime, timedelta
 import pytz
 import os
+import time
+import click
 
 def get_turkey_date():
     """Türkiye'deki bugünün tarihini döndür"""
@@ -19,6 +47,16 @@ def get_turkey_date():
 app = Flask(__name__)
 app.config.from_object(Config)
 
+# Reverse proxy arkasında istemci adresi X-Forwarded-For'dan alınır (giriş sınırı IP'ye göre tutulur)
+if app.config['PROXY_FIX_X_FOR']:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['PROXY_FIX_X_FOR'])
+
+# İstek/SQL/şablon süreleri ve /metrics (diğer eklentilerden önce kaydedilmeli)
+init_metrics(app)
+
+# Parmak izli static dosyalar (asset_url) ve yanıt sıkıştırma
+init_assets(app)
+
 # CSRF token'ı tüm template'lerde kullanılabilir hale getir
 @app.context_processor
 def inject_csrf_token():
@@ -27,8 +65,14 @@ def inject_csrf_token():
 # Instance klasörünü oluştur
 os.makedirs(os.path.join(app.config['BASE_DIR'], 'instance'), exist_ok=True)
 
-# Database başlat
+# Database başlat (havuz ayarları yalnızca destekleyen URL'lerde)
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config['SQLALCHEMY_DATABASE_URI'],
+                                                         app.config['SQLALCHEMY_POOL_OPTIONS'],
+                                                         app.config.get('SQLALCHEMY_ENGINE_OPTIONS'))
 db.init_app(app)
+with app.app_context():
+    configure_sqlite(db.engine, app.config['SQLITE_PRAGMAS'])
+    instrument_engine(db.engine)
 
 # Flask-Login başlat
 login_manager = LoginManager()
@@ -37,9 +81,12 @@ login_manager.login_view = 'login'
 login_manager.login_message = 'Bu sayfaya erişmek için giriş yapmalısınız.'
 login_manager.login_message_category = 'warning'
 
+# JSON API (/api/v1)
+app.register_blueprint(api)
+
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    return load_cached_user(int(user_id))
 
 
 # ==================== GENEL ROUTE'LAR ====================
@@ -62,9 +109,21 @@ def login():
     
     form = LoginForm()
     if form.validate_on_submit():
+        # Şifre doğrulaması CPU'ya pahalı: deneme sayısı kullanıcı adı ve IP başına sınırlı
+        retry_after = login_retry_after(form.username.data, request.remote_addr)
+        if retry_after:
+            flash(f'Çok fazla giriş denemesi. Lütfen {retry_after} saniye sonra tekrar deneyin.', 'danger')
+            return render_template('login.html', form=form), 429, {'Retry-After': str(retry_after)}
+        
         user = User.query.filter_by(username=form.username.data).first()
         
-        if user and user.check_password(form.password.data):
+        try:
+            valid = user is not None and check_login_password(user, form.password.data)
+        except LoginBusy:
+            flash('Sistem şu anda yoğun. Lütfen birkaç saniye sonra tekrar deneyin.', 'warning')
+            return render_template('login.html', form=form), 429, {'Retry-After': '1'}
+        
+        if valid:
             if not user.is_active:
                 flash('Hesabınız devre dışı bırakılmış. Lütfen yönetici ile iletişime geçin.', 'danger')
                 return redirect(url_for('login'))
@@ -105,6 +164,7 @@ def change_password():
         if form.validate_on_submit():
             current_user.set_password(form.new_password.data)
             current_user.must_change_password = False
+            bump_version('users')
             db.session.commit()
             flash('Şifreniz başarıyla değiştirildi.', 'success')
             return redirect(url_for('index'))
@@ -116,6 +176,7 @@ def change_password():
                 return redirect(url_for('change_password'))
             
             current_user.set_password(form.new_password.data)
+            bump_version('users')
             db.session.commit()
             flash('Şifreniz başarıyla değiştirildi.', 'success')
             return redirect(url_for('index'))
@@ -135,12 +196,16 @@ def dashboard():
         return redirect(url_for('admin_dashboard'))
     
     today = get_turkey_date()
-    notifications = Notification.query.filter_by(
-        user_id=current_user.id,
-        dokum_tarihi=today
-    ).order_by(Notification.dokum_zamani).all()
+    query = today_notifications_query(current_user.id, today)
+    last_modified, count = notification_validator(query)
+    
+    def render():
+        notifications = with_list_relations(query, include_user=False).all()
+        return render_template('user/dashboard.html', notifications=notifications, today=today)
     
-    return render_template('user/dashboard.html', notifications=notifications, today=today)
+    # Değişiklik yoksa sayfa yeniden üretilmeden 304 döner
+    return conditional_response(render, parts=(today, last_modified, count),
+                                versions=('users', 'labs', 'plants'))
 
 
 @app.route('/notification/add', methods=['GET', 'POST'])
@@ -155,35 +220,93 @@ def add_notification():
     form = NotificationForm()
     
     # Dropdown'ları doldur (sadece aktif olanlar)
-    form.laboratuvar_id.choices = [(lab.id, lab.ad) for lab in 
-                                     Laboratuvar.query.filter_by(is_active=True).order_by(Laboratuvar.ad).all()]
-    form.beton_santrali_id.choices = [(santral.id, santral.ad) for santral in 
-                                       BetonSantrali.query.filter_by(is_active=True).order_by(BetonSantrali.ad).all()]
+    form.laboratuvar_id.choices = [(lab.id, lab.ad) for lab in active_labs()]
+    form.beton_santrali_id.choices = [(santral.id, santral.ad) for santral in active_plants()]
     
+    duplicates = []
     if form.validate_on_submit():
-        notification = Notification(
-            user_id=current_user.id,
-            yibf_no=form.yibf_no.data,
-            beton_miktari=form.beton_miktari.data,
-            kat_bolge=form.kat_bolge.data,
-            beton_santrali_id=form.beton_santrali_id.data,
-            laboratuvar_id=form.laboratuvar_id.data,
-            dokum_tarihi=form.dokum_tarihi.data,
-            dokum_zamani=form.dokum_zamani.data,
-            aciklama=form.aciklama.data
-        )
-        db.session.add(notification)
-        db.session.commit()
-        flash('Bildirim başarıyla eklendi.', 'success')
-        return redirect(url_for('dashboard'))
+        # Aynı döküm daha önce bildirildiyse kullanıcı onaylayana kadar kaydedilmez
+        if not form.confirm_duplicate.data:
+            duplicates = form_duplicates(form, app.config['DUPLICATE_WINDOW_MINUTES'])
+        if not duplicates:
+            notification = Notification(
+                user_id=current_user.id,
+                yibf_no=form.yibf_no.data,
+                beton_miktari=form.beton_miktari.data,
+                kat_bolge=form.kat_bolge.data,
+                beton_santrali_id=form.beton_santrali_id.data,
+                laboratuvar_id=form.laboratuvar_id.data,
+                dokum_tarihi=form.dokum_tarihi.data,
+                dokum_zamani=form.dokum_zamani.data,
+                aciklama=form.aciklama.data
+            )
+            db.session.add(notification)
+            db.session.commit()
+            flash('Bildirim başarıyla eklendi.', 'success')
+            if form.beton_miktari_warning():
+                flash(form.beton_miktari_warning(), 'warning')
+            return redirect(url_for('dashboard'))
     
     # Bugünün tarihini default olarak ayarla
     if request.method == 'GET':
         form.dokum_tarihi.data = get_turkey_date()
     
-    return render_template('user/notification_form.html', form=form, title='Yeni Bildirim')
+    return render_template('user/notification_form.html', form=form, duplicates=duplicates, title='Yeni Bildirim')
 
 
+@app.route('/notification/bulk', methods=['GET', 'POST'])
+@login_required
+@password_change_required
+def bulk_import_notifications():
+    """Toplu bildirim ekleme (CSV dosyası veya yapıştırılan satırlar)"""
+    if current_user.is_admin():
+        flash('Admin kullanıcıları bildirim ekleyemez.', 'warning')
+        return redirect(url_for('admin_dashboard'))
+    
+    form = BulkImportForm()
+    errors = []
+    duplicates = []
+    warnings = []
+    
+    if form.validate_on_submit():
+        if form.csv_file.data:
+            content = decode_upload(form.csv_file.data.read())
+        else:
+            content = form.rows.data
+        rows = read_rows(content)
+        
+        max_rows = app.config['BULK_IMPORT_MAX_ROWS']
+        if not rows:
+            flash('İçe aktarılacak satır bulunamadı.', 'warning')
+        elif len(rows) > max_rows:
+            flash(f'Tek seferde en fazla {max_rows} satır içe aktarılabilir ({len(rows)} satır gönderildi).', 'danger')
+        else:
+            records, errors, warnings = validate_rows(rows, active_labs(), active_plants())
+            # Hatalı satır varsa hiçbiri eklenmez; düzeltilmiş liste tekrar gönderilebilir
+            if errors:
+                flash(f'{len(errors)} satırda hata bulundu, hiçbir bildirim eklenmedi.', 'danger')
+            elif not form.confirm_duplicates.data:
+                duplicates = find_bulk_duplicates(records, [line_no for line_no, cells in rows],
+                                                  app.config['DUPLICATE_WINDOW_MINUTES'])
+            if not errors and not duplicates:
+                count = insert_notifications(current_user.id, records)
+                db.session.commit()
+                flash(f'{count} bildirim başarıyla eklendi.', 'success')
+                if warnings:
+                    lines = ', '.join(str(line_no) for line_no, message in warnings[:20])
+                    more = ' ...' if len(warnings) > 20 else ''
+                    flash(f'{len(warnings)} satırda beton miktarı sayıya çevrilemedi; m³ toplamlarına '
+                          f'dahil edilmeyecek (satır {lines}{more}).', 'warning')
+                return redirect(url_for('my_notifications'))
+            if duplicates:
+                # Yüklenen dosya tekrar seçilmeden onaylanıp gönderilebilsin
+                form.rows.data = content
+                flash(f'{len(duplicates)} satır daha önce bildirilmiş bir dökümle aynı görünüyor, '
+                      'hiçbir bildirim eklenmedi.', 'warning')
+    
+    return render_template('user/bulk_import.html', form=form, errors=errors, duplicates=duplicates,
+                           warnings=warnings, columns=IMPORT_COLUMNS)
+
 @app.route('/notification/edit/<int:id>', methods=['GET', 'POST'])
 @login_required
 @password_change_required
@@ -192,33 +315,37 @@ def edit_notification(id):
     notification = Notification.query.get_or_404(id)
     
     # Sadece kendi bildirimleri düzenleyebilir
-    if notification.user_id != current_user.id and not current_user.is_admin():
+    if not notification.can_be_modified_by(current_user):
         flash('Bu bildirimi düzenleme yetkiniz yok.', 'danger')
         return redirect(url_for('dashboard'))
     
     form = NotificationForm(obj=notification)
     
     # Dropdown'ları doldur
-    form.laboratuvar_id.choices = [(lab.id, lab.ad) for lab in 
-                                     Laboratuvar.query.filter_by(is_active=True).order_by(Laboratuvar.ad).all()]
-    form.beton_santrali_id.choices = [(santral.id, santral.ad) for santral in 
-                                       BetonSantrali.query.filter_by(is_active=True).order_by(BetonSantrali.ad).all()]
+    form.laboratuvar_id.choices = [(lab.id, lab.ad) for lab in active_labs()]
+    form.beton_santrali_id.choices = [(santral.id, santral.ad) for santral in active_plants()]
     
+    duplicates = []
     if form.validate_on_submit():
-        notification.yibf_no = form.yibf_no.data
-        notification.beton_miktari = form.beton_miktari.data
-        notification.kat_bolge = form.kat_bolge.data
-        notification.beton_santrali_id = form.beton_santrali_id.data
-        notification.laboratuvar_id = form.laboratuvar_id.data
-        notification.dokum_tarihi = form.dokum_tarihi.data
-        notification.dokum_zamani = form.dokum_zamani.data
-        notification.aciklama = form.aciklama.data
-        notification.updated_at = get_turkey_time()
-        db.session.commit()
-        flash('Bildirim başarıyla güncellendi.', 'success')
-        return redirect(url_for('dashboard'))
+        if not form.confirm_duplicate.data:
+            duplicates = form_duplicates(form, app.config['DUPLICATE_WINDOW_MINUTES'], notification)
+        if not duplicates:
+            notification.yibf_no = form.yibf_no.data
+            notification.beton_miktari = form.beton_miktari.data
+            notification.kat_bolge = form.kat_bolge.data
+            notification.beton_santrali_id = form.beton_santrali_id.data
+            notification.laboratuvar_id = form.laboratuvar_id.data
+            notification.dokum_tarihi = form.dokum_tarihi.data
+            notification.dokum_zamani = form.dokum_zamani.data
+            notification.aciklama = form.aciklama.data
+            notification.updated_at = get_turkey_time()
+            db.session.commit()
+            flash('Bildirim başarıyla güncellendi.', 'success')
+            if form.beton_miktari_warning():
+                flash(form.beton_miktari_warning(), 'warning')
+            return redirect(url_for('dashboard'))
     
-    return render_template('user/notification_form.html', form=form, 
+    return render_template('user/notification_form.html', form=form, duplicates=duplicates,
                          notification=notification, title='Bildirim Düzenle')
 
 
@@ -230,7 +357,7 @@ def delete_notification(id):
     notification = Notification.query.get_or_404(id)
     
     # Sadece kendi bildirimleri silebilir
-    if notification.user_id != current_user.id and not current_user.is_admin():
+    if not notification.can_be_modified_by(current_user):
         flash('Bu bildirimi silme yetkiniz yok.', 'danger')
         return redirect(url_for('dashboard'))
     
@@ -241,19 +368,72 @@ def delete_notification(id):
     return redirect(request.referrer or url_for('dashboard'))
 
 
+def my_notifications_query():
+    """Bildirimlerim sorgusu ve filtreleri (tarih verilmediyse son MY_NOTIFICATIONS_DAYS gün)"""
+    filters = parse_notification_filters(request.args)
+    # Kullanıcı sorgusu zaten kendi bildirimleriyle sınırlı
+    filters.update(user_id=None, show_today=False, include_archive=False)
+    if 'start_date' not in request.args:
+        filters['start_date'] = get_turkey_date() - timedelta(days=app.config['MY_NOTIFICATIONS_DAYS'])
+    term = request.args.get('q', '').strip()
+    
+    query = filter_notifications(user_notifications_query(current_user.id), filters, get_turkey_date())
+    return search_notifications(query, term), filters, term
+
+
+def notification_page(query, after=None):
+    """Keyset sayfası: (en fazla ITEMS_PER_PAGE bildirim, sonraki sayfanın imleci ya da None)"""
+    if after is not None:
+        query = keyset_after(query, after)
+    limit = app.config['ITEMS_PER_PAGE']
+    # Sonraki sayfa olup olmadığını anlamak için bir fazla satır oku
+    notifications = with_list_relations(query, include_user=False).limit(limit + 1).all()
+    next_cursor = encode_cursor(notifications[limit - 1]) if len(notifications) > limit else None
+    return notifications[:limit], next_cursor
+
+
 @app.route('/my-notifications')
 @login_required
 @password_change_required
 def my_notifications():
-    """Kullanıcının tüm bildirimleri"""
+    """Kullanıcının bildirimleri - ilk sayfa; eski sayfalar kaydırdıkça yüklenir"""
     if current_user.is_admin():
         return redirect(url_for('admin_dashboard'))
     
-    notifications = Notification.query.filter_by(
-        user_id=current_user.id
-    ).order_by(Notification.dokum_tarihi.desc(), Notification.dokum_zamani.desc()).all()
+    query, filters, term = my_notifications_query()
+    last_modified, count = notification_validator(query)
+    
+    def render():
+        notifications, next_cursor = notification_page(query)
+        filter_args = filter_query_args(filters)
+        # Boş bırakılan başlangıç tarihi (tüm geçmiş) sonraki sayfalarda varsayılana dönmesin
+        filter_args.setdefault('start_date', '')
+        if term:
+            filter_args['q'] = term
+        return render_template('user/my_notifications.html', notifications=notifications,
+                               next_cursor=next_cursor, total=count, filters=filters, term=term,
+                               filter_args=filter_args)
     
-    return render_template('user/my_notifications.html', notifications=notifications)
+    # Varsayılan başlangıç tarihi güne göre değiştiğinden ETag'e dahil edilir
+    return conditional_response(render, parts=(filters['start_date'], last_modified, count),
+                                versions=('users', 'labs', 'plants'))
+
+
+@app.route('/my-notifications/rows')
+@login_required
+@password_change_required
+def my_notifications_rows():
+    """Bildirimlerim sonraki sayfası (?after=<imleç>) - tablo satırları HTML olarak"""
+    after = decode_cursor(request.args.get('after', ''))
+    if after is None:
+        return jsonify({'error': 'Geçersiz imleç.'}), 400
+    
+    query, _, _ = my_notifications_query()
+    notifications, next_cursor = notification_page(query, after)
+    return jsonify({
+        'html': render_template('user/my_notification_rows.html', notifications=notifications),
+        'next_cursor': next_cursor,
+    })
 
 
 # ==================== ADMIN ROUTE'LARI ====================
@@ -264,18 +444,15 @@ def my_notifications():
 @password_change_required
 def admin_dashboard():
     """Admin ana sayfası"""
-    total_users = User.query.filter_by(role='user').count()
-    total_notifications = Notification.query.count()
-    today_notifications = Notification.query.filter_by(dokum_tarihi=get_turkey_date()).count()
-    active_labs = Laboratuvar.query.filter_by(is_active=True).count()
-    active_plants = BetonSantrali.query.filter_by(is_active=True).count()
+    counters = read_counters([USERS_KEY, NOTIFICATIONS_KEY, daily_key(get_turkey_date()),
+                              LABS_ACTIVE_KEY, PLANTS_ACTIVE_KEY])
     
     return render_template('admin/dashboard.html',
-                         total_users=total_users,
-                         total_notifications=total_notifications,
-                         today_notifications=today_notifications,
-                         active_labs=active_labs,
-                         active_plants=active_plants)
+                         total_users=counters[USERS_KEY],
+                         total_notifications=counters[NOTIFICATIONS_KEY],
+                         today_notifications=counters[daily_key(get_turkey_date())],
+                         active_labs=counters[LABS_ACTIVE_KEY],
+                         active_plants=counters[PLANTS_ACTIVE_KEY])
 
 
 # ==================== KULLANICI YÖNETİMİ ====================
@@ -286,8 +463,12 @@ def admin_dashboard():
 @password_change_required
 def admin_users():
     """Kullanıcı listesi"""
-    users = User.query.order_by(User.role.desc(), User.company_name).all()
-    return render_template('admin/users.html', users=users)
+    def render():
+        users = User.query.order_by(User.role.desc(), User.company_name).all()
+        return render_template('admin/users.html', users=users)
+    
+    # Liste yalnızca 'users' sürümü değiştiğinde yeniden üretilir
+    return conditional_response(render, versions=('users',))
 
 
 @app.route('/admin/user/add', methods=['GET', 'POST'])
@@ -317,6 +498,7 @@ def admin_user_add():
         )
         user.set_password(form.password.data)
         db.session.add(user)
+        bump_version('users')
         db.session.commit()
         flash(f'Kullanıcı "{user.username}" başarıyla eklendi.', 'success')
         return redirect(url_for('admin_users'))
@@ -349,6 +531,7 @@ def admin_user_edit(id):
             user.set_password(form.password.data)
             user.must_change_password = True
         
+        bump_version('users')
         db.session.commit()
         flash(f'Kullanıcı "{user.username}" başarıyla güncellendi.', 'success')
         return redirect(url_for('admin_users'))
@@ -370,7 +553,9 @@ def admin_user_delete(id):
         return redirect(url_for('admin_users'))
     
     username = user.username
+    delete_archived_notifications(user.id)
     db.session.delete(user)
+    bump_version('users')
     db.session.commit()
     flash(f'Kullanıcı "{username}" başarıyla silindi.', 'success')
     return redirect(url_for('admin_users'))
@@ -390,6 +575,7 @@ def admin_user_toggle(id):
         return redirect(url_for('admin_users'))
     
     user.is_active = not user.is_active
+    bump_version('users')
     db.session.commit()
     
     status = 'aktif' if user.is_active else 'pasif'
@@ -409,6 +595,7 @@ def admin_user_reset_password(id):
     if form.validate_on_submit():
         user.set_password(form.new_password.data)
         user.must_change_password = True
+        bump_version('users')
         db.session.commit()
         flash(f'Kullanıcı "{user.username}" şifresi sıfırlandı. Kullanıcı ilk girişte şifre değiştirmek zorunda kalacak.', 'success')
         return redirect(url_for('admin_users'))
@@ -424,8 +611,11 @@ def admin_user_reset_password(id):
 @password_change_required
 def admin_labs():
     """Laboratuvar listesi"""
-    labs = Laboratuvar.query.order_by(Laboratuvar.ad).all()
-    return render_template('admin/labs.html', labs=labs)
+    def render():
+        labs = Laboratuvar.query.order_by(Laboratuvar.ad).all()
+        return render_template('admin/labs.html', labs=labs)
+    
+    return conditional_response(render, versions=('users', 'labs'))
 
 
 @app.route('/admin/lab/add', methods=['GET', 'POST'])
@@ -444,6 +634,7 @@ def admin_lab_add():
         
         lab = Laboratuvar(ad=form.ad.data)
         db.session.add(lab)
+        bump_version('labs')
         db.session.commit()
         flash(f'Laboratuvar "{lab.ad}" başarıyla eklendi.', 'success')
         return redirect(url_for('admin_labs'))
@@ -467,6 +658,7 @@ def admin_lab_edit(id):
             return redirect(url_for('admin_lab_edit', id=id))
         
         lab.ad = form.ad.data
+        bump_version('labs')
         db.session.commit()
         flash(f'Laboratuvar "{lab.ad}" başarıyla güncellendi.', 'success')
         return redirect(url_for('admin_labs'))
@@ -482,6 +674,7 @@ def admin_lab_toggle(id):
     """Laboratuvar aktif/pasif"""
     lab = Laboratuvar.query.get_or_404(id)
     lab.is_active = not lab.is_active
+    bump_version('labs')
     db.session.commit()
     
     status = 'aktif' if lab.is_active else 'pasif'
@@ -497,13 +690,15 @@ def admin_lab_delete(id):
     """Laboratuvar silme"""
     lab = Laboratuvar.query.get_or_404(id)
     
-    # İlişkili bildirim var mı kontrol et
-    if lab.notifications.count() > 0:
-        flash(f'Bu laboratuvarla ilişkili {lab.notifications.count()} bildirim bulunmaktadır. Önce bildirimleri siliniz veya laboratuvarı pasif yapınız.', 'danger')
+    # İlişkili bildirim var mı kontrol et (arşivdekiler dahil)
+    notification_count = lab.notifications.count() + archived_count(laboratuvar_id=lab.id)
+    if notification_count > 0:
+        flash(f'Bu laboratuvarla ilişkili {notification_count} bildirim bulunmaktadır. Önce bildirimleri siliniz veya laboratuvarı pasif yapınız.', 'danger')
         return redirect(url_for('admin_labs'))
     
     lab_name = lab.ad
     db.session.delete(lab)
+    bump_version('labs')
     db.session.commit()
     flash(f'Laboratuvar "{lab_name}" başarıyla silindi.', 'success')
     return redirect(url_for('admin_labs'))
@@ -517,8 +712,11 @@ def admin_lab_delete(id):
 @password_change_required
 def admin_plants():
     """Beton santrali listesi"""
-    plants = BetonSantrali.query.order_by(BetonSantrali.ad).all()
-    return render_template('admin/plants.html', plants=plants)
+    def render():
+        plants = BetonSantrali.query.order_by(BetonSantrali.ad).all()
+        return render_template('admin/plants.html', plants=plants)
+    
+    return conditional_response(render, versions=('users', 'plants'))
 
 
 @app.route('/admin/plant/add', methods=['GET', 'POST'])
@@ -537,6 +735,7 @@ def admin_plant_add():
         
         plant = BetonSantrali(ad=form.ad.data)
         db.session.add(plant)
+        bump_version('plants')
         db.session.commit()
         flash(f'Beton santrali "{plant.ad}" başarıyla eklendi.', 'success')
         return redirect(url_for('admin_plants'))
@@ -560,6 +759,7 @@ def admin_plant_edit(id):
             return redirect(url_for('admin_plant_edit', id=id))
         
         plant.ad = form.ad.data
+        bump_version('plants')
         db.session.commit()
         flash(f'Beton santrali "{plant.ad}" başarıyla güncellendi.', 'success')
         return redirect(url_for('admin_plants'))
@@ -575,6 +775,7 @@ def admin_plant_toggle(id):
     """Beton santrali aktif/pasif"""
     plant = BetonSantrali.query.get_or_404(id)
     plant.is_active = not plant.is_active
+    bump_version('plants')
     db.session.commit()
     
     status = 'aktif' if plant.is_active else 'pasif'
@@ -590,13 +791,15 @@ def admin_plant_delete(id):
     """Beton santrali silme"""
     plant = BetonSantrali.query.get_or_404(id)
     
-    # İlişkili bildirim var mı kontrol et
-    if plant.notifications.count() > 0:
-        flash(f'Bu santral ile ilişkili {plant.notifications.count()} bildirim bulunmaktadır. Önce bildirimleri siliniz veya santrali pasif yapınız.', 'danger')
+    # İlişkili bildirim var mı kontrol et (arşivdekiler dahil)
+    notification_count = plant.notifications.count() + archived_count(beton_santrali_id=plant.id)
+    if notification_count > 0:
+        flash(f'Bu santral ile ilişkili {notification_count} bildirim bulunmaktadır. Önce bildirimleri siliniz veya santrali pasif yapınız.', 'danger')
         return redirect(url_for('admin_plants'))
     
     plant_name = plant.ad
     db.session.delete(plant)
+    bump_version('plants')
     db.session.commit()
     flash(f'Beton santrali "{plant_name}" başarıyla silindi.', 'success')
     return redirect(url_for('admin_plants'))
@@ -611,47 +814,263 @@ def admin_plant_delete(id):
 def admin_notifications():
     """Tüm bildirimleri görüntüleme (filtreleme)"""
     # Filtre parametreleri
-    user_id = request.args.get('user_id', type=int)
-    yibf_no = request.args.get('yibf_no', '').strip()
+    filters = parse_notification_filters(request.args)
+    
+    # Satırlar sayfa sayfa admin_notifications_data üzerinden yüklenir;
+    # sayfa yalnızca filtreler ve dropdown verilerinden oluşur
+    def render():
+        return render_template('admin/all_notifications.html',
+                             users=company_users(),
+                             labs=active_labs(),
+                             plants=active_plants(),
+                             filters=filters,
+                             filter_args=filter_query_args(filters))
+    
+    return conditional_response(render, versions=('users', 'labs', 'plants'))
+
+
+@app.route('/admin/notifications/data')
+@login_required
+@admin_required
+@password_change_required
+def admin_notifications_data():
+    """Bildirim tablosu için DataTables server-side JSON verisi"""
+    filters = parse_notification_filters(request.args)
+    draw = request.args.get('draw', 0, type=int)
+    start = max(request.args.get('start', 0, type=int), 0)
+    length = request.args.get('length', app.config['ITEMS_PER_PAGE'], type=int)
+    if length <= 0 or length > app.config['MAX_ITEMS_PER_PAGE']:
+        length = app.config['ITEMS_PER_PAGE']
+    
+    records_total = read_counters([NOTIFICATIONS_KEY])[NOTIFICATIONS_KEY]
+    if filters['include_archive']:
+        return jsonify(archive_notifications_page(filters, draw, start, length, records_total))
+    
+    query = filter_notifications(Notification.query, filters, get_turkey_date())
+    query = search_notifications(query, request.args.get('search[value]', '').strip())
+    records_filtered = query.count()
+    
+    query = order_notifications(query,
+                                request.args.get('order[0][column]', 0, type=int),
+                                request.args.get('order[0][dir]', 'desc'))
+    notifications = with_list_relations(query).offset(start).limit(length).all()
+    
+    return jsonify({
+        'draw': draw,
+        'recordsTotal': records_total,
+        'recordsFiltered': records_filtered,
+        'data': [{
+            'dokum_tarihi': n.dokum_tarihi.strftime('%d.%m.%Y'),
+            'dokum_zamani': n.dokum_zamani,
+            'yibf_no': n.yibf_no,
+            'company_name': n.user.company_name,
+            'beton_miktari': n.beton_miktari,
+            'kat_bolge': n.kat_bolge,
+            'beton_santrali': n.beton_santrali.ad,
+            'laboratuvar': n.laboratuvar.ad,
+            'aciklama': n.aciklama or '',
+            'edit_url': url_for('edit_notification', id=n.id),
+            'delete_url': url_for('delete_notification', id=n.id),
+        } for n in notifications]
+    })
+
+
+def archive_notifications_page(filters, draw, start, length, records_total):
+    """Arşiv dahil DataTables sayfası (sıcak + arşiv tablolarının birleşimi, salt okunur satırlar)
+
+    Arşiv satırları ORM nesnesi olmadığından sorgu export_select üzerinden kurulur.
+    """
+    statement = filter_notifications(export_select().add_columns(Notification.id), filters, get_turkey_date())
+    statement = search_notifications(statement, request.args.get('search[value]', '').strip(), indexed=False)
+    statement = order_notifications(statement,
+                                    request.args.get('order[0][column]', 0, type=int),
+                                    request.args.get('order[0][dir]', 'desc'),
+                                    joined=True)
+    statement = with_archive(statement)
+    rows = db.session.execute(statement.offset(start).limit(length)).all()
+    
+    return {
+        'draw': draw,
+        'recordsTotal': records_total + archived_count(),
+        'recordsFiltered': count_rows(statement),
+        'data': [{
+            'dokum_tarihi': row.dokum_tarihi.strftime('%d.%m.%Y'),
+            'dokum_zamani': row.dokum_zamani,
+            'yibf_no': row.yibf_no,
+            'company_name': row.company_name,
+            'beton_miktari': row.beton_miktari,
+            'kat_bolge': row.kat_bolge,
+            'beton_santrali': row.beton_santrali,
+            'laboratuvar': row.laboratuvar,
+            'aciklama': row.aciklama or '',
+            # Arşivdeki bildirimler değiştirilemez
+            'edit_url': None if row.archived else url_for('edit_notification', id=row.id),
+            'delete_url': None if row.archived else url_for('delete_notification', id=row.id),
+        } for row in rows]
+    }
+
+
+EXPORT_FORMATS = {
+    'csv': (generate_csv, 'text/csv'),
+    'xlsx': (generate_xlsx, 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+}
+
+# Akışla üretilen sayfalarda bir seferde gönderilen en az HTML (karakter)
+STREAM_CHUNK_CHARS = 16 * 1024
+
+
+def filtered_export_statement(filters):
+    """Filtrelenmiş bildirimlerin dışa aktarım sorgusu (en yeni önce; istenirse arşiv dahil)"""
+    statement = filter_notifications(export_select(), filters, get_turkey_date())
+    statement = search_notifications(statement, request.args.get('search', '').strip(),
+                                     indexed=not filters['include_archive'])
+    statement = statement.order_by(Notification.dokum_tarihi.desc(),
+                                   Notification.dokum_dakika.desc(),
+                                   Notification.id.desc())
+    return with_archive(statement) if filters['include_archive'] else statement
+
+
+def stream_page(template_name, **context):
+    """Şablonu render_template gibi üret ama HTML'i bellekte biriktirmeden parça parça gönder
+
+    Flash mesajları ve CSRF token'ı oturumu değiştirir; oturum çerezi yanıt
+    başlıklarıyla gönderildiğinden ikisi de akış başlamadan okunur. Şablon
+    içindeki get_flashed_messages() ve csrf_token() aynı değerleri döndürür.
+    """
+    get_flashed_messages(with_categories=True)
+    generate_csrf()
+    
+    def buffered(stream):
+        parts, size = [], 0
+        for part in stream:
+            parts.append(part)
+            size += len(part)
+            if size >= STREAM_CHUNK_CHARS:
+                yield ''.join(parts)
+                parts, size = [], 0
+        if parts:
+            yield ''.join(parts)
+    
+    return Response(buffered(stream_template(template_name, **context)), mimetype='text/html')
+
+
+@app.route('/admin/notifications/export')
+@login_required
+@admin_required
+@password_change_required
+def admin_notifications_export():
+    """Filtrelenmiş bildirimleri CSV/XLSX olarak dışa aktar (akışla, sabit bellek)"""
+    export_format = request.args.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        flash('Geçersiz dışa aktarım formatı.', 'danger')
+        return redirect(url_for('admin_notifications'))
+    
+    statement = filtered_export_statement(parse_notification_filters(request.args))
+    
+    generate, mimetype = EXPORT_FORMATS[export_format]
+    filename = f'bildirimler_{get_turkey_date().strftime("%Y%m%d")}.{export_format}'
+    return Response(stream_with_context(generate(statement)),
+                    mimetype=mimetype,
+                    headers={'Content-Disposition': f'attachment; filename={filename}'})
+
+
+@app.route('/admin/notifications/full')
+@login_required
+@admin_required
+@password_change_required
+def admin_notifications_full():
+    """Filtrelenmiş bildirimlerin tamamı tek sayfada (yazdırma için) - akışla üretilir
+
+    Satırlar sunucu tarafı cursor'dan EXPORT_CHUNK_SIZE'lık parçalarla okunur;
+    binlerce satırda da ilk bayt hemen gönderilir ve bellek kullanımı sabit kalır.
+    """
+    filters = parse_notification_filters(request.args)
+    return stream_page('admin/notifications_full.html',
+                       rows=iter_export_rows(filtered_export_statement(filters)),
+                       filters=filters, filter_args=filter_query_args(filters),
+                       search=request.args.get('search', '').strip())
+
+
+# ==================== İSTATİSTİKLER ====================
+
+@app.route('/admin/statistics')
+@login_required
+@admin_required
+@password_change_required
+def admin_statistics():
+    """Aylık döküm sayısı ve m³ (firma, santral ve laboratuvar dağılımı) - yalnızca aylık özetlerden"""
+    start, end = month_range(request.args.get('start'), request.args.get('end'), get_turkey_date())
+    return render_template('admin/statistics.html', start=start, end=end,
+                           months=monthly_totals(start, end),
+                           companies=rollup_breakdown_query('company', start, end).all(),
+                           plants=rollup_breakdown_query('plant', start, end).all(),
+                           labs=rollup_breakdown_query('lab', start, end).all())
+
+
+# ==================== LABORATUVAR PROGRAMI ====================
+
+@app.route('/admin/schedule')
+@login_required
+@admin_required
+@password_change_required
+def admin_lab_schedule():
+    """Laboratuvarın tarih aralığındaki döküm programı (güne ve saate göre)"""
+    labs = active_labs()
     lab_id = request.args.get('lab_id', type=int)
-    plant_id = request.args.get('plant_id', type=int)
-    show_today = request.args.get('show_today', 'false') == 'true'
-    
-    # Query oluştur
-    query = Notification.query
-    
-    # Filtreler
-    if user_id:
-        query = query.filter_by(user_id=user_id)
-    if yibf_no:
-        query = query.filter(Notification.yibf_no.contains(yibf_no))
-    if lab_id:
-        query = query.filter_by(laboratuvar_id=lab_id)
-    if plant_id:
-        query = query.filter_by(beton_santrali_id=plant_id)
-    if show_today:
-        query = query.filter_by(dokum_tarihi=get_turkey_date())
-    
-    notifications = query.order_by(Notification.dokum_tarihi.desc(), 
-                                   Notification.dokum_zamani.desc()).all()
-    
-    # Dropdown'lar için veriler
-    users = User.query.filter_by(role='user').order_by(User.company_name).all()
-    labs = Laboratuvar.query.filter_by(is_active=True).order_by(Laboratuvar.ad).all()
-    plants = BetonSantrali.query.filter_by(is_active=True).order_by(BetonSantrali.ad).all()
-    
-    return render_template('admin/all_notifications.html',
-                         notifications=notifications,
-                         users=users,
-                         labs=labs,
-                         plants=plants,
-                         filters={
-                             'user_id': user_id,
-                             'yibf_no': yibf_no,
-                             'lab_id': lab_id,
-                             'plant_id': plant_id,
-                             'show_today': show_today
-                         })
+    if lab_id is None and labs:
+        lab_id = labs[0].id
+    start, end = schedule_range(request.args.get('start'), request.args.get('end'), get_turkey_date())
+    
+    # Gün sürümleri değişmediyse sayfa üretilmeden 304 döner; değişen günler tek tek yenilenir
+    versions = schedule_versions(lab_id, start, end) if lab_id else {}
+    
+    def render():
+        days = lab_schedule(lab_id, start, end, versions) if lab_id else []
+        return render_template('admin/lab_schedule.html', labs=labs, lab_id=lab_id,
+                               start=start, end=end, days=days, weekday_names=WEEKDAY_NAMES)
+    
+    return conditional_response(render, parts=(lab_id, start, end, tuple(sorted(versions.items()))),
+                                versions=('labs', 'plants', 'users'))
+
+
+# ==================== CANLI PANO ====================
+
+@app.route('/admin/today')
+@login_required
+@admin_required
+@password_change_required
+def admin_today_board():
+    """Bugünün bildirimleri - değişiklikler SSE ile sayfa yenilenmeden gelir"""
+    today = get_turkey_date()
+    # Olay numarası satırlardan önce okunur; arada gelen değişiklikler tekrar uygulanır
+    after_id = last_event_id()
+    return render_template('admin/today_board.html', rows=board_rows(today), today=today,
+                           last_event_id=after_id, labs=active_labs())
+
+
+@app.route('/live/today')
+@login_required
+@password_change_required
+def live_today():
+    """Günün bildirim değişiklikleri (text/event-stream)
+
+    Kullanıcılar yalnızca kendi bildirimlerinin değişikliklerini alır.
+    """
+    try:
+        day = date.fromisoformat(request.args.get('day', ''))
+    except ValueError:
+        day = get_turkey_date()
+    
+    # Yeniden bağlanan tarayıcı aldığı son olayı Last-Event-ID başlığıyla bildirir
+    after_id = request.headers.get('Last-Event-ID', type=int)
+    if after_id is None:
+        after_id = request.args.get('after', type=int)
+    if after_id is None:
+        after_id = last_event_id()
+    
+    user_id = None if current_user.is_admin() else current_user.id
+    return Response(event_stream(day, after_id, user_id), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 
 # ==================== HATA YÖNETİMİ ====================
@@ -672,7 +1091,7 @@ def internal_error(error):
 def init_db():
     """Veritabanını başlat ve seed data ekle"""
     with app.app_context():
-        db.create_all()
+        upgrade_schema()
         
         # Admin kontrolü
         admin = User.query.filter_by(username='admin').first()
@@ -752,6 +1171,207 @@ def init_db():
             print("="*60)
 
 
+# ==================== CLI KOMUTLARI ====================
+
+@app.cli.command('upgrade-db')
+def upgrade_db_command():
+    """Mevcut veritabanına eksik tablo, sütun ve indeksleri ekle"""
+    report = upgrade_schema()
+    if report['columns']:
+        print("Eklenen sütunlar: " + ", ".join(report['columns']))
+    if report['indexes']:
+        print("Oluşturulan indeksler: " + ", ".join(report['indexes']))
+    if report['rebuilt']:
+        print("AUTOINCREMENT ile yeniden oluşturulan tablolar: " + ", ".join(report['rebuilt']))
+    if not report['columns'] and not report['indexes'] and not report['rebuilt']:
+        print("Veritabanı şeması güncel.")
+    
+    if report['unparsed']:
+        print(f"\nSayıya çevrilemeyen {len(report['unparsed'])} bildirim (elle düzeltilmeli):")
+        for id, yibf_no, beton_miktari, dokum_zamani in report['unparsed']:
+            print(f"  #{id} YİBF {yibf_no}: beton_miktari={beton_miktari!r} dokum_zamani={dokum_zamani!r}")
+
+
+@app.cli.command('reconcile-counters')
+@click.option('--dry-run', is_flag=True, help='Sapmaları sadece raporla, düzeltme.')
+def reconcile_counters_command(dry_run):
+    """Admin paneli sayaçlarını gerçek değerlerle karşılaştır ve düzelt"""
+    drift = reconcile_counters(repair=not dry_run)
+    if not drift:
+        print("Sayaçlar tutarlı.")
+        return
+    for key, (current, actual) in sorted(drift.items()):
+        print(f"  {key}: sayaç={current} gerçek={actual}")
+    print(f"{len(drift)} sayaçta sapma {'bulundu' if dry_run else 'düzeltildi'}.")
+
+
+@app.cli.command('prune-live-events')
+def prune_live_events_command():
+    """Saklama süresi dolan canlı pano olaylarını sil"""
+    count = prune_events()
+    print(f"{count} canlı pano olayı silindi (saklama süresi {app.config['LIVE_EVENT_RETENTION_HOURS']} saat).")
+
+
+@app.cli.command('rebuild-rollups')
+def rebuild_rollups_command():
+    """Aylık istatistik özetlerini bildirim tablosundan yeniden oluştur"""
+    rows, changed = rebuild_rollups()
+    print(f"{rows} özet satırı oluşturuldu ({changed} satır önceki halinden farklıydı).")
+
+
+@app.cli.command('archive-notifications')
+@click.option('--days', type=int, default=None,
+              help='Saklama süresi (gün); varsayılan ARCHIVE_RETENTION_DAYS.')
+@click.option('--dry-run', is_flag=True, help='Taşınacak bildirim sayısını göster, taşıma.')
+def archive_notifications_command(days, dry_run):
+    """Döküm tarihi saklama süresinden eski bildirimleri arşiv tablosuna taşı"""
+    days = app.config['ARCHIVE_RETENTION_DAYS'] if days is None else days
+    before = get_turkey_date() - timedelta(days=days)
+    if dry_run:
+        count = Notification.query.filter(Notification.dokum_tarihi < before).count()
+        print(f"{before.strftime('%d.%m.%Y')} öncesi {count} bildirim arşive taşınacak.")
+        return
+    try:
+        moved = archive_notifications(before, batch_size=app.config['ARCHIVE_BATCH_SIZE'])
+    except RuntimeError as e:
+        print(f"Arşivleme durduruldu: {e}")
+        raise SystemExit(1)
+    print(f"{before.strftime('%d.%m.%Y')} öncesi {moved} bildirim arşive taşındı.")
+
+
+@app.cli.command('backup-db')
+@click.option('--no-compress', is_flag=True, help='Yedeği gzip ile sıkıştırma.')
+@click.option('--keep', type=int, default=None, help='Saklanan yedek sayısı; varsayılan BACKUP_KEEP.')
+@click.option('--every', type=float, default=None,
+              help='Komutu açık bırakıp her N saatte bir yedek al.')
+def backup_db_command(no_compress, keep, every):
+    """Çalışan veritabanının yazanları bekletmeden tutarlı yedeğini al"""
+    source_path = sqlite_database_path(db.engine)
+    if source_path is None:
+        print("Yedekleme yalnızca dosya tabanlı SQLite veritabanı için geçerlidir.")
+        return
+    backup_dir = app.config['BACKUP_DIR']
+    keep = app.config['BACKUP_KEEP'] if keep is None else keep
+    
+    while True:
+        report = backup_database(source_path, backup_dir,
+                                 pages=app.config['BACKUP_PAGES'],
+                                 pause=app.config['BACKUP_STEP_PAUSE'],
+                                 max_restarts=app.config['BACKUP_MAX_RESTARTS'],
+                                 compress=app.config['BACKUP_COMPRESS'] and not no_compress)
+        print(f"Yedek: {report['path']}")
+        print(f"  {report['size'] / 1048576:.1f} MB -> {report['stored_size'] / 1048576:.1f} MB, "
+              f"{report['pages']} sayfa, {report['steps']} adım, {report['restarts']} yeniden başlama"
+              + (" (son kopya tek adımda)" if report['single_pass'] else ""))
+        print(f"  süre {report['total_seconds']:.2f} sn (kopya {report['backup_seconds']:.2f} sn), "
+              f"kaynak kilidi toplam {report['locked_seconds'] * 1000:.0f} ms, "
+              f"en uzun adım {report['max_step_seconds'] * 1000:.1f} ms")
+        print(f"  integrity_check: ok, {sum(report['counts'].values())} satır")
+        for path in rotate_backups(backup_dir, keep):
+            print(f"  Silinen eski yedek: {os.path.basename(path)}")
+        if every is None:
+            return
+        time.sleep(every * 3600)
+
+
+@app.cli.command('verify-backup')
+@click.argument('path', required=False)
+def verify_backup_command(path):
+    """Yedeği geçici dosyaya açıp integrity_check ve satır sayılarıyla doğrula (varsayılan: en yeni)"""
+    if path is None:
+        backups = list_backups(app.config['BACKUP_DIR'])
+        if not backups:
+            print("Yedek bulunamadı.")
+            raise SystemExit(1)
+        path = backups[-1]
+    result = verify_backup(path)
+    healthy = result['integrity'] == ['ok']
+    print(f"{path}: integrity_check {'ok' if healthy else 'HATA'}")
+    if not healthy:
+        for message in result['integrity'][:10]:
+            print(f"  {message}")
+    for table, count in sorted(result['counts'].items()):
+        if table in result['mismatches']:
+            print(f"  {table}: {count} (manifest: {result['mismatches'][table][0]})")
+        else:
+            print(f"  {table}: {count}")
+    if not result['manifest']:
+        print("Manifest dosyası yok; satır sayıları karşılaştırılmadı.")
+    if not healthy or result['mismatches']:
+        raise SystemExit(1)
+
+
+@app.cli.command('vendor-assets')
+@click.option('--force', is_flag=True, help='Mevcut dosyaları da yeniden indir.')
+def vendor_assets_command(force):
+    """Bootstrap, ikonlar, jQuery ve DataTables dosyalarını static/vendor altına indir"""
+    downloaded = download_vendor_assets(force=force)
+    for filename in downloaded:
+        print(f"  {filename}")
+    print(f"{len(downloaded)} dosya indirildi.")
+
+
+@app.cli.command('precompress-assets')
+def precompress_assets_command():
+    """static/ altındaki dosyaların gzip (ve brotli) hallerini önceden oluştur"""
+    written = precompress_static()
+    for filename in written:
+        print(f"  {filename}")
+    print(f"{len(written)} sıkıştırılmış dosya oluşturuldu.")
+
+
+@app.cli.command('check-query-plans')
+def check_query_plans_command():
+    """Route sorgularının indeks kullandığını EXPLAIN QUERY PLAN ile doğrula"""
+    if db.engine.dialect.name != 'sqlite':
+        print("Bu kontrol yalnızca SQLite için geçerlidir.")
+        return
+    
+    today = get_turkey_date()
+    limit = app.config['ITEMS_PER_PAGE']
+    
+    def admin_query(**filters):
+        values = parse_notification_filters(MultiDict())
+        values.update(filters)
+        query = filter_notifications(Notification.query, values, today)
+        return order_notifications(query, 0, 'desc').limit(limit)
+    
+    checks = [
+        ('dashboard', today_notifications_query(1, today)),
+        ('my_notifications', user_notifications_query(1).filter(
+            Notification.dokum_tarihi >= today - timedelta(days=30)).limit(limit)),
+        ('my_notifications (imleç)', keyset_after(user_notifications_query(1), (today, 600, 1000)).limit(limit)),
+        ('admin_notifications', admin_query()),
+        ('admin_notifications (bugün)', admin_query(show_today=True)),
+        ('admin_notifications (kullanıcı)', admin_query(user_id=1)),
+        ('admin_notifications (laboratuvar)', admin_query(lab_id=1)),
+        ('admin_notifications (laboratuvar + bugün)', admin_query(lab_id=1, show_today=True)),
+        ('admin_notifications (santral)', admin_query(plant_id=1)),
+        ('admin_notifications (santral + bugün)', admin_query(plant_id=1, show_today=True)),
+        ('mükerrer döküm kontrolü', duplicate_query('12345', today, 600, app.config['DUPLICATE_WINDOW_MINUTES'])),
+        ('admin_dashboard (bugünkü bildirim)', Notification.query.filter_by(dokum_tarihi=today)),
+        ('admin_lab_schedule', schedule_query(1, today, today)),
+        ('admin_statistics', rollup_breakdown_query('company', today.replace(day=1), today.replace(day=1))),
+        ('api (kullanıcı, imleç)', order_newest_first(keyset_after(
+            Notification.query.filter_by(user_id=1), (today, 600, 1000))).limit(limit)),
+        ('api (admin, imleç)', order_newest_first(keyset_after(
+            Notification.query, (today, None, 1000))).limit(limit)),
+    ]
+    
+    failed = False
+    for name, query in checks:
+        plan = explain_query_plan(query)
+        scans = full_table_scans(plan)
+        status = 'TAM TARAMA' if scans else 'OK'
+        print(f"[{status}] {name}")
+        for line in plan:
+            print(f"    {line}")
+        failed = failed or bool(scans)
+    
+    if failed:
+        raise SystemExit(1)
+
+
 if __name__ == '__main__':
     init_db()
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,106 @@
+from sqlalchemy import delete, func, insert, literal, select, text, union_all
+from sqlalchemy.sql.util import ClauseAdapter
+from models import db, Notification, ArchivedNotification, get_turkey_time
+from stats import (apply_counter_deltas, notification_deltas, add_rollup_delta, apply_rollup_deltas,
+                   ROLLUP_FIELDS)
+from schedule import bump_schedule_versions
+
+# İki tabloda da aynı adla bulunan sütunlar
+ARCHIVE_COLUMNS = [column.name for column in Notification.__table__.columns]
+
+
+# ==================== TAŞIMA ====================
+
+def archive_notifications(before, batch_size=1000):
+    """dokum_tarihi `before`'dan önceki bildirimleri arşiv tablosuna taşı; taşınan sayıyı döndür
+
+    Her parça ayrı transaction'da taşınır; yazma kilidi kısa sürer ve iş
+    yarıda kesilirse kaldığı yerden devam eder. Sayaçlar yalnızca notifications
+    tablosunu saydığından azaltılır; aylık özetler arşivi de kapsadığından
+    değişmez. Taşınan günlerin laboratuvar programı geçersiz kılınır.
+
+    Arşivde id tekildir: notifications AUTOINCREMENT değilse (upgrade-db
+    çalıştırılmamış) veya bir id arşivde zaten varsa hiçbir şey taşınmadan
+    RuntimeError verilir.
+    """
+    hot = Notification.__table__
+    archive = ArchivedNotification.__table__
+    _check_autoincrement()
+    moved = 0
+    while True:
+        rows = db.session.execute(
+            select(hot.c.id, hot.c.laboratuvar_id, hot.c.dokum_tarihi)
+            .where(hot.c.dokum_tarihi < before).limit(batch_size)
+        ).all()
+        if not rows:
+            return moved
+
+        ids = [row.id for row in rows]
+        reused = db.session.scalars(select(archive.c.id).where(archive.c.id.in_(ids))).all()
+        if reused:
+            db.session.rollback()
+            raise RuntimeError(f'Arşivde zaten bulunan bildirim id\'leri: {sorted(reused)[:10]}')
+        archived_at = literal(get_turkey_time(), ArchivedNotification.archived_at.type)
+        db.session.execute(insert(archive).from_select(
+            ARCHIVE_COLUMNS + ['archived_at'],
+            select(*[hot.c[name] for name in ARCHIVE_COLUMNS], archived_at).where(hot.c.id.in_(ids))
+        ))
+        # Arama indeksi trigger ile güncellenir
+        db.session.execute(delete(hot).where(hot.c.id.in_(ids)))
+
+        connection = db.session.connection()
+        apply_counter_deltas(connection, notification_deltas(removed=[row.dokum_tarihi for row in rows]))
+        bump_schedule_versions(connection, {(row.laboratuvar_id, row.dokum_tarihi) for row in rows})
+        db.session.commit()
+        moved += len(rows)
+
+
+def _check_autoincrement():
+    """SQLite'ta notifications AUTOINCREMENT değilse arşivlenen en büyük id yeni bildirime verilir"""
+    if db.engine.dialect.name != 'sqlite':
+        return
+    sql = db.session.execute(text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'notifications'"))
+    if 'AUTOINCREMENT' not in (sql.scalar() or '').upper():
+        raise RuntimeError("notifications tablosu AUTOINCREMENT değil; önce 'flask upgrade-db' çalıştırın.")
+
+
+def delete_archived_notifications(user_id):
+    """Kullanıcının arşivdeki bildirimlerini sil ve aylık özetlerden düş (commit çağırana aittir)"""
+    archive = ArchivedNotification.__table__
+    rollups = {}
+    for row in db.session.execute(select(*[archive.c[name] for name in ROLLUP_FIELDS])
+                                  .where(archive.c.user_id == user_id)):
+        add_rollup_delta(rollups, *row, sign=-1)
+    db.session.execute(delete(archive).where(archive.c.user_id == user_id))
+    apply_rollup_deltas(db.session.connection(), rollups)
+
+
+# ==================== OKUMA ====================
+
+def with_archive(statement):
+    """notifications üzerine kurulmuş Core sorguyu sıcak + arşiv tablolarının birleşiminde çalıştır
+
+    Sorgudaki notifications sütunları UNION ALL alt sorgusunun sütunlarına
+    çevrilir; filtre ve sıralama fonksiyonları değiştirilmeden kullanılabilir.
+    Eklenen 'archived' sütunu satırın arşivden gelip gelmediğini gösterir.
+    Metin araması arşivi kapsamayan FTS indeksi yerine LIKE ile yapılmalıdır
+    (indexed=False).
+    """
+    hot = Notification.__table__
+    archive = ArchivedNotification.__table__
+    combined = union_all(
+        select(*[hot.c[name] for name in ARCHIVE_COLUMNS], literal(False).label('archived')),
+        select(*[archive.c[name] for name in ARCHIVE_COLUMNS], literal(True).label('archived')),
+    ).subquery('notifications_all')
+    return ClauseAdapter(combined).traverse(statement).add_columns(combined.c.archived)
+
+
+def count_rows(statement):
+    """Core sorgunun satır sayısı (sıralama olmadan)"""
+    return db.session.scalar(select(func.count()).select_from(statement.order_by(None).subquery()))
+
+
+def archived_count(**filters):
+    """Arşivdeki bildirim sayısı (ör. laboratuvar_id=1)"""
+    return ArchivedNotification.query.filter_by(**filters).count()
+
@@ -0,0 +1,220 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import urllib.request
+from flask import abort, current_app, request, send_file, url_for
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+except ImportError:  # isteğe bağlı; yoksa yalnızca gzip kullanılır
+    brotli = None
+
+# Üçüncü parti dosyalar: static/ altındaki yol -> indirildiği adres.
+# 'flask --app app vendor-assets' ile indirilir; dosya yoksa asset_url bu adrese döner.
+VENDOR_ASSETS = {
+    'vendor/bootstrap/bootstrap.min.css':
+        'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css',
+    'vendor/bootstrap/bootstrap.bundle.min.js':
+        'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js',
+    'vendor/bootstrap-icons/bootstrap-icons.css':
+        'https://cdn.jsdelivr.net/npm/bootstrap-icons@1.10.0/font/bootstrap-icons.css',
+    # bootstrap-icons.css fontları ./fonts/ altında arar
+    'vendor/bootstrap-icons/fonts/bootstrap-icons.woff2':
+        'https://cdn.jsdelivr.net/npm/bootstrap-icons@1.10.0/font/fonts/bootstrap-icons.woff2',
+    'vendor/bootstrap-icons/fonts/bootstrap-icons.woff':
+        'https://cdn.jsdelivr.net/npm/bootstrap-icons@1.10.0/font/fonts/bootstrap-icons.woff',
+    'vendor/jquery/jquery.min.js':
+        'https://code.jquery.com/jquery-3.7.0.min.js',
+    'vendor/datatables/jquery.dataTables.min.js':
+        'https://cdn.datatables.net/1.13.4/js/jquery.dataTables.min.js',
+    'vendor/datatables/dataTables.bootstrap5.min.js':
+        'https://cdn.datatables.net/1.13.4/js/dataTables.bootstrap5.min.js',
+    'vendor/datatables/dataTables.bootstrap5.min.css':
+        'https://cdn.datatables.net/1.13.4/css/dataTables.bootstrap5.min.css',
+    'vendor/datatables/i18n/tr.json':
+        'https://cdn.datatables.net/plug-ins/1.13.4/i18n/tr.json',
+}
+
+HASH_LENGTH = 10
+ASSET_MAX_AGE = 365 * 24 * 3600  # parmak izli dosyalar hiç değişmez
+# CSS içinden göreli adresle istenen parmak izsiz dosyalar (ör. ikon fontları)
+UNHASHED_MAX_AGE = 3600
+
+# Sıkıştırılacak dosya uzantıları ve yanıt türleri (woff2/png zaten sıkıştırılmış)
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.json', '.svg', '.map', '.woff')
+COMPRESSIBLE_MIMETYPES = {'text/html', 'text/css', 'text/plain', 'text/csv', 'application/json',
+                          'application/javascript', 'text/javascript', 'image/svg+xml'}
+MIN_COMPRESS_SIZE = 1024
+
+_HASHED_NAME = re.compile(r'^(?P<stem>.+)\.(?P<hash>[0-9a-f]{%d})(?P<ext>\.[A-Za-z0-9]+)$' % HASH_LENGTH)
+
+# Dosya yolu -> (değişiklik zamanı, içerik özeti)
+_hashes = {}
+
+
+def _static_path(filename):
+    return safe_join(current_app.static_folder, filename)
+
+
+def file_hash(filename):
+    """static/ altındaki dosyanın içerik özeti (dosya değişince yeniden hesaplanır)"""
+    path = _static_path(filename)
+    mtime = os.stat(path).st_mtime_ns
+    cached = _hashes.get(filename)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    with open(path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()[:HASH_LENGTH]
+    _hashes[filename] = (mtime, digest)
+    return digest
+
+
+def asset_url(filename):
+    """url_for('static', ...) yerine: içerik özetli, süresiz önbelleklenebilir adres
+
+    İndirilmemiş üçüncü parti dosyalar için CDN adresi döner.
+    """
+    path = _static_path(filename)
+    if path is None or not os.path.isfile(path):
+        if filename in VENDOR_ASSETS:
+            return VENDOR_ASSETS[filename]
+        return url_for('static', filename=filename)
+
+    stem, ext = os.path.splitext(filename)
+    return url_for('asset', filename=f'{stem}.{file_hash(filename)}{ext}')
+
+
+def _accepted_encoding():
+    """İstemcinin kabul ettiği en iyi sıkıştırma (br > gzip)"""
+    if brotli is not None and request.accept_encodings['br']:
+        return 'br'
+    if request.accept_encodings['gzip']:
+        return 'gzip'
+    return None
+
+
+def serve_asset(filename):
+    """Parmak izli static dosya; varsa önceden sıkıştırılmış (.br/.gz) hali gönderilir
+
+    CSS dosyalarındaki göreli url(...) adresleri (bootstrap-icons.css'in
+    ./fonts/ altındaki fontları gibi) parmak izsiz ada çözülür; bunlar kısa
+    süreli önbellekle aynı route'tan gönderilir.
+    """
+    match = _HASHED_NAME.match(filename)
+    real_name = match['stem'] + match['ext'] if match else filename
+    path = _static_path(real_name)
+    if match and (path is None or not os.path.isfile(path)):
+        match, real_name = None, filename
+        path = _static_path(real_name)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+
+    encoding = None
+    serve_path = path
+    for name, suffix in (('br', '.br'), ('gzip', '.gz')):
+        if request.accept_encodings[name] and os.path.isfile(path + suffix) \
+                and os.stat(path + suffix).st_mtime_ns >= os.stat(path).st_mtime_ns:
+            encoding, serve_path = name, path + suffix
+            break
+
+    mimetype = mimetypes.guess_type(real_name)[0] or 'application/octet-stream'
+    response = send_file(serve_path, mimetype=mimetype, conditional=True, max_age=0)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+
+    if match is None:
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = UNHASHED_MAX_AGE
+    elif match['hash'] == file_hash(real_name):
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = ASSET_MAX_AGE
+        response.cache_control.immutable = True
+    else:
+        # Eski sayfadan gelen istek: güncel içerik, kalıcı önbellek yok
+        response.cache_control.no_cache = True
+    return response
+
+
+def compress_response(response):
+    """HTML/JSON yanıtlarını istemcinin kabul ettiği biçimde sıkıştır
+
+    Akışla gönderilen (export, SSE) ve dosya yanıtlarına dokunulmaz.
+    """
+    if (response.direct_passthrough or response.is_streamed
+            or response.status_code < 200 or response.status_code in (204, 304)
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+
+    encoding = _accepted_encoding()
+    if encoding is None:
+        return response
+    data = response.get_data()
+    if len(data) < MIN_COMPRESS_SIZE:
+        return response
+
+    if encoding == 'br':
+        response.set_data(brotli.compress(data, quality=5))
+    else:
+        response.set_data(gzip.compress(data, compresslevel=6))
+    response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def init_assets(app):
+    """Parmak izli dosya route'unu, asset_url'i ve yanıt sıkıştırmayı kaydet"""
+    app.add_url_rule('/assets/<path:filename>', 'asset', serve_asset)
+    app.add_template_global(asset_url)
+    app.after_request(compress_response)
+
+
+# ==================== KOMUTLAR ====================
+
+def download_vendor_assets(force=False):
+    """VENDOR_ASSETS dosyalarını static/ altına indir; indirilen yolları döndür"""
+    downloaded = []
+    for filename, url in VENDOR_ASSETS.items():
+        path = _static_path(filename)
+        if os.path.isfile(path) and not force:
+            continue
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with urllib.request.urlopen(url, timeout=30) as source:
+            data = source.read()
+        with open(path, 'wb') as target:
+            target.write(data)
+        downloaded.append(filename)
+    return downloaded
+
+
+def precompress_static():
+    """static/ altındaki metin dosyalarının .gz (ve brotli varsa .br) hallerini üret"""
+    written = []
+    for directory, _, files in os.walk(current_app.static_folder):
+        for name in files:
+            if not name.endswith(COMPRESSIBLE_EXTENSIONS):
+                continue
+            path = os.path.join(directory, name)
+            if os.path.getsize(path) < MIN_COMPRESS_SIZE:
+                continue
+            with open(path, 'rb') as f:
+                data = f.read()
+
+            targets = [('.gz', lambda d: gzip.compress(d, compresslevel=9, mtime=0))]
+            if brotli is not None:
+                targets.append(('.br', lambda d: brotli.compress(d, quality=11)))
+            for suffix, compress in targets:
+                target = path + suffix
+                if os.path.isfile(target) and os.stat(target).st_mtime_ns >= os.stat(path).st_mtime_ns:
+                    continue
+                with open(target, 'wb') as f:
+                    f.write(compress(data))
+                written.append(os.path.relpath(target, current_app.static_folder))
+    return written
+
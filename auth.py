@@ -0,0 +1,122 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+from models import db
+
+# Bellekte tutulan en fazla bucket (kullanıcı adı/IP) sayısı
+MAX_BUCKETS = 10000
+
+
+class LoginBusy(Exception):
+    """Şifre doğrulama kuyruğu dolu"""
+
+
+class TokenBucket:
+    """Anahtar başına token bucket (process içi, thread-safe)
+
+    Her deneme bir token harcar; tokenlar `refill_seconds` saniyede bir geri
+    gelir, en fazla `capacity` kadar birikir.
+    """
+
+    def __init__(self, max_keys=MAX_BUCKETS):
+        self.max_keys = max_keys
+        self.buckets = {}  # anahtar -> (token, son güncelleme)
+        self.lock = threading.Lock()
+
+    def consume(self, key, capacity, refill_seconds):
+        """Token harca; izin varsa 0, yoksa tekrar denemeden önce beklenecek saniye"""
+        now = time.monotonic()
+        with self.lock:
+            tokens, updated = self.buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) / refill_seconds)
+            if tokens < 1:
+                self.buckets[key] = (tokens, now)
+                return int((1 - tokens) * refill_seconds) + 1
+            self.buckets[key] = (tokens - 1, now)
+            if len(self.buckets) > self.max_keys:
+                self._prune(now, capacity, refill_seconds)
+        return 0
+
+    def _prune(self, now, capacity, refill_seconds):
+        """Dolmuş bucket'ları, yetmezse en eskilerini at"""
+        full = [key for key, (tokens, updated) in self.buckets.items()
+                if tokens + (now - updated) / refill_seconds >= capacity]
+        for key in full:
+            del self.buckets[key]
+        if len(self.buckets) > self.max_keys:
+            oldest = sorted(self.buckets, key=lambda key: self.buckets[key][1])
+            for key in oldest[:len(self.buckets) - self.max_keys // 2]:
+                del self.buckets[key]
+
+
+_username_buckets = TokenBucket()
+_ip_buckets = TokenBucket()
+
+
+def login_retry_after(username, remote_addr):
+    """Kullanıcı adı ve IP için deneme hakkı: 0 veya beklenecek saniye"""
+    limits = ((_ip_buckets, remote_addr, current_app.config['LOGIN_IP_BUCKET']),
+              (_username_buckets, (username or '').strip().lower(), current_app.config['LOGIN_USERNAME_BUCKET']))
+    for buckets, key, setting in limits:
+        if setting and key:
+            retry_after = buckets.consume(key, *setting)
+            if retry_after:
+                return retry_after
+    return 0
+
+
+# ==================== ŞİFRE DOĞRULAMA ====================
+# PBKDF2 hesabı GIL'i bıraktığından sınırlı sayıda thread'de çalıştırılır; böylece
+# aynı anda gelen girişler bütün CPU'yu kullanıp diğer istekleri bekletmez.
+
+_executor = None
+_slots = None
+_pool_lock = threading.Lock()
+
+
+def _pool():
+    global _executor, _slots
+    with _pool_lock:
+        if _executor is None:
+            workers = current_app.config['LOGIN_HASH_WORKERS']
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+            # Çalışan + kuyrukta bekleyen doğrulama sayısı
+            _slots = threading.BoundedSemaphore(workers + current_app.config['LOGIN_HASH_QUEUE'])
+    return _executor, _slots
+
+
+def _verify(password_hash, password, method):
+    """Şifreyi doğrula; yöntem değiştiyse yeni özeti de döndür"""
+    if not check_password_hash(password_hash, password):
+        return False, None
+    if password_hash.split('$', 1)[0] != method:
+        return True, generate_password_hash(password, method=method)
+    return True, None
+
+
+def check_login_password(user, password):
+    """Giriş şifresini sınırlı havuzda doğrula (kuyruk doluysa LoginBusy)
+
+    Şifre özeti PASSWORD_HASH_METHOD'dan farklı bir yöntem/maliyetle
+    oluşturulmuşsa başarılı girişte yeni yöntemle yeniden oluşturulur.
+    """
+    executor, slots = _pool()
+    if not slots.acquire(blocking=False):
+        raise LoginBusy()
+    try:
+        future = executor.submit(_verify, user.password_hash, password,
+                                 current_app.config['PASSWORD_HASH_METHOD'])
+    except BaseException:
+        slots.release()
+        raise
+    future.add_done_callback(lambda _: slots.release())
+    valid, new_hash = future.result()
+
+    if new_hash is not None:
+        # Şifre aynı kaldığından önbellekteki kullanıcılar geçersiz kılınmaz
+        user.password_hash = new_hash
+        db.session.commit()
+    return valid
+
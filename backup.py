@@ -0,0 +1,214 @@
+import gzip
+import json
+import os
+import shutil
+import sqlite3
+import time
+from models import get_turkey_time
+
+BACKUP_PREFIX = 'database-'
+MANIFEST_SUFFIX = '.json'
+
+
+# ==================== YEDEKLEME ====================
+
+class BackupRestarted(Exception):
+    """Adım adım kopya, araya giren yazmalar yüzünden çok sık baştan başladı"""
+
+
+class BackupProgress:
+    """Online backup adımlarını ölçer ve adımlar arasında yazanlara zaman bırakır
+
+    Her backup_step kaynak veritabanında kısa bir okuma kilidi tutar; iki
+    callback arasındaki süre (bekleme hariç) bu kilidin süresidir. WAL modunda
+    okuyucu yazanları engellemez, ancak kilit süresince checkpoint ilerleyemez.
+    Yedek sırasında başka bağlantı yazarsa SQLite kopyalamaya baştan başlar;
+    kalan sayfa sayısının artması bu yeniden başlamaları gösterir. Yeniden
+    başlama sayısı `max_restarts`'ı aşarsa BackupRestarted ile kopya kesilir.
+    """
+
+    def __init__(self, pause, max_restarts=None):
+        self.pause = pause
+        self.max_restarts = max_restarts
+        self.steps = 0
+        self.restarts = 0
+        self.pages = 0
+        self.locked_seconds = 0.0
+        self.max_step_seconds = 0.0
+        self._remaining = None
+        self._step_started = time.perf_counter()
+
+    def __call__(self, status, remaining, total):
+        step = time.perf_counter() - self._step_started
+        self.steps += 1
+        self.pages = total
+        self.locked_seconds += step
+        self.max_step_seconds = max(self.max_step_seconds, step)
+        if self._remaining is not None and remaining > self._remaining:
+            self.restarts += 1
+            if self.max_restarts is not None and self.restarts > self.max_restarts:
+                raise BackupRestarted(self.restarts)
+        self._remaining = remaining
+        if remaining and self.pause:
+            time.sleep(self.pause)
+        self._step_started = time.perf_counter()
+
+
+def sqlite_database_path(engine):
+    """Engine'in SQLite dosya yolu (bellek içi veya başka veritabanıysa None)"""
+    if engine.dialect.name != 'sqlite' or engine.url.database in (None, '', ':memory:'):
+        return None
+    return os.path.abspath(engine.url.database)
+
+
+def table_counts(connection):
+    """Veritabanındaki her tablonun satır sayısı"""
+    names = [row[0] for row in connection.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name")]
+    return {name: connection.execute(f'SELECT COUNT(*) FROM "{name}"').fetchone()[0] for name in names}
+
+
+def check_database(path):
+    """integrity_check sonucu ve tablo satır sayıları (dosya açılamıyorsa hata mesajı ve boş sayılar)"""
+    connection = sqlite3.connect(path)
+    try:
+        integrity = [row[0] for row in connection.execute('PRAGMA integrity_check')]
+        return integrity, table_counts(connection)
+    except sqlite3.DatabaseError as error:
+        return [str(error)], {}
+    finally:
+        connection.close()
+
+
+def _copy_database(source_path, target_path, pages, progress, busy_timeout):
+    source = sqlite3.connect(source_path, timeout=busy_timeout)
+    target = sqlite3.connect(target_path)
+    try:
+        source.backup(target, pages=pages, progress=progress)
+        # Kaynak WAL modundaysa kopya da öyle işaretlenir; yedek tek dosya olmalı
+        target.execute('PRAGMA journal_mode=DELETE')
+    finally:
+        target.close()
+        source.close()
+
+
+def backup_database(source_path, backup_dir, pages=256, pause=0.005, max_restarts=3, compress=True,
+                    busy_timeout=5.0):
+    """Çalışan veritabanının tutarlı yedeğini SQLite online backup API'si ile al
+
+    Kopya `pages` sayfalık adımlarla yapılır; adımlar arasında `pause` saniye
+    beklenir. Sürekli yazma alan veritabanında adım adım kopya her yazmada
+    baştan başladığından bitmeyebilir; `max_restarts` aşılınca kopya tek
+    adımda (tek okuma snapshot'ı ile) tekrarlanır. WAL modunda bu da yazanları
+    bekletmez. Yedek önce geçici dosyaya yazılır, integrity_check ile doğrulanır,
+    istenirse gzip ile sıkıştırılır ve sonra asıl adına taşınır. Tablo satır
+    sayıları yanındaki .json dosyasına yazılır (verify_backup bunları kullanır).
+
+    Dönen sözlük: dosya yolu, boyutlar, süreler, adım/yeniden başlama sayısı,
+    integrity_check sonucu ve satır sayıları.
+    """
+    os.makedirs(backup_dir, exist_ok=True)
+    name = BACKUP_PREFIX + get_turkey_time().strftime('%Y%m%d-%H%M%S') + '.db'
+    path = os.path.join(backup_dir, name + ('.gz' if compress else ''))
+    temp_path = os.path.join(backup_dir, '.' + name + '.tmp')
+
+    progress = BackupProgress(pause, max_restarts)
+    single_pass = False
+    started = time.perf_counter()
+    try:
+        _copy_database(source_path, temp_path, pages, progress, busy_timeout)
+    except BackupRestarted:
+        os.remove(temp_path)
+        progress.max_restarts = None
+        single_pass = True
+        _copy_database(source_path, temp_path, -1, progress, busy_timeout)
+    backup_seconds = time.perf_counter() - started
+
+    try:
+        integrity, counts = check_database(temp_path)
+        if integrity != ['ok']:
+            raise RuntimeError('Yedek integrity_check hatası: ' + '; '.join(integrity[:5]))
+        size = os.path.getsize(temp_path)
+        if compress:
+            with open(temp_path, 'rb') as source_file, gzip.open(path + '.tmp', 'wb', compresslevel=6) as gz_file:
+                shutil.copyfileobj(source_file, gz_file, 1024 * 1024)
+            os.replace(path + '.tmp', path)
+            os.remove(temp_path)
+        else:
+            os.replace(temp_path, path)
+    finally:
+        for leftover in (temp_path, path + '.tmp'):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+
+    with open(path + MANIFEST_SUFFIX, 'w', encoding='utf-8') as manifest:
+        json.dump({'source': source_path, 'created_at': get_turkey_time().isoformat(), 'size': size,
+                   'counts': counts}, manifest, indent=2)
+
+    return {
+        'path': path,
+        'size': size,
+        'stored_size': os.path.getsize(path),
+        'pages': progress.pages,
+        'steps': progress.steps,
+        'restarts': progress.restarts,
+        'single_pass': single_pass,
+        'backup_seconds': backup_seconds,
+        'locked_seconds': progress.locked_seconds,
+        'max_step_seconds': progress.max_step_seconds,
+        'total_seconds': time.perf_counter() - started,
+        'integrity': integrity,
+        'counts': counts,
+    }
+
+
+# ==================== SAKLAMA VE DOĞRULAMA ====================
+
+def list_backups(backup_dir):
+    """Yedek dosyaları (eskiden yeniye)"""
+    if not os.path.isdir(backup_dir):
+        return []
+    names = [name for name in os.listdir(backup_dir)
+             if name.startswith(BACKUP_PREFIX) and name.endswith(('.db', '.db.gz'))]
+    return [os.path.join(backup_dir, name) for name in sorted(names)]
+
+
+def rotate_backups(backup_dir, keep):
+    """En yeni `keep` yedek dışındakileri (manifest dosyalarıyla) sil; silinenleri döndür"""
+    backups = list_backups(backup_dir)
+    removed = backups[:-keep] if keep > 0 else backups
+    for path in removed:
+        os.remove(path)
+        if os.path.exists(path + MANIFEST_SUFFIX):
+            os.remove(path + MANIFEST_SUFFIX)
+    return removed
+
+
+def verify_backup(path):
+    """Yedeği geçici dosyaya geri yükleyip integrity_check ve satır sayılarıyla doğrula
+
+    Dönen sözlük: integrity_check sonucu, satır sayıları ve manifest ile
+    uyuşmayan tablolar (tablo -> (manifest, yedek)). Manifest yoksa
+    karşılaştırma yapılmaz.
+    """
+    restore_path = path[:-len('.gz')] + '.verify' if path.endswith('.gz') else path
+    try:
+        if path.endswith('.gz'):
+            with gzip.open(path, 'rb') as gz_file, open(restore_path, 'wb') as restore_file:
+                shutil.copyfileobj(gz_file, restore_file, 1024 * 1024)
+        integrity, counts = check_database(restore_path)
+    finally:
+        if restore_path != path and os.path.exists(restore_path):
+            os.remove(restore_path)
+
+    expected = None
+    if os.path.exists(path + MANIFEST_SUFFIX):
+        with open(path + MANIFEST_SUFFIX, encoding='utf-8') as manifest:
+            expected = json.load(manifest)['counts']
+    mismatches = {}
+    if expected is not None:
+        for table in sorted(set(expected) | set(counts)):
+            if expected.get(table) != counts.get(table):
+                mismatches[table] = (expected.get(table), counts.get(table))
+    return {'integrity': integrity, 'counts': counts, 'mismatches': mismatches, 'manifest': expected is not None}
+
@@ -0,0 +1,131 @@
+"""Liste sayfalarının SQL sorgu sayısı kontrolü (N+1 sorgu regresyonu)
+
+Her veri büyüklüğü için geçici bir veritabanı oluşturulur, generate_data ile
+doldurulur ve aşağıdaki sayfaların tek istekte çalıştırdığı SQL sorguları
+before_cursor_execute ile sayılır:
+    dashboard, my_notifications, admin_notifications_data
+Sorgu sayısı PAGES'teki sınırı aşarsa veya veri büyüdükçe artarsa
+(satır başına sorgu) çıkış kodu 1 döner.
+
+Uygulama veritabanını import sırasında seçtiğinden her büyüklük ayrı bir
+süreçte ölçülür.
+
+Kullanım:
+    python benchmarks/check_query_counts.py
+    python benchmarks/check_query_counts.py --sizes 500 5000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+
+ADMIN_PASSWORD = 'Admin123!'
+
+# Sayfa -> (adres, tek istekte izin verilen en fazla sorgu)
+PAGES = {
+    'dashboard': ('/dashboard', 4),
+    'my_notifications': ('/my-notifications', 4),
+    'admin_notifications_data': ('/admin/notifications/data?draw=1&start=0&length=50', 6),
+}
+
+
+def run_size(size, companies):
+    """Tek veri büyüklüğü: sayfa -> (sorgu sayısı, listelenen satır) (DATABASE_URL geçici veritabanıdır)"""
+    from sqlalchemy import event
+    from app import app, init_db
+    from models import db, User
+    from generate_data import generate, COMPANY_PASSWORD
+
+    app.config['WTF_CSRF_ENABLED'] = False
+    init_db()
+    with app.app_context():
+        User.query.filter_by(username='admin').update({'must_change_password': False})
+        db.session.commit()
+        # Son günlere yoğunlaşan veri: dashboard'da da çok satır olsun
+        username = generate(companies, size, days=7)[0]
+        engine = db.engine
+
+    def logged_in(name, password):
+        client = app.test_client()
+        response = client.post('/login', data={'username': name, 'password': password})
+        if response.status_code != 302:
+            raise RuntimeError(f'{name} giriş yapamadı')
+        return client
+
+    clients = {
+        'dashboard': logged_in(username, COMPANY_PASSWORD),
+        'my_notifications': logged_in(username, COMPANY_PASSWORD),
+        'admin_notifications_data': logged_in('admin', ADMIN_PASSWORD),
+    }
+
+    statements = []
+    event.listen(engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+
+    results = {}
+    for name, (url, _) in PAGES.items():
+        client = clients[name]
+        # İlk istek süreç önbelleklerini doldurur; kararlı durumdaki istek sayılır
+        client.get(url)
+        statements.clear()
+        response = client.get(url)
+        if response.status_code != 200:
+            raise RuntimeError(f'{url}: beklenmeyen yanıt {response.status_code}')
+        if response.is_json:
+            rows = len(response.get_json()['data'])
+        else:
+            rows = response.get_data(as_text=True).count('<tr') - 1
+        results[name] = {'statements': len(statements), 'rows': rows}
+    return results
+
+
+def run_size_subprocess(size, companies):
+    """run_size'ı yeni bir Python sürecinde, geçici veritabanıyla çalıştır"""
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, 'result.json')
+        env = dict(os.environ, DATABASE_URL='sqlite:///' + os.path.join(directory, 'check.db'))
+        subprocess.run([sys.executable, os.path.abspath(__file__), '--worker', str(size), output,
+                        '--companies', str(companies)],
+                       env=env, check=True, stdout=subprocess.DEVNULL)
+        with open(output, encoding='utf-8') as f:
+            return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs=2, default=[200, 2000], metavar=('SMALL', 'LARGE'))
+    parser.add_argument('--companies', type=int, default=5)
+    parser.add_argument('--worker', nargs=2, metavar=('SIZE', 'OUTPUT'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        size, output = int(args.worker[0]), args.worker[1]
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(run_size(size, args.companies), f)
+        return
+
+    small, large = (run_size_subprocess(size, args.companies) for size in args.sizes)
+    failed = False
+    for name, (url, limit) in PAGES.items():
+        counts = (small[name]['statements'], large[name]['statements'])
+        problems = []
+        if max(counts) > limit:
+            problems.append(f'sınır {limit}')
+        if counts[1] > counts[0]:
+            problems.append('veriyle artıyor')
+        status = 'HATA: ' + ', '.join(problems) if problems else 'OK'
+        print(f"[{status}] {name}: {counts[0]} / {counts[1]} sorgu "
+              f"({small[name]['rows']} / {large[name]['rows']} satır)")
+        failed = failed or bool(problems)
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
+
@@ -0,0 +1,141 @@
+"""Ölçüm için sentetik veri üretici (N firma, M bildirim)
+
+Başlangıç verilerine (init_db: admin, laboratuvarlar, santraller) ek olarak
+'firma001', 'firma002', ... kullanıcılarını ve gerçekçi dağılımlı bildirimleri
+ekler:
+- Firma büyüklükleri dengesizdir (birkaç büyük firma bildirimlerin çoğunu yapar)
+- Döküm tarihleri son --days güne yayılır; hafta içi ve yaz ayları daha yoğundur
+- Döküm saatleri sabah/öğlen ağırlıklıdır, çeyrek saatlere yuvarlanır
+- Beton miktarı çoğunlukla 5-60 m³ arasındadır
+
+Aynı --seed ile aynı veri üretilir. Hedef veritabanı DATABASE_URL ile seçilir.
+
+Kullanım:
+    DATABASE_URL=sqlite:////tmp/bench.db python benchmarks/generate_data.py --companies 50 --notifications 100000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Bütün firma kullanıcılarının şifresi
+COMPANY_PASSWORD = 'Ydk123!'
+
+# Haftanın günlerine göre ağırlık (Pazartesi=0 ... Pazar=6)
+WEEKDAY_WEIGHTS = (1.0, 1.0, 1.0, 1.0, 0.95, 0.55, 0.15)
+# Aylara göre ağırlık (Ocak=1 ... Aralık=12) - kışın döküm azalır
+MONTH_WEIGHTS = {1: 0.35, 2: 0.4, 3: 0.7, 4: 0.95, 5: 1.1, 6: 1.2,
+                 7: 1.2, 8: 1.2, 9: 1.1, 10: 0.95, 11: 0.7, 12: 0.45}
+
+KAT_BOLGELERI = ['Temel', 'Bodrum Kat', 'Zemin Kat', 'Çatı', 'Perde Duvar', 'Merdiven', 'Kolon', 'Döşeme']
+
+
+def company_weights(count):
+    """Firma büyüklükleri: sıraya göre azalan (Zipf benzeri) ağırlıklar"""
+    return [1 / (rank + 1) ** 0.8 for rank in range(count)]
+
+
+def day_weights(today, days):
+    """Son `days` günün (bugün dahil) tarihleri ve ağırlıkları"""
+    dates = [today - timedelta(days=offset) for offset in range(days)]
+    weights = [WEEKDAY_WEIGHTS[day.weekday()] * MONTH_WEIGHTS[day.month] for day in dates]
+    return dates, weights
+
+
+def random_minutes(rng):
+    """Döküm saati (gece yarısından itibaren dakika): 06:00-20:00, 10:00 civarı yoğun"""
+    while True:
+        hour = rng.gauss(10.5, 2.5)
+        if 6 <= hour < 20:
+            return int(hour * 4) * 15
+
+
+def random_volume(rng):
+    """Beton miktarı (m³): log-normal, 1-400 arası, yarım m³'e yuvarlanmış"""
+    return min(max(round(rng.lognormvariate(3.0, 0.7) * 2) / 2, 1), 400)
+
+
+def notification_record(rng, index, day, lab_ids, plant_ids):
+    minutes = random_minutes(rng)
+    volume = random_volume(rng)
+    volume_text = f'{volume:g}'.replace('.', ',')
+    return {
+        'yibf_no': str(1000000 + index),
+        'beton_miktari': f'{volume_text} m³',
+        'beton_miktari_m3': Decimal(volume).quantize(Decimal('0.01')),
+        'kat_bolge': f'{rng.randint(1, 12)}. Kat' if rng.random() < 0.6 else rng.choice(KAT_BOLGELERI),
+        'beton_santrali_id': rng.choice(plant_ids),
+        'laboratuvar_id': rng.choice(lab_ids),
+        'dokum_tarihi': day,
+        'dokum_zamani': f'{minutes // 60:02d}:{minutes % 60:02d}',
+        'dokum_dakika': minutes,
+        'aciklama': rng.choice([None, None, None, 'Pompa ile döküm', 'Numune alınacak', 'Hava sıcak']),
+    }
+
+
+def generate(companies, notifications, days=365, seed=42, today=None):
+    """Firmaları ve bildirimleri ekle; firma kullanıcı adlarını döndür (uygulama context'i içinde)"""
+    from flask import current_app
+    from werkzeug.security import generate_password_hash
+    from app import get_turkey_date
+    from bulk_import import insert_notifications
+    from models import db, User, Laboratuvar, BetonSantrali
+
+    rng = random.Random(seed)
+    today = today or get_turkey_date()
+
+    # Şifre özeti bir kez hesaplanır; her kullanıcı için hesaplamak çok uzun sürer
+    password_hash = generate_password_hash(COMPANY_PASSWORD, method=current_app.config['PASSWORD_HASH_METHOD'])
+    existing = {username for (username,) in db.session.query(User.username)}
+    usernames = [f'firma{number:03d}' for number in range(1, companies + 1)]
+    for number, username in enumerate(usernames, start=1):
+        if username not in existing:
+            db.session.add(User(username=username, password_hash=password_hash,
+                                company_name=f'Firma {number:03d} Yapı Denetim',
+                                role='user', must_change_password=False))
+    db.session.commit()
+
+    user_ids = [User.query.filter_by(username=username).one().id for username in usernames]
+    lab_ids = [lab.id for lab in Laboratuvar.query.filter_by(is_active=True)]
+    plant_ids = [plant.id for plant in BetonSantrali.query.filter_by(is_active=True)]
+    dates, weights = day_weights(today, days)
+
+    owners = rng.choices(user_ids, weights=company_weights(len(user_ids)), k=notifications)
+    days_chosen = rng.choices(dates, weights=weights, k=notifications)
+    by_user = {}
+    for index, (user_id, day) in enumerate(zip(owners, days_chosen)):
+        by_user.setdefault(user_id, []).append(notification_record(rng, index, day, lab_ids, plant_ids))
+
+    for user_id, records in by_user.items():
+        insert_notifications(user_id, records)
+    db.session.commit()
+    return usernames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--companies', type=int, default=50)
+    parser.add_argument('--notifications', type=int, default=100000)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    from app import app, init_db
+
+    init_db()
+    started = time.perf_counter()
+    with app.app_context():
+        generate(args.companies, args.notifications, args.days, args.seed)
+    print(json.dumps({'companies': args.companies, 'notifications': args.notifications,
+                      'seconds': round(time.perf_counter() - started, 2)}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
+
@@ -0,0 +1,216 @@
+"""Route gecikme ölçümü (Flask test client, farklı veri büyüklüklerinde)
+
+Her veri büyüklüğü için geçici bir veritabanı oluşturulur, generate_data ile
+doldurulur ve aşağıdaki senaryolar sırayla ölçülür:
+    login, dashboard, add_notification, my_notifications,
+    admin_notifications, admin_notifications_data
+Her senaryo için p50/p95/p99/ortalama gecikme (ms) ve saniyedeki istek sayısı
+JSON olarak kaydedilir. --compare ile önceki bir sonuç dosyasına göre p95
+değişimi yazdırılır.
+
+Uygulama veritabanını import sırasında seçtiğinden her büyüklük ayrı bir
+süreçte ölçülür. CSRF kontrolü ölçüm süresince kapatılır.
+
+Kullanım:
+    python benchmarks/run_benchmarks.py --sizes 1000 10000 100000 --requests 200
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/20240101-120000.json
+"""
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+
+RESULTS_DIR = os.path.join(BENCHMARK_DIR, 'results')
+ADMIN_PASSWORD = 'Admin123!'
+
+# Şifre özeti her girişte hesaplandığından login daha az tekrarlanır
+LOGIN_REQUEST_RATIO = 0.2
+
+
+def percentile(sorted_values, fraction):
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def summarize(latencies):
+    values = sorted(latencies)
+    total = sum(values)
+    return {
+        'requests': len(values),
+        'p50_ms': round(percentile(values, 0.50) * 1000, 2),
+        'p95_ms': round(percentile(values, 0.95) * 1000, 2),
+        'p99_ms': round(percentile(values, 0.99) * 1000, 2),
+        'mean_ms': round(total / len(values) * 1000, 2),
+        'requests_per_sec': round(len(values) / total, 1),
+    }
+
+
+def measure(request, count, warmup, expected_status):
+    """request() fonksiyonunu warmup + count kez çağır; ölçülen süreleri döndür"""
+    latencies = []
+    for i in range(warmup + count):
+        started = time.perf_counter()
+        response = request(i)
+        elapsed = time.perf_counter() - started
+        if response.status_code != expected_status:
+            raise RuntimeError(f'Beklenmeyen yanıt {response.status_code} (beklenen {expected_status})')
+        if i >= warmup:
+            latencies.append(elapsed)
+    return latencies
+
+
+# ==================== ÖLÇÜM SÜRECİ ====================
+
+def run_size(size, companies, requests, warmup):
+    """Tek veri büyüklüğü (bu süreçte DATABASE_URL geçici veritabanını gösterir)"""
+    from app import app, init_db, get_turkey_date
+    from models import db, User
+    from generate_data import generate, COMPANY_PASSWORD
+
+    app.config['WTF_CSRF_ENABLED'] = False
+    # Aynı kullanıcı/IP ile art arda giriş ölçülür; deneme sınırı kapatılır
+    app.config['LOGIN_USERNAME_BUCKET'] = app.config['LOGIN_IP_BUCKET'] = None
+    init_db()
+    with app.app_context():
+        User.query.filter_by(username='admin').update({'must_change_password': False})
+        db.session.commit()
+        started = time.perf_counter()
+        usernames = generate(companies, size)
+        generate_seconds = time.perf_counter() - started
+
+    # En çok bildirimi olan firma (firma001) ile ölçülür
+    username = usernames[0]
+    today = get_turkey_date().isoformat()
+
+    def logged_in(name, password):
+        client = app.test_client()
+        response = client.post('/login', data={'username': name, 'password': password})
+        if response.status_code != 302:
+            raise RuntimeError(f'{name} giriş yapamadı')
+        return client
+
+    user = logged_in(username, COMPANY_PASSWORD)
+    adder = logged_in(username, COMPANY_PASSWORD)
+    admin = logged_in('admin', ADMIN_PASSWORD)
+
+    def add(i):
+        response = adder.post('/notification/add', data={
+            'yibf_no': f'B{i:06d}', 'beton_miktari': '25', 'kat_bolge': 'Zemin Kat',
+            'beton_santrali_id': 1, 'laboratuvar_id': 1, 'dokum_tarihi': today, 'dokum_zamani': '10:30',
+        })
+        # Yönlendirme izlenmediği için flash mesajları oturumda birikmesin
+        with adder.session_transaction() as session:
+            session.pop('_flashes', None)
+        return response
+
+    scenarios = {
+        'login': (lambda i: app.test_client().post(
+            '/login', data={'username': username, 'password': COMPANY_PASSWORD}),
+            max(int(requests * LOGIN_REQUEST_RATIO), 1), 302),
+        'dashboard': (lambda i: user.get('/dashboard'), requests, 200),
+        'add_notification': (add, requests, 302),
+        'my_notifications': (lambda i: user.get('/my-notifications'), requests, 200),
+        'admin_notifications': (lambda i: admin.get('/admin/notifications'), requests, 200),
+        'admin_notifications_data': (lambda i: admin.get(
+            '/admin/notifications/data?draw=1&start=0&length=50'), requests, 200),
+    }
+
+    results = {}
+    for name, (request, count, expected_status) in scenarios.items():
+        results[name] = summarize(measure(request, count, warmup, expected_status))
+    return {'generate_seconds': round(generate_seconds, 2), 'scenarios': results}
+
+
+def run_size_subprocess(size, args):
+    """run_size'ı yeni bir Python sürecinde, geçici veritabanıyla çalıştır"""
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, 'result.json')
+        env = dict(os.environ, DATABASE_URL='sqlite:///' + os.path.join(directory, 'bench.db'))
+        subprocess.run([sys.executable, os.path.abspath(__file__), '--worker', str(size), output,
+                        '--companies', str(args.companies), '--requests', str(args.requests),
+                        '--warmup', str(args.warmup)],
+                       env=env, check=True, stdout=subprocess.DEVNULL)
+        with open(output, encoding='utf-8') as f:
+            return json.load(f)
+
+
+# ==================== SONUÇLAR ====================
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCHMARK_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(previous, current):
+    """Ortak büyüklük/senaryolar için p95 değişimini yazdır"""
+    for size, result in current['sizes'].items():
+        before = previous.get('sizes', {}).get(size)
+        if before is None:
+            continue
+        print(f'\n{size} bildirim (p95, ms):')
+        for name, values in result['scenarios'].items():
+            old = before['scenarios'].get(name)
+            if old is None:
+                continue
+            change = (values['p95_ms'] - old['p95_ms']) / old['p95_ms'] * 100 if old['p95_ms'] else 0
+            print(f'  {name:28} {old["p95_ms"]:9.2f} -> {values["p95_ms"]:9.2f}  ({change:+.1f}%)')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--companies', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument('--output', help='sonuç dosyası (varsayılan: benchmarks/results/<zaman>.json)')
+    parser.add_argument('--compare', help='karşılaştırılacak önceki sonuç dosyası')
+    parser.add_argument('--worker', nargs=2, metavar=('SIZE', 'OUTPUT'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        size, output = int(args.worker[0]), args.worker[1]
+        result = run_size(size, args.companies, args.requests, args.warmup)
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(result, f)
+        return
+
+    results = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'companies': args.companies,
+        'requests': args.requests,
+        'sizes': {},
+    }
+    for size in args.sizes:
+        print(f'{size} bildirim ölçülüyor...', file=sys.stderr)
+        results['sizes'][str(size)] = run_size_subprocess(size, args)
+
+    output = args.output or os.path.join(RESULTS_DIR, datetime.now().strftime('%Y%m%d-%H%M%S') + '.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(json.dumps(results, indent=2))
+    print(f'Sonuçlar kaydedildi: {output}', file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            compare(json.load(f), results)
+
+
+if __name__ == '__main__':
+    main()
+
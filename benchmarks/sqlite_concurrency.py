@@ -0,0 +1,145 @@
+"""SQLite eşzamanlı okuma/yazma karşılaştırması (varsayılan ayarlar - Config.SQLITE_PRAGMAS)
+
+Geçici bir veritabanında aynı anda çalışan okuyucu (admin listesi sorgusu) ve
+yazıcı (tek bildirim ekleyip commit eden) thread'ler ile saniyedeki işlem
+sayısını ve "database is locked" hatalarını ölçer. Sonuç JSON olarak yazdırılır.
+
+Kullanım:
+    python benchmarks/sqlite_concurrency.py --seconds 10 --readers 8 --writers 4
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.exc import OperationalError
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config  # noqa: E402
+from database import configure_sqlite  # noqa: E402
+from models import db, Notification, get_turkey_time  # noqa: E402
+
+SEED_ROWS = 20000
+
+
+def notification_row(i, today):
+    return {
+        'user_id': 1 + i % 10, 'yibf_no': f'{100000 + i}', 'beton_miktari': f'{i % 40 + 1} m³',
+        'beton_miktari_m3': i % 40 + 1, 'kat_bolge': f'{i % 12}. Kat', 'beton_santrali_id': 1 + i % 9,
+        'laboratuvar_id': 1 + i % 3, 'dokum_tarihi': today - timedelta(days=i % 365),
+        'dokum_zamani': f'{i % 24:02d}:{i % 60:02d}', 'dokum_dakika': (i % 24) * 60 + i % 60,
+        'created_at': get_turkey_time(), 'updated_at': get_turkey_time(),
+    }
+
+
+def create_database(path):
+    engine = create_engine(f'sqlite:///{path}')
+    db.metadata.create_all(engine)
+    today = date.today()
+    with engine.begin() as conn:
+        conn.execute(insert(Notification.__table__), [notification_row(i, today) for i in range(SEED_ROWS)])
+    engine.dispose()
+
+
+def run_profile(path, pragmas, engine_options, seconds, readers, writers):
+    engine = create_engine(f'sqlite:///{path}', **engine_options)
+    configure_sqlite(engine, pragmas)
+    table = Notification.__table__
+    today = date.today()
+    stop = threading.Event()
+    lock = threading.Lock()
+    totals = {'reads': 0, 'writes': 0, 'locked': 0, 'read_latency': [], 'write_latency': []}
+
+    def reader():
+        reads, latencies, locked = 0, [], 0
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                with engine.connect() as conn:
+                    conn.execute(select(func.count()).select_from(table)
+                                 .where(table.c.laboratuvar_id == 1)).scalar()
+                    conn.execute(select(table).where(table.c.laboratuvar_id == 1)
+                                 .order_by(table.c.dokum_tarihi.desc(), table.c.dokum_dakika.desc())
+                                 .limit(50)).all()
+                reads += 1
+                latencies.append(time.perf_counter() - started)
+            except OperationalError:
+                locked += 1
+        with lock:
+            totals['reads'] += reads
+            totals['locked'] += locked
+            totals['read_latency'].extend(latencies)
+
+    def writer(offset):
+        writes, latencies, locked, i = 0, [], 0, offset
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                with engine.begin() as conn:
+                    conn.execute(insert(table).values(**notification_row(SEED_ROWS + i, today)))
+                writes += 1
+                latencies.append(time.perf_counter() - started)
+            except OperationalError:
+                locked += 1
+            i += writers
+        with lock:
+            totals['writes'] += writes
+            totals['locked'] += locked
+            totals['write_latency'].extend(latencies)
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads += [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+
+    def p95(values):
+        values = sorted(values)
+        return round(values[int(len(values) * 0.95)] * 1000, 2) if values else None
+
+    return {
+        'reads_per_sec': round(totals['reads'] / seconds, 1),
+        'writes_per_sec': round(totals['writes'] / seconds, 1),
+        'locked_errors': totals['locked'],
+        'read_p95_ms': p95(totals['read_latency']),
+        'write_p95_ms': p95(totals['write_latency']),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=4)
+    args = parser.parse_args()
+
+    profiles = {
+        # SQLAlchemy/pysqlite varsayılanları: rollback journal, synchronous=FULL
+        'default': ({}, {}),
+        'tuned': (Config.SQLITE_PRAGMAS, Config.SQLALCHEMY_POOL_OPTIONS),
+    }
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for name, (pragmas, engine_options) in profiles.items():
+            path = os.path.join(directory, f'{name}.db')
+            create_database(path)
+            results[name] = run_profile(path, pragmas, engine_options,
+                                        args.seconds, args.readers, args.writers)
+
+    print(json.dumps({'seconds': args.seconds, 'readers': args.readers, 'writers': args.writers,
+                      'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
+
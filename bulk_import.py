@@ -0,0 +1,155 @@
+import csv
+from datetime import datetime
+from sqlalchemy import insert
+from models import (db, Notification, get_turkey_time, parse_dokum_zamani, format_dokum_zamani,
+                    parse_beton_miktari)
+from stats import (apply_counter_deltas, notification_deltas, add_rollup_delta, apply_rollup_deltas,
+                   ROLLUP_FIELDS)
+from live import publish_reload
+from schedule import bump_schedule_versions
+
+# Toplu içe aktarımda beklenen sütun sırası (ilk satır başlık olabilir)
+IMPORT_COLUMNS = ['YİBF No', 'Beton Miktarı', 'Kat/Bölge', 'Beton Santrali', 'Laboratuvar',
+                  'Döküm Tarihi', 'Döküm Zamanı', 'Açıklama']
+REQUIRED_COLUMNS = 7  # Açıklama isteğe bağlı
+
+# Tek executemany ile eklenen satır sayısı
+INSERT_BATCH_SIZE = 1000
+
+DATE_FORMATS = ('%d.%m.%Y', '%Y-%m-%d', '%d/%m/%Y')
+
+
+def _normalize_name(value):
+    """Ad karşılaştırması için boşluk ve büyük/küçük harf farklarını yok say"""
+    return ' '.join(value.split()).casefold()
+
+
+def decode_upload(data):
+    """Yüklenen dosyayı metne çevir (UTF-8, olmazsa Excel'in Türkçe kodlaması)"""
+    try:
+        return data.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        return data.decode('cp1254', errors='replace')
+
+
+def read_rows(content):
+    """CSV/yapıştırılan metni (satır no, hücreler) listesine çevir
+
+    Ayraç ';', ',' veya sekme olabilir (Excel'den kopyalanan satırlar sekmelidir).
+    """
+    lines = content.splitlines()
+    first_line = next((line for line in lines if line.strip()), '')
+    # Ondalık virgül (12,5) nedeniyle virgül en son tercih edilir
+    delimiter = next((d for d in ('\t', ';') if d in first_line), ',')
+
+    rows = []
+    for line_no, cells in enumerate(csv.reader(lines, delimiter=delimiter), start=1):
+        cells = [cell.strip() for cell in cells]
+        if not any(cells):
+            continue
+        # Başlık satırını atla
+        if not rows and cells and _normalize_name(cells[0]) == _normalize_name(IMPORT_COLUMNS[0]):
+            continue
+        rows.append((line_no, cells))
+    return rows
+
+
+def _parse_date(value):
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def validate_rows(rows, labs, plants):
+    """Satırları NotificationForm kurallarıyla doğrula
+
+    labs/plants: aktif referans kayıtları (ad ile eşlenir, tek sözlük araması).
+    Sayıya çevrilemeyen beton miktarı formdaki gibi hata sayılmaz: metin
+    saklanır, beton_miktari_m3 boş kalır ve satır uyarılara eklenir.
+    Dönen değer: (geçerli kayıtlar, [(satır no, hata mesajları)], [(satır no, uyarı)]).
+    """
+    lab_ids = {_normalize_name(lab.ad): lab.id for lab in labs}
+    plant_ids = {_normalize_name(plant.ad): plant.id for plant in plants}
+
+    records = []
+    errors = []
+    warnings = []
+    for line_no, cells in rows:
+        cells = cells + [''] * (len(IMPORT_COLUMNS) - len(cells))
+        yibf_no, beton_miktari, kat_bolge, santral, laboratuvar, tarih, zaman, aciklama = \
+            cells[:len(IMPORT_COLUMNS)]
+
+        messages = [f'{name} gereklidir'
+                    for name, value in zip(IMPORT_COLUMNS[:REQUIRED_COLUMNS], cells) if not value]
+
+        amount = parse_beton_miktari(beton_miktari) if beton_miktari else None
+
+        minutes = parse_dokum_zamani(zaman) if zaman else None
+        if zaman and minutes is None:
+            messages.append('Geçersiz zaman formatı. HH:MM formatında giriniz (örn: 14:30)')
+
+        dokum_tarihi = _parse_date(tarih) if tarih else None
+        if tarih and dokum_tarihi is None:
+            messages.append('Geçersiz tarih. GG.AA.YYYY formatında giriniz (örn: 25.03.2024)')
+
+        plant_id = plant_ids.get(_normalize_name(santral)) if santral else None
+        if santral and plant_id is None:
+            messages.append(f'Beton santrali bulunamadı: {santral}')
+
+        lab_id = lab_ids.get(_normalize_name(laboratuvar)) if laboratuvar else None
+        if laboratuvar and lab_id is None:
+            messages.append(f'Laboratuvar bulunamadı: {laboratuvar}')
+
+        if messages:
+            errors.append((line_no, messages))
+            continue
+
+        if beton_miktari and amount is None:
+            warnings.append((line_no, f'Beton miktarı sayıya çevrilemedi ({beton_miktari}); '
+                                      'm³ toplamlarına dahil edilmeyecek'))
+
+        records.append({
+            'yibf_no': yibf_no,
+            'beton_miktari': beton_miktari,
+            'beton_miktari_m3': amount,
+            'kat_bolge': kat_bolge,
+            'beton_santrali_id': plant_id,
+            'laboratuvar_id': lab_id,
+            'dokum_tarihi': dokum_tarihi,
+            'dokum_zamani': format_dokum_zamani(minutes),
+            'dokum_dakika': minutes,
+            'aciklama': aciklama or None,
+        })
+
+    return records, errors, warnings
+
+
+def insert_notifications(user_id, records):
+    """Doğrulanmış kayıtları toplu ekle (commit çağırana aittir)
+
+    ORM nesnesi oluşturulmadan INSERT ... executemany ile INSERT_BATCH_SIZE'lık
+    parçalar halinde eklenir. Mapper event'leri çalışmadığından sayaçlar, aylık
+    özetler, canlı pano olayları (gün başına tek 'reload') ve program sürümleri
+    burada yazılır; arama indeksi SQLite trigger'ları ile güncellenir.
+    """
+    now = get_turkey_time()
+    table = Notification.__table__
+    for start in range(0, len(records), INSERT_BATCH_SIZE):
+        batch = [dict(record, user_id=user_id, created_at=now, updated_at=now)
+                 for record in records[start:start + INSERT_BATCH_SIZE]]
+        db.session.execute(insert(table), batch)
+
+    days = [record['dokum_tarihi'] for record in records]
+    apply_counter_deltas(db.session.connection(), notification_deltas(added=days))
+    rollups = {}
+    for record in records:
+        add_rollup_delta(rollups, *(user_id if field == 'user_id' else record[field] for field in ROLLUP_FIELDS))
+    apply_rollup_deltas(db.session.connection(), rollups)
+    publish_reload(db.session.connection(), days)
+    bump_schedule_versions(db.session.connection(),
+                           {(record['laboratuvar_id'], record['dokum_tarihi']) for record in records})
+    return len(records)
+
@@ -0,0 +1,113 @@
+from collections import namedtuple
+import threading
+import time
+from flask import current_app, g
+from sqlalchemy.orm import make_transient_to_detached
+from models import db, User, Laboratuvar, BetonSantrali, CacheVersion
+
+# Dropdown'larda kullanılan hafif, değiştirilemez referans kayıtları
+LabRef = namedtuple('LabRef', ['id', 'ad'])
+PlantRef = namedtuple('PlantRef', ['id', 'ad'])
+CompanyRef = namedtuple('CompanyRef', ['id', 'company_name'])
+
+# Sürüm damgası tutulan önbellek adları
+CACHE_NAMES = ('labs', 'plants', 'users')
+
+# Process içi önbellek: ad -> (sürüm, veri)
+_cache = {}
+# Oturum kullanıcıları: user_id -> (users sürümü, son geçerlilik zamanı, sütun değerleri)
+_user_cache = {}
+_lock = threading.Lock()
+
+
+def current_versions():
+    """Sürüm damgalarını döndür (istek başına tek küçük sorgu)"""
+    if 'cache_versions' not in g:
+        g.cache_versions = dict(db.session.query(CacheVersion.name, CacheVersion.version).all())
+    return g.cache_versions
+
+
+def ensure_cache_versions():
+    """Eksik sürüm damgası satırlarını oluştur"""
+    existing = {name for (name,) in db.session.query(CacheVersion.name).all()}
+    for name in CACHE_NAMES:
+        if name not in existing:
+            db.session.add(CacheVersion(name=name, version=0))
+    db.session.commit()
+
+
+def bump_version(name):
+    """Önbelleği geçersiz kıl - değişiklikle aynı transaction içinde, commit'ten önce çağrılmalı
+
+    Diğer worker'lar bir sonraki isteklerinde yeni sürümü görüp veriyi yeniden yükler.
+    """
+    updated = CacheVersion.query.filter_by(name=name).update(
+        {CacheVersion.version: CacheVersion.version + 1}, synchronize_session=False)
+    if not updated:
+        db.session.add(CacheVersion(name=name, version=1))
+    g.pop('cache_versions', None)
+
+
+def _cached(name, loader):
+    """Sürüm değişmediyse önbellekteki veriyi, değiştiyse yeniden yüklenen veriyi döndür"""
+    version = current_versions().get(name, 0)
+    with _lock:
+        cached = _cache.get(name)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    data = loader()
+    with _lock:
+        _cache[name] = (version, data)
+    return data
+
+
+def active_labs():
+    """Aktif laboratuvarlar (ada göre sıralı)"""
+    return _cached('labs', lambda: tuple(
+        LabRef(lab.id, lab.ad) for lab in
+        Laboratuvar.query.filter_by(is_active=True).order_by(Laboratuvar.ad).all()
+    ))
+
+
+def active_plants():
+    """Aktif beton santralleri (ada göre sıralı)"""
+    return _cached('plants', lambda: tuple(
+        PlantRef(plant.id, plant.ad) for plant in
+        BetonSantrali.query.filter_by(is_active=True).order_by(BetonSantrali.ad).all()
+    ))
+
+
+def company_users():
+    """Yapı denetim kullanıcıları (firma adına göre sıralı)"""
+    return _cached('users', lambda: tuple(
+        CompanyRef(user.id, user.company_name) for user in
+        User.query.filter_by(role='user').order_by(User.company_name).all()
+    ))
+
+
+def load_cached_user(user_id):
+    """Flask-Login için oturum kullanıcısını önbellekten yükle
+
+    Kayıt, 'users' sürümü değişene veya USER_CACHE_TTL dolana kadar geçerlidir.
+    Dönen nesne session'a bağlıdır; üzerinde yapılan değişiklikler commit edilebilir.
+    """
+    version = current_versions().get('users', 0)
+    now = time.monotonic()
+    with _lock:
+        entry = _user_cache.get(user_id)
+    
+    if entry is not None and entry[0] == version and entry[1] > now:
+        user = User(**entry[2])
+        make_transient_to_detached(user)
+        return db.session.merge(user, load=False)
+    
+    user = db.session.get(User, user_id)
+    with _lock:
+        if user is None:
+            _user_cache.pop(user_id, None)
+        else:
+            values = {column.key: getattr(user, column.key) for column in User.__table__.columns}
+            _user_cache[user_id] = (version, now + current_app.config['USER_CACHE_TTL'], values)
+    return user
+
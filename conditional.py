@@ -0,0 +1,79 @@
+import hashlib
+import os
+from flask import current_app, make_response, request, session
+from flask_login import current_user
+from flask_wtf.csrf import generate_csrf
+from sqlalchemy import func
+from werkzeug.http import is_resource_modified
+from werkzeug.wrappers import Response
+from models import Notification
+from cache import current_versions
+
+# Şablon dosyalarının parmak izi (deploy sonrası eski sayfaların 304 ile dönmemesi için)
+_template_fingerprint = None
+
+
+def template_fingerprint():
+    """templates/ altındaki dosyaların ad ve değişiklik zamanlarından özet"""
+    global _template_fingerprint
+    if _template_fingerprint is None:
+        root = os.path.join(current_app.root_path, current_app.template_folder)
+        entries = []
+        for directory, _, files in os.walk(root):
+            for name in files:
+                path = os.path.join(directory, name)
+                entries.append(f'{os.path.relpath(path, root)}:{os.stat(path).st_mtime_ns}')
+        _template_fingerprint = hashlib.sha1('|'.join(sorted(entries)).encode()).hexdigest()[:12]
+    return _template_fingerprint
+
+
+def notification_validator(query):
+    """Filtrelenmiş bildirim kümesinin (en son updated_at, satır sayısı) değeri
+
+    Sayfa satırlarını yüklemeden tek toplu sorgu ile hesaplanır. Ekleme ve
+    düzenleme updated_at'i, silme satır sayısını değiştirir.
+    """
+    return query.with_entities(func.max(Notification.updated_at), func.count(Notification.id)) \
+        .order_by(None).one()
+
+
+def conditional_response(render, parts=(), versions=()):
+    """Doğrulayıcı değişmediyse gövdeyi üretmeden 304 döndür
+
+    render: yanıt gövdesini üreten fonksiyon (yalnızca gerektiğinde çağrılır)
+    parts: sayfanın içeriğini belirleyen değerler (ör. notification_validator sonucu)
+    versions: sayfada gösterilen referans verilerin önbellek adları ('labs', 'plants', 'users')
+
+    ETag kullanıcıya, oturumun CSRF token'ına ve şablon sürümüne de bağlıdır.
+    Bekleyen flash mesajı varsa sayfa her zaman yeniden üretilir.
+
+    Last-Modified gönderilmez ve If-Modified-Since dikkate alınmaz: en son
+    updated_at satır silinmesini veya laboratuvar/santral/firma adı
+    değişikliklerini göstermez; yalnızca If-Modified-Since gönderen istemci
+    eski içerikle 304 alırdı.
+    """
+    if session.get('_flashes'):
+        return make_response(render())
+
+    # Sayfadaki formların CSRF token'ı oturumdaki değere bağlıdır; ilk istekte oluşturulsun
+    generate_csrf()
+    all_versions = current_versions()
+    key = repr((
+        request.path, request.query_string, getattr(current_user, 'id', None),
+        session.get('csrf_token'), template_fingerprint(),
+        tuple(parts), tuple(all_versions.get(name, 0) for name in versions),
+    ))
+    etag = hashlib.sha1(key.encode()).hexdigest()
+
+    if is_resource_modified(request.environ, etag=etag):
+        response = make_response(render())
+    else:
+        response = Response(status=304)
+
+    response.set_etag(etag, weak=True)
+    # Tarayıcı sayfayı saklayabilir ama her seferinde doğrulatmalıdır
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    response.vary.add('Cookie')
+    return response
+
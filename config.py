@@ -13,8 +13,28 @@ class Config:
         'sqlite:///' + os.path.join(BASE_DIR, 'instance', 'database.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # Bağlantı havuzu: thread'li worker'larda istek başına bir bağlantı.
+    # Yalnızca QueuePool kullanan (dosya veya sunucu) veritabanlarında uygulanır;
+    # bellek içi SQLite bu argümanları kabul etmez (bkz. database.engine_options).
+    SQLALCHEMY_POOL_OPTIONS = {
+        'pool_size': 10,
+        'max_overflow': 10,
+        'pool_timeout': 30,
+    }
+    
+    # Her yeni SQLite bağlantısında uygulanan PRAGMA'lar
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',      # okuyucular yazanları beklemez
+        'synchronous': 'NORMAL',    # WAL ile güvenli; her commit'te fsync yapılmaz
+        'busy_timeout': 5000,       # ms - kilit varsa hata vermeden önce bekle
+        'mmap_size': 268435456,     # 256 MB bellek eşlemeli okuma
+        'cache_size': -32000,       # negatif değer KiB cinsinden (~32 MB)
+        'temp_store': 'MEMORY',
+    }
+    
     # Session ayarları
     PERMANENT_SESSION_LIFETIME = timedelta(hours=2)
+    USER_CACHE_TTL = 60  # saniye - oturum kullanıcısı önbellek süresi
     SESSION_COOKIE_HTTPONLY = True
     SESSION_COOKIE_SAMESITE = 'Lax'
     
@@ -22,6 +42,50 @@ class Config:
     WTF_CSRF_ENABLED = True
     WTF_CSRF_TIME_LIMIT = None
     
+    # Giriş koruması (token bucket: art arda deneme hakkı, bir hakkın geri gelme süresi sn)
+    LOGIN_USERNAME_BUCKET = (5, 60)   # aynı kullanıcı adı için
+    LOGIN_IP_BUCKET = (30, 5)         # aynı IP için (ofislerde çok kullanıcı aynı IP'den gelir)
+    LOGIN_HASH_WORKERS = 2            # aynı anda çalışan şifre doğrulaması (worker süreci başına)
+    LOGIN_HASH_QUEUE = 8              # sırada bekleyebilecek doğrulama; dolunca 429 döner
+    # Önündeki reverse proxy sayısı (Apache/Nginx: 1). 0 ise X-Forwarded-For dikkate alınmaz;
+    # proxy arkasında tüm istemciler proxy adresinden geliyor görünür ve aynı IP sınırını paylaşır
+    PROXY_FIX_X_FOR = int(os.environ.get('PROXY_FIX_X_FOR', 0))
+    # Yeni şifre özetlerinin yöntemi; farklı özetler başarılı girişte bu yönteme çevrilir
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD') or 'pbkdf2:sha256:600000'
+    
     # Uygulama ayarları
     ITEMS_PER_PAGE = 50
+    MAX_ITEMS_PER_PAGE = 500
+    MY_NOTIFICATIONS_DAYS = 30  # Bildirimlerim sayfasında varsayılan olarak gösterilen geçmiş gün
+    BULK_IMPORT_MAX_ROWS = 10000  # tek seferde içe aktarılabilecek satır
+    DUPLICATE_WINDOW_MINUTES = 60  # aynı YİBF/gün/kat için bu kadar yakın döküm saati mükerrer sayılır
+    
+    # Arşiv: döküm tarihi bu kadar günden eski bildirimler archive-notifications ile arşive taşınır
+    ARCHIVE_RETENTION_DAYS = int(os.environ.get('ARCHIVE_RETENTION_DAYS', 365))
+    ARCHIVE_BATCH_SIZE = 1000  # taşıma transaction'ı başına bildirim
+    
+    # Yedekleme (flask backup-db): SQLite online backup API ile adım adım kopya
+    BACKUP_DIR = os.environ.get('BACKUP_DIR') or os.path.join(BASE_DIR, 'instance', 'backups')
+    BACKUP_KEEP = int(os.environ.get('BACKUP_KEEP', 14))  # saklanan en yeni yedek sayısı
+    BACKUP_PAGES = 256           # adım başına sayfa (4 KiB sayfada ~1 MB)
+    BACKUP_STEP_PAUSE = 0.005    # sn - adımlar arasında yazanlara bırakılan süre
+    BACKUP_MAX_RESTARTS = 3      # araya giren yazmalarla bu kadar baştan başlarsa tek adımda kopyala
+    BACKUP_COMPRESS = True       # gzip
+    
+    # Canlı pano (SSE)
+    LIVE_POLL_SECONDS = 1.0           # yeni olayların okunma aralığı (süreç başına tek sorgu)
+    LIVE_HEARTBEAT_SECONDS = 15
+    LIVE_STREAM_SECONDS = 600         # bağlantı kapatılır, tarayıcı kaldığı olaydan yeniden bağlanır
+    LIVE_RETRY_MS = 3000
+    # Worker süreci başına açık tutulan akış; fazlası LIVE_POLL_RETRY_MS aralıkla yoklama yapar.
+    # Senkron worker'da her akış bir thread tutar (tek thread'li worker: 0, gevent: yüksek değer)
+    LIVE_MAX_STREAMS = int(os.environ.get('LIVE_MAX_STREAMS', 4))
+    LIVE_POLL_RETRY_MS = 10000
+    LIVE_BATCH_SIZE = 500             # daha fazla kaçırılmış olay varsa sayfa yeniden yüklenir
+    LIVE_QUEUE_SIZE = 1000            # gönderilemeyen olay sınırı (bağlantı başına)
+    LIVE_EVENT_RETENTION_HOURS = 48
+    
+    # İzleme ayarları
+    SLOW_REQUEST_SECONDS = 1.0  # bu süreyi aşan istekler sorgularıyla birlikte loglanır
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')  # ayarlı değilse /metrics kapalıdır (404)
 
@@ -0,0 +1,47 @@
+import re
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+_PRAGMA_NAME = re.compile(r'^[a-z_]+$')
+
+
+def apply_sqlite_pragmas(dbapi_connection, pragmas):
+    """PRAGMA'ları tek bir DB-API bağlantısına uygula"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            if not _PRAGMA_NAME.match(name):
+                raise ValueError(f'Geçersiz PRAGMA adı: {name}')
+            cursor.execute(f'PRAGMA {name}={value}')
+    finally:
+        cursor.close()
+
+
+def engine_options(database_uri, pool_options, options=None):
+    """create_engine seçenekleri: havuz ayarları yalnızca QueuePool kullanan URL'lerde
+
+    Bellek içi SQLite (sqlite://, :memory:, mode=memory) StaticPool /
+    SingletonThreadPool ile açılır; bunlar pool_size gibi argümanları reddeder.
+    """
+    url = make_url(database_uri)
+    in_memory = url.get_backend_name() == 'sqlite' and (
+        url.database in (None, '', ':memory:') or url.query.get('mode') == 'memory')
+    return {**({} if in_memory else pool_options), **(options or {})}
+
+
+def configure_sqlite(engine, pragmas):
+    """SQLite engine'inin açtığı her bağlantıya PRAGMA'ları uygula
+
+    journal_mode=WAL veritabanı dosyasında kalıcıdır; diğerleri bağlantı
+    bazlı olduğundan havuzdaki her yeni bağlantıda tekrar ayarlanır.
+    """
+    if engine.dialect.name != 'sqlite' or not pragmas:
+        return False
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        apply_sqlite_pragmas(dbapi_connection, pragmas)
+
+    return True
+
+
@@ -1,5 +1,5 @@
 from functools import wraps
-from flask import flash, redirect, url_for
+from flask import flash, redirect, url_for, jsonify
 from flask_login import current_user
 
 def admin_required(f):
@@ -29,3 +29,15 @@ def password_change_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
+
+def api_login_required(f):
+    """JSON API için giriş kontrolü (yönlendirme yerine JSON hata döndürür)"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if not current_user.is_authenticated:
+            return jsonify({'error': 'Bu işlem için giriş yapmalısınız.'}), 401
+        if current_user.must_change_password:
+            return jsonify({'error': 'Devam etmek için şifrenizi değiştirmelisiniz.'}), 403
+        return f(*args, **kwargs)
+    return decorated_function
+
@@ -0,0 +1,95 @@
+from sqlalchemy import select, tuple_
+from models import db, Notification, parse_dokum_zamani
+
+# Tek sorguda aranan (yibf_no, dokum_tarihi) çifti
+LOOKUP_BATCH_SIZE = 500
+
+
+def _normalize_kat(value):
+    """Kat/bölge karşılaştırması için boşluk ve büyük/küçük harf farklarını yok say"""
+    return ' '.join((value or '').split()).casefold()
+
+
+def _is_near(a, b, window):
+    return a is not None and b is not None and abs(a - b) <= window
+
+
+def duplicate_query(yibf_no, dokum_tarihi, dokum_dakika, window, exclude_id=None):
+    """Aynı YİBF ve günde `window` dakika içindeki bildirimler
+
+    ix_notifications_yibf_tarih_dakika üzerinde tek aralık araması yapılır
+    (yibf_no = ? AND dokum_tarihi = ? AND dokum_dakika BETWEEN ...).
+    """
+    query = db.session.query(Notification.id, Notification.dokum_zamani, Notification.kat_bolge).filter(
+        Notification.yibf_no == yibf_no,
+        Notification.dokum_tarihi == dokum_tarihi,
+        Notification.dokum_dakika.between(dokum_dakika - window, dokum_dakika + window),
+    )
+    if exclude_id is not None:
+        query = query.filter(Notification.id != exclude_id)
+    return query
+
+
+def find_duplicates(yibf_no, dokum_tarihi, dokum_dakika, kat_bolge, window, exclude_id=None):
+    """Aynı YİBF, gün ve kat/bölgede `window` dakika içindeki bildirimler
+
+    Kat/bölge karşılaştırması indeksten dönen birkaç satırda yapılır. Diğer
+    firmaların bildirimleri de sayılır: laboratuvar açısından aynı döküm.
+    """
+    if dokum_dakika is None:
+        return []
+    query = duplicate_query(yibf_no, dokum_tarihi, dokum_dakika, window, exclude_id)
+    kat = _normalize_kat(kat_bolge)
+    return [row for row in query if _normalize_kat(row.kat_bolge) == kat]
+
+
+def form_duplicates(form, window, notification=None):
+    """NotificationForm'daki döküm için mükerrer uyarıları (diğer firmaların bilgisi gösterilmez)
+
+    Düzenlemede YİBF, tarih, saat ve kat/bölge değişmediyse kontrol yapılmaz;
+    daha önce onaylanmış bir kayıt her düzenlemede tekrar uyarı vermez.
+    """
+    dokum_dakika = parse_dokum_zamani(form.dokum_zamani.data)
+    if notification is not None and (
+            notification.yibf_no == form.yibf_no.data
+            and notification.dokum_tarihi == form.dokum_tarihi.data
+            and notification.dokum_dakika == dokum_dakika
+            and _normalize_kat(notification.kat_bolge) == _normalize_kat(form.kat_bolge.data)):
+        return []
+    duplicates = find_duplicates(form.yibf_no.data, form.dokum_tarihi.data, dokum_dakika, form.kat_bolge.data,
+                                 window, exclude_id=notification.id if notification is not None else None)
+    return [f'Aynı YİBF, tarih ve kat/bölge için {row.dokum_zamani} dökümü zaten bildirilmiş.'
+            for row in duplicates]
+
+
+def find_bulk_duplicates(records, line_numbers, window):
+    """Toplu içe aktarılacak kayıtlarda mükerrer dökümler: [(satır no, mesaj)]
+
+    Mevcut bildirimler (yibf_no, dokum_tarihi) çiftleri üzerinden
+    LOOKUP_BATCH_SIZE'lık IN sorgularıyla aynı indeksten okunur; aynı dosyada
+    iki kez yer alan dökümler de işaretlenir.
+    """
+    keys = sorted({(record['yibf_no'], record['dokum_tarihi']) for record in records})
+    existing = {}
+    for start in range(0, len(keys), LOOKUP_BATCH_SIZE):
+        rows = db.session.execute(
+            select(Notification.yibf_no, Notification.dokum_tarihi, Notification.dokum_dakika,
+                   Notification.dokum_zamani, Notification.kat_bolge)
+            .where(tuple_(Notification.yibf_no, Notification.dokum_tarihi).in_(keys[start:start + LOOKUP_BATCH_SIZE]))
+        )
+        for row in rows:
+            key = (row.yibf_no, row.dokum_tarihi, _normalize_kat(row.kat_bolge))
+            existing.setdefault(key, []).append((row.dokum_dakika, f'{row.dokum_zamani} dökümü zaten bildirilmiş'))
+
+    duplicates = []
+    for index, record in enumerate(records):
+        key = (record['yibf_no'], record['dokum_tarihi'], _normalize_kat(record['kat_bolge']))
+        candidates = existing.setdefault(key, [])
+        match = next((message for dakika, message in candidates
+                      if _is_near(dakika, record['dokum_dakika'], window)), None)
+        if match:
+            duplicates.append((line_numbers[index], f'Mükerrer döküm: aynı YİBF, tarih ve kat/bölge için {match}'))
+        candidates.append((record['dokum_dakika'],
+                           f'{line_numbers[index]}. satırdaki {record["dokum_zamani"]} dökümü ile aynı'))
+    return duplicates
+
@@ -0,0 +1,225 @@
+import csv
+import io
+import re
+import zipfile
+from datetime import date
+from xml.sax.saxutils import escape
+from sqlalchemy import select
+from models import db, Notification, User, Laboratuvar, BetonSantrali
+
+# Sunucu tarafı cursor'dan tek seferde okunan satır sayısı
+EXPORT_CHUNK_SIZE = 1000
+
+EXPORT_HEADERS = ['Döküm Tarihi', 'Döküm Zamanı', 'YİBF No', 'Yapı Denetim', 'Beton Miktarı',
+                  'Beton Miktarı (m³)', 'Kat/Bölge', 'Beton Santrali', 'Laboratuvar', 'Açıklama']
+
+
+def export_select():
+    """Dışa aktarım için hafif (ORM nesnesi oluşturmayan) sütun sorgusu"""
+    return select(
+        Notification.dokum_tarihi,
+        Notification.dokum_zamani,
+        Notification.yibf_no,
+        User.company_name,
+        Notification.beton_miktari,
+        Notification.beton_miktari_m3,
+        Notification.kat_bolge,
+        BetonSantrali.ad.label('beton_santrali'),
+        Laboratuvar.ad.label('laboratuvar'),
+        Notification.aciklama,
+    ).join(User, Notification.user_id == User.id) \
+     .join(BetonSantrali, Notification.beton_santrali_id == BetonSantrali.id) \
+     .join(Laboratuvar, Notification.laboratuvar_id == Laboratuvar.id)
+
+
+def iter_export_chunks(statement):
+    """Sorgu sonucunu EXPORT_CHUNK_SIZE satırlık parçalar halinde akıt (sabit bellek)"""
+    result = db.session.execute(statement.execution_options(yield_per=EXPORT_CHUNK_SIZE))
+    for chunk in result.partitions():
+        yield chunk
+
+
+def iter_export_rows(statement):
+    """iter_export_chunks satırlarını tek tek döndür (akışla üretilen şablonlar için)"""
+    for chunk in iter_export_chunks(statement):
+        yield from chunk
+
+
+# ==================== CSV ====================
+
+# Excel/LibreOffice bu karakterlerle başlayan hücreyi formül olarak çalıştırır
+_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _csv_text(value):
+    """Kullanıcı metnini formül olarak yorumlanmayacak şekilde yaz (başına ' eklenir)"""
+    if value is None:
+        return ''
+    return "'" + value if value.startswith(_FORMULA_PREFIXES) else value
+
+
+def generate_csv(statement):
+    """CSV çıktısını parça parça üret (Excel uyumlu: UTF-8 BOM, ';' ayraç)
+
+    Metin hücreleri _csv_text'ten geçer (CSV formül enjeksiyonu). XLSX'te
+    hücreler inlineStr olarak yazıldığından formül çalışmaz.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=';')
+
+    buffer.write('\ufeff')
+    writer.writerow(EXPORT_HEADERS)
+    for chunk in iter_export_chunks(statement):
+        for row in chunk:
+            writer.writerow([
+                row[0].strftime('%d.%m.%Y'), *(_csv_text(v) for v in row[1:5]),
+                '' if row[5] is None else str(row[5]).replace('.', ','),
+                *(_csv_text(v) for v in row[6:10]),
+            ])
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+# ==================== XLSX ====================
+
+class _ChunkBuffer(io.RawIOBase):
+    """Yazılan baytları biriktiren, seek desteklemeyen dosya nesnesi
+
+    zipfile seek edilemeyen çıktıda data descriptor kullanır; böylece arşiv
+    bellekte tamamlanmadan parça parça gönderilebilir.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def pop(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+_XLSX_STATIC_PARTS = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/styles.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/workbook.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Bildirimler" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '<Relationship Id="rId2" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+        'Target="styles.xml"/>'
+        '</Relationships>'
+    ),
+    # Stil 1: tarih (gg.aa.yyyy), stil 2: iki ondalıklı sayı
+    'xl/styles.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        '<numFmts count="1"><numFmt numFmtId="164" formatCode="dd.mm.yyyy"/></numFmts>'
+        '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+        '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+        '<fill><patternFill patternType="gray125"/></fill></fills>'
+        '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+        '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        '<cellXfs count="3">'
+        '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+        '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+        '<xf numFmtId="2" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+        '</cellXfs>'
+        '</styleSheet>'
+    ),
+}
+
+# XML 1.0'da geçersiz kontrol karakterleri
+_INVALID_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+_EXCEL_EPOCH = date(1899, 12, 30)
+
+
+def _text_cell(value):
+    if value is None or value == '':
+        return '<c/>'
+    text = escape(_INVALID_XML_CHARS.sub('', str(value)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _date_cell(value):
+    return f'<c s="1"><v>{(value - _EXCEL_EPOCH).days}</v></c>'
+
+
+def _number_cell(value):
+    if value is None:
+        return '<c/>'
+    return f'<c s="2"><v>{value}</v></c>'
+
+
+def generate_xlsx(statement):
+    """XLSX çıktısını parça parça üret; çalışma sayfası satırları akışla yazılır"""
+    buffer = _ChunkBuffer()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in _XLSX_STATIC_PARTS.items():
+            archive.writestr(name, content)
+        yield buffer.pop()
+
+        with archive.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+            sheet.write((
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                '<sheetData><row>' + ''.join(_text_cell(h) for h in EXPORT_HEADERS) + '</row>'
+            ).encode('utf-8'))
+
+            for chunk in iter_export_chunks(statement):
+                rows = []
+                for row in chunk:
+                    rows.append(
+                        '<row>' + _date_cell(row[0]) +
+                        ''.join(_text_cell(v) for v in row[1:5]) +
+                        _number_cell(row[5]) +
+                        ''.join(_text_cell(v) for v in row[6:10]) +
+                        '</row>'
+                    )
+                sheet.write(''.join(rows).encode('utf-8'))
+                yield buffer.pop()
+
+            sheet.write(b'</sheetData></worksheet>')
+
+    yield buffer.pop()
+
@@ -1,8 +1,9 @@
 from flask_wtf import FlaskForm
-from wtforms import StringField, PasswordField, SelectField, TextAreaField, DateField, TimeField
+from flask_wtf.file import FileField, FileAllowed
+from wtforms import StringField, PasswordField, SelectField, TextAreaField, DateField, TimeField, BooleanField
 from wtforms.validators import DataRequired, Length, ValidationError, EqualTo
 from datetime import date, datetime
-import re
+from models import parse_dokum_zamani, parse_beton_miktari
 
 class LoginForm(FlaskForm):
     """Giriş formu"""
@@ -45,12 +46,34 @@ class NotificationForm(FlaskForm):
     dokum_tarihi = DateField('Döküm Tarihi', format='%Y-%m-%d', validators=[DataRequired(message='Döküm tarihi gereklidir')])
     dokum_zamani = StringField('Döküm Zamanı (HH:MM)', validators=[DataRequired(message='Döküm zamanı gereklidir')])
     aciklama = TextAreaField('Açıklama')
+    confirm_duplicate = BooleanField('Mükerrer değil, yine de kaydet')
     
     def validate_dokum_zamani(self, field):
         """Döküm zamanı formatı kontrolü (HH:MM)"""
-        pattern = r'^([0-1]?[0-9]|2[0-3]):[0-5][0-9]$'
-        if not re.match(pattern, field.data):
+        if parse_dokum_zamani(field.data) is None:
             raise ValidationError('Geçersiz zaman formatı. HH:MM formatında giriniz (örn: 14:30)')
+    
+    def beton_miktari_warning(self):
+        """Beton miktarı sayıya çevrilemiyorsa uyarı mesajı (None: uyarı yok)
+
+        "25 m3 C30" gibi serbest metinler (eski kayıtlar dahil) reddedilmez;
+        bildirim kaydedilir, beton_miktari_m3 boş kalır ve m³ toplamlarına girmez.
+        """
+        if self.beton_miktari.data and parse_beton_miktari(self.beton_miktari.data) is None:
+            return 'Beton miktarı sayıya çevrilemedi; m³ toplamlarına dahil edilmeyecek (örn: 25 veya 12,5 giriniz).'
+        return None
+
+
+class BulkImportForm(FlaskForm):
+    """Toplu bildirim içe aktarma formu (CSV dosyası veya yapıştırılan satırlar)"""
+    csv_file = FileField('CSV Dosyası', validators=[FileAllowed(['csv', 'txt'], 'Sadece CSV dosyası yükleyebilirsiniz')])
+    rows = TextAreaField('Satırlar')
+    confirm_duplicates = BooleanField('Mükerrer görünen satırları da ekle')
+    
+    def validate_rows(self, field):
+        """Dosya veya satırlardan en az biri girilmeli"""
+        if not self.csv_file.data and not (field.data or '').strip():
+            raise ValidationError('CSV dosyası seçiniz veya satırları yapıştırınız')
 
 
 class UserForm(FlaskForm):
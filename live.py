@@ -0,0 +1,372 @@
+import json
+import threading
+import time
+from collections import deque, namedtuple
+from datetime import timedelta
+from flask import current_app
+from sqlalchemy import delete, event, func, insert, inspect, select
+from sqlalchemy.orm import Session, object_session
+from models import db, Notification, User, Laboratuvar, BetonSantrali, LiveEvent, get_turkey_time
+
+# Pano satırında gösterilen bildirim alanları
+_notifications = Notification.__table__
+ROW_COLUMNS = (
+    _notifications.c.id, _notifications.c.user_id, _notifications.c.yibf_no,
+    _notifications.c.beton_miktari, _notifications.c.kat_bolge,
+    _notifications.c.beton_santrali_id, _notifications.c.laboratuvar_id,
+    _notifications.c.dokum_tarihi, _notifications.c.dokum_zamani, _notifications.c.dokum_dakika,
+    _notifications.c.aciklama, User.company_name,
+    BetonSantrali.ad.label('beton_santrali'), Laboratuvar.ad.label('laboratuvar'),
+)
+
+# Saklama süresi dolan olayların silinme aralığı (sn, süreç başına)
+PRUNE_INTERVAL = 600
+_next_prune = 0.0
+_prune_lock = threading.Lock()
+
+# Yayınlanan olay: days, olayın etkilediği döküm tarihleri (tarih değiştiyse eskisi de)
+LiveMessage = namedtuple('LiveMessage', ['id', 'kind', 'notification_id', 'user_id', 'days', 'row'])
+
+
+# ==================== OLAY KAYDI ====================
+
+def _pending_events(target):
+    return object_session(target).info.setdefault('live_events', [])
+
+
+@event.listens_for(Notification, 'after_insert')
+def _notification_inserted(mapper, connection, target):
+    _pending_events(target).append({'kind': 'added', 'notification_id': target.id,
+                                    'user_id': target.user_id, 'dokum_tarihi': target.dokum_tarihi})
+
+
+@event.listens_for(Notification, 'after_update')
+def _notification_updated(mapper, connection, target):
+    history = inspect(target).attrs.dokum_tarihi.history
+    old_day = history.deleted[0] if history.deleted else None
+    _pending_events(target).append({'kind': 'updated', 'notification_id': target.id,
+                                    'user_id': target.user_id, 'dokum_tarihi': target.dokum_tarihi,
+                                    'old_dokum_tarihi': old_day if old_day != target.dokum_tarihi else None})
+
+
+@event.listens_for(Notification, 'after_delete')
+def _notification_deleted(mapper, connection, target):
+    _pending_events(target).append({'kind': 'removed', 'notification_id': target.id,
+                                    'user_id': target.user_id, 'dokum_tarihi': target.dokum_tarihi})
+
+
+@event.listens_for(Session, 'after_flush')
+def _flush_live_events(session, flush_context):
+    """Biriken olayları aynı transaction içinde yaz (commit edilmeyen değişiklik yayınlanmaz)"""
+    events = session.info.pop('live_events', None)
+    if events:
+        now = get_turkey_time()
+        session.connection().execute(insert(LiveEvent.__table__),
+                                     [dict({'old_dokum_tarihi': None}, **item, created_at=now)
+                                      for item in events])
+        _prune_if_due(session.connection())
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_live_events(session, previous_transaction):
+    session.info.pop('live_events', None)
+
+
+def publish_reload(connection, days):
+    """Toplu değişiklik: etkilenen günlerin panoları yeniden yüklensin (çağıranın transaction'ı içinde)"""
+    now = get_turkey_time()
+    connection.execute(insert(LiveEvent.__table__),
+                       [{'kind': 'reload', 'dokum_tarihi': day, 'created_at': now} for day in set(days)])
+    _prune_if_due(connection)
+
+
+def _delete_expired(connection):
+    cutoff = get_turkey_time() - timedelta(hours=current_app.config['LIVE_EVENT_RETENTION_HOURS'])
+    return connection.execute(delete(LiveEvent.__table__).where(LiveEvent.created_at < cutoff)).rowcount
+
+
+def _prune_if_due(connection):
+    """Olay yazan transaction'da en fazla PRUNE_INTERVAL'da bir eski olayları sil
+
+    Olaylar yalnızca yazmalarla çoğaldığından temizlik de yazma yolunda yapılır;
+    canlı pano açık olmasa da (veya LIVE_MAX_STREAMS=0 iken) tablo büyümez.
+    Silme created_at indeksinden yapılır.
+    """
+    global _next_prune
+    with _prune_lock:
+        if time.monotonic() < _next_prune:
+            return
+        _next_prune = time.monotonic() + PRUNE_INTERVAL
+    _delete_expired(connection)
+
+
+# ==================== OKUMA ====================
+
+def row_payload(row):
+    """Pano satırı (JSON)"""
+    return {
+        'id': row.id, 'user_id': row.user_id, 'yibf_no': row.yibf_no,
+        'beton_miktari': row.beton_miktari, 'kat_bolge': row.kat_bolge,
+        'beton_santrali_id': row.beton_santrali_id, 'beton_santrali': row.beton_santrali,
+        'laboratuvar_id': row.laboratuvar_id, 'laboratuvar': row.laboratuvar,
+        'company_name': row.company_name, 'dokum_tarihi': row.dokum_tarihi.isoformat(),
+        'dokum_zamani': row.dokum_zamani, 'dokum_dakika': row.dokum_dakika, 'aciklama': row.aciklama,
+    }
+
+
+def board_rows(day, user_id=None):
+    """Günün bildirimleri (döküm saatine göre sıralı, pano satırı olarak)"""
+    statement = select(*ROW_COLUMNS).select_from(_notifications) \
+        .join(User, User.id == _notifications.c.user_id) \
+        .join(BetonSantrali, BetonSantrali.id == _notifications.c.beton_santrali_id) \
+        .join(Laboratuvar, Laboratuvar.id == _notifications.c.laboratuvar_id) \
+        .where(_notifications.c.dokum_tarihi == day) \
+        .order_by(_notifications.c.dokum_dakika, _notifications.c.id)
+    if user_id is not None:
+        statement = statement.where(_notifications.c.user_id == user_id)
+    return [row_payload(row) for row in db.session.execute(statement)]
+
+
+def last_event_id():
+    return db.session.query(func.max(LiveEvent.id)).scalar() or 0
+
+
+def read_events(after_id, limit, day=None):
+    """after_id'den sonraki olaylar; bildirim hâlâ varsa güncel satırıyla birlikte"""
+    events = LiveEvent.__table__
+    statement = select(events.c.id.label('event_id'), events.c.kind, events.c.notification_id,
+                       events.c.user_id.label('event_user_id'), events.c.dokum_tarihi.label('event_tarihi'),
+                       events.c.old_dokum_tarihi, *ROW_COLUMNS).select_from(events) \
+        .outerjoin(_notifications, _notifications.c.id == events.c.notification_id) \
+        .outerjoin(User, User.id == _notifications.c.user_id) \
+        .outerjoin(BetonSantrali, BetonSantrali.id == _notifications.c.beton_santrali_id) \
+        .outerjoin(Laboratuvar, Laboratuvar.id == _notifications.c.laboratuvar_id) \
+        .where(events.c.id > after_id).order_by(events.c.id).limit(limit)
+    if day is not None:
+        statement = statement.where((events.c.dokum_tarihi == day) | (events.c.old_dokum_tarihi == day))
+
+    result = []
+    for row in db.session.execute(statement):
+        kind = row.kind
+        if kind in ('added', 'updated') and row.id is None:
+            # Olaydan sonra silinmiş; silme olayı ayrıca gelir
+            kind = 'removed'
+        result.append(LiveMessage(
+            id=row.event_id, kind=kind, notification_id=row.notification_id, user_id=row.event_user_id,
+            days=frozenset(value for value in (row.event_tarihi, row.old_dokum_tarihi) if value is not None),
+            row=row_payload(row) if kind in ('added', 'updated') else None,
+        ))
+    return result
+
+
+def prune_events():
+    """Saklama süresi dolan olayları sil; silinen olay sayısını döndür"""
+    count = _delete_expired(db.session.connection())
+    db.session.commit()
+    return count
+
+
+def oldest_event_id():
+    return db.session.query(func.min(LiveEvent.id)).scalar()
+
+
+# ==================== YAYIN ====================
+# Her süreçte tek bir thread yeni olayları okuyup abonelere dağıtır; bağlantı
+# başına veritabanı sorgusu yapılmaz. gevent worker'ında thread ve Event'ler
+# greenlet'e dönüştüğünden boşta bekleyen bağlantılar thread tutmaz.
+
+class Subscriber:
+    """Tek SSE bağlantısının olay kuyruğu"""
+
+    def __init__(self, accepts, max_events):
+        self.accepts = accepts
+        self.max_events = max_events
+        self.events = deque()
+        self.overflow = False
+        self.ready = threading.Event()
+
+    def push(self, messages):
+        messages = [message for message in messages if self.accepts(message)]
+        if not messages:
+            return
+        if len(self.events) + len(messages) > self.max_events:
+            # Bağlantı yetişemiyor; istemci sayfayı yeniden yükleyecek
+            self.overflow = True
+        else:
+            self.events.extend(messages)
+        self.ready.set()
+
+    def wait(self, timeout):
+        """Yeni olay gelene kadar (en fazla timeout sn) bekle; gelen olayları döndür"""
+        self.ready.wait(timeout)
+        self.ready.clear()
+        messages = []
+        while self.events:
+            messages.append(self.events.popleft())
+        return messages
+
+
+class LiveBroker:
+    """Süreç içi olay dağıtıcı"""
+
+    def __init__(self):
+        self.subscribers = set()
+        self.lock = threading.Lock()
+        self.thread = None
+        self.last_id = None
+        self.streams = 0
+
+    def acquire_stream(self, limit):
+        """Açık akış sayısı `limit`'in altındaysa yer ayır (False: istemci yoklama yapmalı)"""
+        with self.lock:
+            if self.streams >= limit:
+                return False
+            self.streams += 1
+            return True
+
+    def release_stream(self):
+        with self.lock:
+            self.streams -= 1
+
+    def subscribe(self, app, subscriber):
+        """Aboneyi ekle (uygulama context'i içinde; ilk abonede okuma thread'i başlar)"""
+        with self.lock:
+            if self.thread is None:
+                self.last_id = last_event_id()
+                self.thread = threading.Thread(target=self._run, args=(app,), name='live-events', daemon=True)
+                self.thread.start()
+            self.subscribers.add(subscriber)
+
+    def unsubscribe(self, subscriber):
+        with self.lock:
+            self.subscribers.discard(subscriber)
+
+    def _current_subscribers(self):
+        with self.lock:
+            return list(self.subscribers)
+
+    def _run(self, app):
+        interval = app.config['LIVE_POLL_SECONDS']
+        while True:
+            try:
+                with app.app_context():
+                    try:
+                        subscribers = self._current_subscribers()
+                        if subscribers:
+                            self._poll(subscribers, app.config['LIVE_BATCH_SIZE'])
+                        else:
+                            # Dinleyen yokken olaylar okunmaz. Son id aboneler yeniden kontrol
+                            # edilmeden önce alınır: sonra gelen abone aradaki olayları kendisi okur.
+                            newest = last_event_id()
+                            if not self._current_subscribers():
+                                self.last_id = newest
+                    finally:
+                        db.session.remove()
+            except Exception:
+                app.logger.exception('Canlı pano olayları okunamadı')
+            time.sleep(interval)
+
+    def _poll(self, subscribers, batch_size):
+        while True:
+            messages = read_events(self.last_id, batch_size)
+            if not messages:
+                return
+            self.last_id = messages[-1].id
+            for subscriber in subscribers:
+                subscriber.push(messages)
+            if len(messages) < batch_size:
+                return
+
+
+broker = LiveBroker()
+
+
+def format_sse(message=None, event='change', data=None):
+    """SSE mesajı (message verilirse id ve olay verisi ondan alınır)"""
+    lines = []
+    if message is not None:
+        lines.append(f'id: {message.id}')
+        data = {'kind': message.kind, 'id': message.notification_id, 'row': message.row}
+    lines.append(f'event: {event}')
+    lines.append('data: ' + json.dumps(data, ensure_ascii=False))
+    return '\n'.join(lines) + '\n\n'
+
+
+def event_stream(day, after_id, user_id=None):
+    """Günün panosu için SSE akışı (generator)
+
+    after_id: istemcinin aldığı son olay (Last-Event-ID). Aradaki olaylar önce
+    veritabanından gönderilir; olaylar silinmişse ya da çok fazlaysa istemciye
+    sayfayı yeniden yüklemesi söylenir. user_id verilirse yalnızca o kullanıcının
+    bildirimleri gönderilir. Uygulama context'i içinde çağrılmalıdır; dönen
+    generator context gerektirmez.
+
+    Süreçte LIVE_MAX_STREAMS akış açıksa bağlantı açık tutulmaz: aradaki
+    olaylar ve 'polling' olayı gönderilip akış kapatılır, tarayıcı
+    LIVE_POLL_RETRY_MS sonra Last-Event-ID ile yeniden bağlanır.
+    """
+    app = current_app._get_current_object()
+    config = app.config
+
+    def accepts(message):
+        if message.kind == 'reload':
+            return day in message.days
+        return day in message.days and (user_id is None or message.user_id == user_id)
+
+    streaming = broker.acquire_stream(config['LIVE_MAX_STREAMS'])
+    subscriber = Subscriber(accepts, config['LIVE_QUEUE_SIZE'])
+    # Önce abone ol, sonra aradaki olayları oku: iki yoldan gelen olay id ile elenir
+    if streaming:
+        broker.subscribe(app, subscriber)
+    try:
+        oldest = oldest_event_id()
+        backlog = read_events(after_id, config['LIVE_BATCH_SIZE'] + 1, day)
+    except Exception:
+        if streaming:
+            broker.unsubscribe(subscriber)
+            broker.release_stream()
+        raise
+    finally:
+        db.session.remove()
+    reload = (oldest is not None and after_id < oldest - 1) or len(backlog) > config['LIVE_BATCH_SIZE']
+
+    def generate():
+        sent_id = after_id
+        try:
+            retry = config['LIVE_RETRY_MS'] if streaming else config['LIVE_POLL_RETRY_MS']
+            yield f'retry: {retry}\n\n'
+            if reload:
+                yield format_sse(event='reload', data={})
+                return
+            if not streaming:
+                yield format_sse(event='polling', data={'retry': retry})
+            pending = backlog
+            deadline = time.monotonic() + config['LIVE_STREAM_SECONDS']
+            while time.monotonic() < deadline:
+                for message in pending:
+                    if message.id <= sent_id or not accepts(message):
+                        continue
+                    sent_id = message.id
+                    if message.kind == 'reload':
+                        yield format_sse(message, event='reload')
+                        return
+                    yield format_sse(message)
+                if not streaming:
+                    # Filtrelenen olaylar da okundu: sonraki yoklama onlardan sonra başlasın
+                    if backlog and backlog[-1].id > sent_id:
+                        yield f'id: {backlog[-1].id}\n\n'
+                    return
+                if subscriber.overflow:
+                    yield format_sse(event='reload', data={})
+                    return
+                pending = subscriber.wait(config['LIVE_HEARTBEAT_SECONDS'])
+                if not pending:
+                    # Bağlantıyı açık tut; kopmuşsa yazma hatasıyla generator kapanır
+                    yield ': ping\n\n'
+        finally:
+            if streaming:
+                broker.unsubscribe(subscriber)
+                broker.release_stream()
+
+    return generate()
+
@@ -0,0 +1,229 @@
+import hmac
+import threading
+import time
+from flask import Response, abort, current_app, g, has_request_context, request
+from flask.signals import before_render_template, template_rendered
+from sqlalchemy import event
+
+# Gecikme histogramlarının üst sınırları (saniye)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# İstek başına SQL sorgu sayısı histogramı
+STATEMENT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 500)
+
+# Yavaş istek kaydına yazılan en fazla sorgu ve parametre uzunluğu
+SLOW_LOG_MAX_STATEMENTS = 50
+SLOW_LOG_MAX_PARAMS = 300
+
+METRICS_PATH = '/metrics'
+
+
+def _label_value(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values, extra=()):
+    pairs = [f'{name}="{_label_value(value)}"' for name, value in zip(names, values)]
+    pairs += [f'{name}="{value}"' for name, value in extra]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name, help, labels):
+        self.name, self.help, self.label_names = name, help, labels
+        self.values = {}
+
+    def inc(self, labels, amount=1):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} counter']
+        for labels, value in sorted(self.values.items()):
+            lines.append(f'{self.name}{_labels(self.label_names, labels)} {_number(value)}')
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help, labels, buckets):
+        self.name, self.help, self.label_names, self.buckets = name, help, labels, buckets
+        self.values = {}  # labels -> [bucket sayıları..., toplam, adet]
+
+    def observe(self, labels, value):
+        data = self.values.get(labels)
+        if data is None:
+            data = self.values[labels] = [0] * len(self.buckets) + [0.0, 0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                data[i] += 1
+        data[-2] += value
+        data[-1] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        for labels, data in sorted(self.values.items()):
+            for bound, count in zip(self.buckets, data):
+                bucket_labels = _labels(self.label_names, labels, [('le', _number(bound))])
+                lines.append(f'{self.name}_bucket{bucket_labels} {count}')
+            lines.append(f'{self.name}_bucket{_labels(self.label_names, labels, [("le", "+Inf")])} {data[-1]}')
+            lines.append(f'{self.name}_sum{_labels(self.label_names, labels)} {_number(data[-2])}')
+            lines.append(f'{self.name}_count{_labels(self.label_names, labels)} {data[-1]}')
+        return lines
+
+
+# ==================== METRİKLER ====================
+# Süreç içi (worker başına) değerler; thread'ler arasında _lock ile korunur
+
+_lock = threading.Lock()
+
+REQUESTS = Counter('betonbildirim_requests_total', 'Tamamlanan HTTP istekleri',
+                   ('endpoint', 'method', 'status'))
+REQUEST_DURATION = Histogram('betonbildirim_request_duration_seconds', 'İstek süresi',
+                             ('endpoint',), LATENCY_BUCKETS)
+TEMPLATE_DURATION = Histogram('betonbildirim_template_render_seconds', 'İstek başına şablon üretme süresi',
+                              ('endpoint',), LATENCY_BUCKETS)
+SQL_DURATION = Histogram('betonbildirim_sql_duration_seconds', 'İstek başına toplam SQL süresi',
+                         ('endpoint',), LATENCY_BUCKETS)
+SQL_STATEMENTS = Histogram('betonbildirim_sql_statements', 'İstek başına SQL sorgu sayısı',
+                           ('endpoint',), STATEMENT_BUCKETS)
+SLOW_REQUESTS = Counter('betonbildirim_slow_requests_total', 'Eşik süresini aşan istekler', ('endpoint',))
+
+ALL_METRICS = (REQUESTS, REQUEST_DURATION, TEMPLATE_DURATION, SQL_DURATION, SQL_STATEMENTS, SLOW_REQUESTS)
+
+
+def render_metrics():
+    """Prometheus metin biçimi"""
+    with _lock:
+        lines = []
+        for metric in ALL_METRICS:
+            lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+# ==================== İSTEK ÖLÇÜMÜ ====================
+
+class RequestStats:
+    """Tek isteğin ölçümleri (g.request_stats)"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.template_time = 0.0
+        self.template_started = None
+        self.statements = []  # yavaş istek kaydı için (süre, sorgu, parametreler)
+
+
+def _current_stats():
+    if not has_request_context():
+        return None
+    return g.get('request_stats')
+
+
+def _start_request():
+    if request.path != METRICS_PATH:
+        g.request_stats = RequestStats()
+
+
+def _finish_request(response):
+    stats = g.pop('request_stats', None)
+    if stats is None:
+        return response
+
+    elapsed = time.perf_counter() - stats.started
+    endpoint = request.endpoint or 'none'
+    slow = elapsed >= current_app.config['SLOW_REQUEST_SECONDS']
+    with _lock:
+        REQUESTS.inc((endpoint, request.method, response.status_code))
+        REQUEST_DURATION.observe((endpoint,), elapsed)
+        TEMPLATE_DURATION.observe((endpoint,), stats.template_time)
+        SQL_DURATION.observe((endpoint,), stats.sql_time)
+        SQL_STATEMENTS.observe((endpoint,), stats.sql_count)
+        if slow:
+            SLOW_REQUESTS.inc((endpoint,))
+
+    if slow:
+        _log_slow_request(endpoint, response, elapsed, stats)
+    return response
+
+
+def _log_slow_request(endpoint, response, elapsed, stats):
+    lines = [f'Yavaş istek: {request.method} {request.full_path.rstrip("?")} ({endpoint}) '
+             f'-> {response.status_code} {elapsed * 1000:.0f} ms; '
+             f'SQL {stats.sql_count} sorgu {stats.sql_time * 1000:.0f} ms, '
+             f'şablon {stats.template_time * 1000:.0f} ms']
+    for duration, statement, parameters in stats.statements:
+        params = repr(parameters)
+        if len(params) > SLOW_LOG_MAX_PARAMS:
+            params = params[:SLOW_LOG_MAX_PARAMS] + '...'
+        lines.append(f'  [{duration * 1000:.1f} ms] {" ".join(statement.split())} -- {params}')
+    if stats.sql_count > len(stats.statements):
+        lines.append(f'  ... {stats.sql_count - len(stats.statements)} sorgu daha')
+    current_app.logger.warning('\n'.join(lines))
+
+
+def _template_started(sender, template, context, **extra):
+    stats = _current_stats()
+    if stats is not None:
+        stats.template_started = time.perf_counter()
+
+
+def _template_finished(sender, template, context, **extra):
+    stats = _current_stats()
+    if stats is not None and stats.template_started is not None:
+        stats.template_time += time.perf_counter() - stats.template_started
+        stats.template_started = None
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats() is not None:
+        conn.info['query_started'] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats()
+    started = conn.info.pop('query_started', None)
+    if stats is None or started is None:
+        return
+    duration = time.perf_counter() - started
+    stats.sql_count += 1
+    stats.sql_time += duration
+    if len(stats.statements) < SLOW_LOG_MAX_STATEMENTS:
+        stats.statements.append((duration, statement, parameters))
+
+
+def metrics_endpoint():
+    """Prometheus /metrics (Bearer METRICS_TOKEN ile; token ayarlı değilse endpoint kapalı: 404)
+
+    İstemci adresine güvenilmez: reverse proxy arkasında tüm istekler
+    localhost'tan geliyor görünür.
+    """
+    token = current_app.config.get('METRICS_TOKEN')
+    if not token:
+        abort(404)
+    supplied = request.headers.get('Authorization', '')
+    if not hmac.compare_digest(supplied.encode(), f'Bearer {token}'.encode()):
+        abort(403)
+    return Response(render_metrics(), content_type='text/plain; version=0.0.4')
+
+
+def init_metrics(app):
+    """İstek süresi ve şablon ölçümünü, /metrics endpoint'ini kaydet
+
+    Diğer after_request fonksiyonlarından (ör. sıkıştırma) sonra çalışması için
+    diğer eklentilerden önce çağrılmalıdır.
+    """
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    before_render_template.connect(_template_started, app)
+    template_rendered.connect(_template_finished, app)
+    app.add_url_rule(METRICS_PATH, 'metrics', metrics_endpoint)
+
+
+def instrument_engine(engine):
+    """Engine üzerindeki her SQL sorgusunun süresini o isteğe ekle"""
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
@@ -0,0 +1,156 @@
+from sqlalchemy import func, inspect, select, text, update
+from models import (db, Notification, ArchivedNotification, StatCounter, MonthlyRollup, parse_dokum_zamani,
+                    format_dokum_zamani, parse_beton_miktari)
+from search import init_search_index, FTS_TABLE
+from cache import ensure_cache_versions
+from stats import reconcile_counters, rebuild_rollups
+
+# Yeni composite indekslerin öneki olduğu ya da yerini aldığı eski indeksler
+OBSOLETE_INDEXES = [
+    'ix_notifications_user_id', 'ix_notifications_dokum_tarihi',
+    'ix_notifications_user_tarih_zaman', 'ix_notifications_lab_tarih_zaman',
+    'ix_notifications_santral_tarih_zaman', 'ix_notifications_tarih_zaman',
+    'ix_notifications_yibf_no',
+]
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def upgrade_schema():
+    """Mevcut veritabanını güncel şemaya getir (idempotent, tekrar çalıştırılabilir)
+
+    Eksik tablolar, sütunlar ve indeksler oluşturulur, gereksiz kalan indeksler
+    kaldırılır, türetilmiş sütunlar doldurulur. Uygulama çalışırken de güvenle
+    çalıştırılabilir; her adım mevcut durumu kontrol ederek yapılır.
+
+    Dönen sözlük: eklenen sütunlar, oluşturulan indeksler, AUTOINCREMENT ile
+    yeniden oluşturulan tablolar ve sayıya çevrilemeyen bildirim satırları.
+    """
+    db.create_all()
+
+    report = {'columns': [], 'indexes': [], 'rebuilt': [], 'unparsed': []}
+    with db.engine.begin() as conn:
+        inspector = inspect(conn)
+
+        # Sonradan modele eklenen (nullable) sütunlar
+        for table in db.metadata.sorted_tables:
+            existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing_columns:
+                    column_type = column.type.compile(dialect=conn.dialect)
+                    conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+                    report['columns'].append(f'{table.name}.{column.name}')
+
+        for name in OBSOLETE_INDEXES:
+            conn.execute(text(f'DROP INDEX IF EXISTS {name}'))
+
+        if conn.dialect.name == 'sqlite':
+            if rebuild_with_autoincrement(conn, Notification.__table__):
+                report['rebuilt'].append(Notification.__tablename__)
+            reserve_archived_ids(conn)
+
+        existing = {
+            table.name: {index['name'] for index in inspector.get_indexes(table.name)}
+            for table in db.metadata.sorted_tables
+        }
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                if index.name not in existing[table.name]:
+                    index.create(conn)
+                    report['indexes'].append(index.name)
+
+    report['unparsed'] = backfill_notification_numbers()
+
+    init_search_index()
+    ensure_cache_versions()
+
+    # Sayaç tablosu yeni oluşturulduysa mevcut verilerden doldur
+    if StatCounter.query.first() is None:
+        reconcile_counters()
+    # Aylık özet tablosu yeni oluşturulduysa mevcut bildirimlerden doldur
+    if MonthlyRollup.query.first() is None and Notification.query.first() is not None:
+        rebuild_rollups()
+    return report
+
+
+def rebuild_with_autoincrement(conn, table):
+    """AUTOINCREMENT'sız oluşturulmuş SQLite tablosunu aynı id'lerle yeniden oluştur
+
+    SQLite ALTER TABLE ile AUTOINCREMENT eklenemez: indeksler ve arama
+    trigger'ları silinir, tablo yeniden adlandırılıp modele göre yeniden
+    oluşturulur ve satırlar kopyalanır. Trigger'ları init_search_index tekrar
+    kurar; rowid'ler değişmediğinden arama indeksi geçerli kalır.
+    """
+    sql = conn.execute(text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                       {'name': table.name}).scalar()
+    if sql is None or 'AUTOINCREMENT' in sql.upper():
+        return False
+
+    for suffix in ('ai', 'ad', 'au'):
+        conn.execute(text(f'DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}'))
+    for index in inspect(conn).get_indexes(table.name):
+        conn.execute(text(f'DROP INDEX IF EXISTS {index["name"]}'))
+    conn.execute(text(f'ALTER TABLE {table.name} RENAME TO {table.name}_old'))
+    table.create(conn)
+    columns = ', '.join(column.name for column in table.columns)
+    conn.execute(text(f'INSERT INTO {table.name} ({columns}) SELECT {columns} FROM {table.name}_old'))
+    conn.execute(text(f'DROP TABLE {table.name}_old'))
+    return True
+
+
+def reserve_archived_ids(conn):
+    """notifications id sırasını arşivdeki en büyük id'nin üzerine taşı
+
+    Arşiv, tablo AUTOINCREMENT olmadan önce doldurulduysa yeni bildirimler
+    arşivdeki id'leri tekrar alabilirdi.
+    """
+    archived_max = conn.execute(select(func.max(ArchivedNotification.id))).scalar()
+    if archived_max is None:
+        return
+    seq = conn.execute(text("SELECT seq FROM sqlite_sequence WHERE name = 'notifications'")).scalar()
+    if seq is None:
+        conn.execute(text("INSERT INTO sqlite_sequence (name, seq) VALUES ('notifications', :seq)"),
+                     {'seq': archived_max})
+    elif seq < archived_max:
+        conn.execute(text("UPDATE sqlite_sequence SET seq = :seq WHERE name = 'notifications'"),
+                     {'seq': archived_max})
+
+
+def backfill_notification_numbers():
+    """beton_miktari_m3 ve dokum_dakika sütunlarını metin alanlarından doldur
+
+    Çevrilemeyen satırlar NULL bırakılır ve (id, yibf_no, beton_miktari,
+    dokum_zamani) listesi olarak döndürülür; bir sonraki çalıştırmada yeniden denenir.
+    """
+    table = Notification.__table__
+    unparsed = []
+    last_id = 0
+    while True:
+        rows = db.session.execute(
+            select(table.c.id, table.c.yibf_no, table.c.beton_miktari, table.c.dokum_zamani)
+            .where(table.c.id > last_id)
+            .where(table.c.beton_miktari_m3.is_(None) | table.c.dokum_dakika.is_(None))
+            .order_by(table.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+
+        for row in rows:
+            amount = parse_beton_miktari(row.beton_miktari)
+            minutes = parse_dokum_zamani(row.dokum_zamani)
+            if amount is None or minutes is None:
+                unparsed.append((row.id, row.yibf_no, row.beton_miktari, row.dokum_zamani))
+
+            values = {'beton_miktari_m3': amount, 'dokum_dakika': minutes,
+                      # Veri düzeltmesi kullanıcı değişikliği değildir; updated_at korunur
+                      'updated_at': table.c.updated_at}
+            if minutes is not None:
+                values['dokum_zamani'] = format_dokum_zamani(minutes)
+            db.session.execute(update(table).where(table.c.id == row.id).values(**values))
+
+        db.session.commit()
+        last_id = rows[-1].id
+
+    return unparsed
+
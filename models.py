@@ -1,8 +1,12 @@
+from flask import current_app
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy.orm import validates
 from datetime import datetime
+from decimal import Decimal, InvalidOperation
 import pytz
+import re
 
 db = SQLAlchemy()
 
@@ -13,6 +17,34 @@ def get_turkey_time():
     """Türkiye saatini döndür"""
     return datetime.now(TURKEY_TZ)
 
+
+DOKUM_ZAMANI_PATTERN = re.compile(r'^([0-1]?[0-9]|2[0-3]):([0-5][0-9])$')
+BETON_MIKTARI_PATTERN = re.compile(r'^(\d+(?:[.,]\d+)?)\s*(?:m3|m³|m\^3|mt3|metreküp)?\.?$', re.IGNORECASE)
+
+
+def parse_dokum_zamani(value):
+    """'HH:MM' formatındaki döküm zamanını gece yarısından itibaren dakikaya çevir (geçersizse None)"""
+    match = DOKUM_ZAMANI_PATTERN.match((value or '').strip())
+    if not match:
+        return None
+    return int(match.group(1)) * 60 + int(match.group(2))
+
+
+def format_dokum_zamani(minutes):
+    """Dakika değerini 'HH:MM' formatına çevir"""
+    return f'{minutes // 60:02d}:{minutes % 60:02d}'
+
+
+def parse_beton_miktari(value):
+    """'25', '12,5', '30 m³' gibi beton miktarını m³ cinsinden Decimal'e çevir (geçersizse None)"""
+    match = BETON_MIKTARI_PATTERN.match((value or '').strip())
+    if not match:
+        return None
+    try:
+        return Decimal(match.group(1).replace(',', '.')).quantize(Decimal('0.01'))
+    except InvalidOperation:
+        return None
+
 class User(UserMixin, db.Model):
     """Kullanıcı modeli - Admin ve Yapı Denetim kullanıcıları"""
     __tablename__ = 'users'
@@ -30,8 +62,8 @@ class User(UserMixin, db.Model):
     notifications = db.relationship('Notification', backref='user', lazy='dynamic', cascade='all, delete-orphan')
     
     def set_password(self, password):
-        """Şifreyi hashleyerek kaydet"""
-        self.password_hash = generate_password_hash(password, method='pbkdf2:sha256')
+        """Şifreyi hashleyerek kaydet (yöntem: PASSWORD_HASH_METHOD)"""
+        self.password_hash = generate_password_hash(password, method=current_app.config['PASSWORD_HASH_METHOD'])
     
     def check_password(self, password):
         """Şifre kontrolü"""
@@ -48,24 +80,92 @@ class User(UserMixin, db.Model):
 class Notification(db.Model):
     """Beton bildirim modeli"""
     __tablename__ = 'notifications'
+    __table_args__ = (
+        # dashboard / my_notifications: user_id filtresi + tarih, saat sırası
+        db.Index('ix_notifications_user_tarih_dakika', 'user_id', 'dokum_tarihi', 'dokum_dakika'),
+        # Admin filtreleri: laboratuvar / santral + tarih
+        db.Index('ix_notifications_lab_tarih_dakika', 'laboratuvar_id', 'dokum_tarihi', 'dokum_dakika'),
+        db.Index('ix_notifications_santral_tarih_dakika', 'beton_santrali_id', 'dokum_tarihi', 'dokum_dakika'),
+        # Admin listesi varsayılan sırası ve "bugün" filtresi
+        db.Index('ix_notifications_tarih_dakika', 'dokum_tarihi', 'dokum_dakika'),
+        # Mükerrer döküm kontrolü: aynı YİBF + gün + saat aralığı
+        db.Index('ix_notifications_yibf_tarih_dakika', 'yibf_no', 'dokum_tarihi', 'dokum_dakika'),
+        # Arşive taşınan en büyük id yeni bildirime tekrar verilmesin (arşivde id tekil)
+        {'sqlite_autoincrement': True},
+    )
     
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
-    yibf_no = db.Column(db.String(100), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    yibf_no = db.Column(db.String(100), nullable=False)
     beton_miktari = db.Column(db.String(100), nullable=False)
+    beton_miktari_m3 = db.Column(db.Numeric(10, 2), nullable=True)  # beton_miktari'ndan hesaplanır
     kat_bolge = db.Column(db.String(200), nullable=False)
     beton_santrali_id = db.Column(db.Integer, db.ForeignKey('beton_santralleri.id'), nullable=False)
     laboratuvar_id = db.Column(db.Integer, db.ForeignKey('laboratuvarlar.id'), nullable=False)
     dokum_zamani = db.Column(db.String(5), nullable=False)  # HH:MM formatında
-    dokum_tarihi = db.Column(db.Date, nullable=False, index=True)
+    dokum_dakika = db.Column(db.Integer, nullable=True)  # gece yarısından itibaren dakika
+    dokum_tarihi = db.Column(db.Date, nullable=False)
     aciklama = db.Column(db.Text, nullable=True)
     created_at = db.Column(db.DateTime, default=get_turkey_time, nullable=False)
     updated_at = db.Column(db.DateTime, default=get_turkey_time, onupdate=get_turkey_time, nullable=False)
     
+    @validates('dokum_zamani')
+    def _set_dokum_zamani(self, key, value):
+        """Döküm zamanını HH:MM olarak normalize et ve dakika sütununu güncelle"""
+        self.dokum_dakika = parse_dokum_zamani(value)
+        if self.dokum_dakika is not None:
+            return format_dokum_zamani(self.dokum_dakika)
+        return value
+    
+    @validates('beton_miktari')
+    def _set_beton_miktari(self, key, value):
+        """Sayısal m³ sütununu metin alanıyla senkron tut"""
+        self.beton_miktari_m3 = parse_beton_miktari(value)
+        return value
+    
+    def can_be_modified_by(self, user):
+        """Bildirimi görüntüleme/düzenleme/silme yetkisi: sahibi veya admin"""
+        return self.user_id == user.id or user.is_admin()
+    
     def __repr__(self):
         return f'<Notification {self.yibf_no} - {self.dokum_tarihi}>'
 
 
+class ArchivedNotification(db.Model):
+    """Saklama süresini aşmış bildirimler (soğuk katman) - salt okunur
+    
+    Sütunlar notifications ile aynıdır; archive-notifications komutu eski
+    bildirimleri buraya taşır. Listeler ve dışa aktarım yalnızca "arşiv dahil"
+    seçeneğiyle bu tabloyu da okur.
+    """
+    __tablename__ = 'notifications_archive'
+    __table_args__ = (
+        db.Index('ix_notifications_archive_tarih_dakika', 'dokum_tarihi', 'dokum_dakika'),
+        db.Index('ix_notifications_archive_user_tarih', 'user_id', 'dokum_tarihi'),
+        db.Index('ix_notifications_archive_lab', 'laboratuvar_id'),
+        db.Index('ix_notifications_archive_santral', 'beton_santrali_id'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)  # notifications.id
+    user_id = db.Column(db.Integer, nullable=False)
+    yibf_no = db.Column(db.String(100), nullable=False)
+    beton_miktari = db.Column(db.String(100), nullable=False)
+    beton_miktari_m3 = db.Column(db.Numeric(10, 2), nullable=True)
+    kat_bolge = db.Column(db.String(200), nullable=False)
+    beton_santrali_id = db.Column(db.Integer, nullable=False)
+    laboratuvar_id = db.Column(db.Integer, nullable=False)
+    dokum_zamani = db.Column(db.String(5), nullable=False)
+    dokum_dakika = db.Column(db.Integer, nullable=True)
+    dokum_tarihi = db.Column(db.Date, nullable=False)
+    aciklama = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False)
+    updated_at = db.Column(db.DateTime, nullable=False)
+    archived_at = db.Column(db.DateTime, default=get_turkey_time, nullable=False)
+    
+    def __repr__(self):
+        return f'<ArchivedNotification {self.yibf_no} - {self.dokum_tarihi}>'
+
+
 class Laboratuvar(db.Model):
     """Laboratuvar modeli"""
     __tablename__ = 'laboratuvarlar'
@@ -97,3 +197,77 @@ class BetonSantrali(db.Model):
     def __repr__(self):
         return f'<BetonSantrali {self.ad}>'
 
+
+class CacheVersion(db.Model):
+    """Önbellek sürüm damgası - process'ler arası önbellek geçersizleştirme için"""
+    __tablename__ = 'cache_versions'
+    
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, default=0, nullable=False)
+    
+    def __repr__(self):
+        return f'<CacheVersion {self.name}={self.version}>'
+
+
+class StatCounter(db.Model):
+    """Admin paneli sayaçları - yazma işlemleriyle aynı transaction'da güncellenir"""
+    __tablename__ = 'stat_counters'
+    
+    key = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.Integer, default=0, nullable=False)
+    
+    def __repr__(self):
+        return f'<StatCounter {self.key}={self.value}>'
+
+class LiveEvent(db.Model):
+    """Canlı pano için bildirim değişiklik kaydı - değişiklikle aynı transaction'da yazılır
+
+    id, SSE olay numarasıdır (Last-Event-ID). Eski kayıtlar periyodik olarak silinir.
+    """
+    __tablename__ = 'live_events'
+    # Olaylar silinse de id'ler yeniden kullanılmasın (istemciler son id'yi saklar)
+    __table_args__ = {'sqlite_autoincrement': True}
+    
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(10), nullable=False)  # 'added', 'updated', 'removed', 'reload'
+    notification_id = db.Column(db.Integer, nullable=True)  # silinen bildirimler için FK yok
+    user_id = db.Column(db.Integer, nullable=True)
+    dokum_tarihi = db.Column(db.Date, nullable=False)
+    old_dokum_tarihi = db.Column(db.Date, nullable=True)  # tarih değiştiyse eski tarih
+    created_at = db.Column(db.DateTime, default=get_turkey_time, nullable=False, index=True)
+    
+    def __repr__(self):
+        return f'<LiveEvent {self.id} {self.kind} {self.notification_id}>'
+
+class ScheduleVersion(db.Model):
+    """Laboratuvar programı önbelleği için (laboratuvar, gün) sürüm damgası
+
+    O laboratuvarın o günkü bildirimleri değiştiğinde aynı transaction içinde artırılır.
+    """
+    __tablename__ = 'schedule_versions'
+    
+    laboratuvar_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    dokum_tarihi = db.Column(db.Date, primary_key=True)
+    version = db.Column(db.Integer, default=0, nullable=False)
+    
+    def __repr__(self):
+        return f'<ScheduleVersion {self.laboratuvar_id} {self.dokum_tarihi}={self.version}>'
+
+class MonthlyRollup(db.Model):
+    """Aylık istatistik özeti - bildirim yazma işlemleriyle aynı transaction'da güncellenir
+
+    Her satır bir ay, yapı denetim firması, beton santrali ve laboratuvar
+    kombinasyonunun döküm sayısı ve toplam m³ değeridir.
+    """
+    __tablename__ = 'monthly_rollups'
+    
+    month = db.Column(db.Date, primary_key=True)  # ayın ilk günü
+    user_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    beton_santrali_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    laboratuvar_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    notification_count = db.Column(db.Integer, default=0, nullable=False)
+    total_m3 = db.Column(db.Numeric(14, 2), default=0, nullable=False)
+    
+    def __repr__(self):
+        return f'<MonthlyRollup {self.month} {self.user_id}/{self.beton_santrali_id}/{self.laboratuvar_id}>'
+
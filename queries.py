@@ -0,0 +1,167 @@
+from datetime import date
+from sqlalchemy import and_, or_, text
+from sqlalchemy.orm import joinedload
+from models import db, Notification, User, Laboratuvar, BetonSantrali
+from search import FTS_COLUMNS, text_search_condition
+
+# DataTables sütun sırası -> sıralama ifadeleri (all_notifications.html ile aynı sırada)
+ADMIN_SORT_COLUMNS = {
+    0: [Notification.dokum_tarihi, Notification.dokum_dakika],
+    1: [Notification.dokum_dakika],
+    2: [Notification.yibf_no],
+    3: [User.company_name],
+    4: [Notification.beton_miktari_m3],
+    5: [Notification.kat_bolge],
+    6: [BetonSantrali.ad],
+    7: [Laboratuvar.ad],
+}
+
+
+def with_list_relations(query, include_user=True):
+    """Liste sayfalarında kullanılan ilişkileri tek sorguda yükle (N+1 önleme)"""
+    options = [joinedload(Notification.beton_santrali), joinedload(Notification.laboratuvar)]
+    if include_user:
+        options.append(joinedload(Notification.user))
+    return query.options(*options)
+
+
+def today_notifications_query(user_id, today):
+    """Kullanıcının bugünkü bildirimleri (dashboard)"""
+    return Notification.query.filter_by(
+        user_id=user_id,
+        dokum_tarihi=today
+    ).order_by(Notification.dokum_dakika)
+
+
+def user_notifications_query(user_id):
+    """Kullanıcının bildirimleri, keyset sayfalama sırasında (my_notifications)"""
+    return order_newest_first(Notification.query.filter_by(user_id=user_id))
+
+
+def order_newest_first(query):
+    """Keyset sayfalama sırası: tarih, saat, id (en yeni önce; saati olmayanlar gün sonunda)"""
+    return query.order_by(Notification.dokum_tarihi.desc(), Notification.dokum_dakika.desc(),
+                          Notification.id.desc())
+
+
+def keyset_after(query, after):
+    """order_newest_first sırasında (dokum_tarihi, dokum_dakika, id) değerinden sonraki satırlar
+
+    OFFSET yerine indeks üzerinde kaldığı yerden devam eder; derin sayfalar da
+    ilk sayfa kadar hızlıdır. SQLite'ta NULL en küçük değerdir (DESC'te sonda).
+    """
+    tarih, dakika, last_id = after
+    same_day = Notification.dokum_tarihi == tarih
+    if dakika is None:
+        later = and_(same_day, Notification.dokum_dakika.is_(None), Notification.id < last_id)
+    else:
+        later = or_(
+            and_(same_day, or_(Notification.dokum_dakika < dakika, Notification.dokum_dakika.is_(None))),
+            and_(same_day, Notification.dokum_dakika == dakika, Notification.id < last_id),
+        )
+    # Dış koşul indeks aralığını sınırlar
+    return query.filter(Notification.dokum_tarihi <= tarih,
+                        or_(Notification.dokum_tarihi < tarih, later))
+
+def _parse_date(value):
+    """'YYYY-MM-DD' parametresini tarihe çevir (geçersizse None)"""
+    try:
+        return date.fromisoformat(value) if value else None
+    except ValueError:
+        return None
+
+
+def parse_notification_filters(args):
+    """Admin bildirim filtrelerini istek parametrelerinden oku"""
+    return {
+        'user_id': args.get('user_id', type=int),
+        'yibf_no': args.get('yibf_no', '').strip(),
+        'lab_id': args.get('lab_id', type=int),
+        'plant_id': args.get('plant_id', type=int),
+        'show_today': args.get('show_today', 'false') == 'true',
+        'start_date': _parse_date(args.get('start_date')),
+        'end_date': _parse_date(args.get('end_date')),
+        'include_archive': args.get('include_archive', 'false') == 'true',
+    }
+
+
+def filter_query_args(filters):
+    """Filtreleri url_for ile tekrar kullanılabilecek istek parametrelerine çevir"""
+    args = {
+        'user_id': filters['user_id'],
+        'yibf_no': filters['yibf_no'] or None,
+        'lab_id': filters['lab_id'],
+        'plant_id': filters['plant_id'],
+        'show_today': 'true' if filters['show_today'] else None,
+        'start_date': filters['start_date'].isoformat() if filters['start_date'] else None,
+        'end_date': filters['end_date'].isoformat() if filters['end_date'] else None,
+        'include_archive': 'true' if filters['include_archive'] else None,
+    }
+    return {key: value for key, value in args.items() if value is not None}
+
+
+def filter_notifications(query, filters, today):
+    """Filtreleri bildirim sorgusuna uygula (ORM Query veya select)"""
+    if filters['user_id']:
+        query = query.filter(Notification.user_id == filters['user_id'])
+    if filters['yibf_no']:
+        query = query.filter(text_search_condition(['yibf_no'], filters['yibf_no'],
+                                                   indexed=not filters.get('include_archive')))
+    if filters['lab_id']:
+        query = query.filter(Notification.laboratuvar_id == filters['lab_id'])
+    if filters['plant_id']:
+        query = query.filter(Notification.beton_santrali_id == filters['plant_id'])
+    if filters['show_today']:
+        query = query.filter(Notification.dokum_tarihi == today)
+    if filters['start_date']:
+        query = query.filter(Notification.dokum_tarihi >= filters['start_date'])
+    if filters['end_date']:
+        query = query.filter(Notification.dokum_tarihi <= filters['end_date'])
+    return query
+
+
+def search_notifications(query, term, indexed=True):
+    """DataTables genel arama kutusu (YİBF, kat/bölge, açıklama)"""
+    if not term:
+        return query
+    return query.filter(text_search_condition(FTS_COLUMNS, term, indexed=indexed))
+
+
+def order_notifications(query, column_index, direction, joined=False):
+    """DataTables sıralama parametresini uygula (bilinmeyen sütunda varsayılan sıra)
+
+    joined: isim tabloları sorguda zaten join edilmiş (export_select)
+    """
+    columns = ADMIN_SORT_COLUMNS.get(column_index)
+    if columns is None:
+        column_index, direction = 0, 'desc'
+        columns = ADMIN_SORT_COLUMNS[0]
+
+    # İsim sütunlarına göre sıralama için ilgili tabloyu join et
+    if not joined:
+        if column_index == 3:
+            query = query.join(User, Notification.user_id == User.id)
+        elif column_index == 6:
+            query = query.join(BetonSantrali, Notification.beton_santrali_id == BetonSantrali.id)
+        elif column_index == 7:
+            query = query.join(Laboratuvar, Notification.laboratuvar_id == Laboratuvar.id)
+
+    descending = direction == 'desc'
+    order_by = [col.desc() if descending else col.asc() for col in columns]
+    # Sayfalar arası kararlı sıra için id ile bitir
+    order_by.append(Notification.id.desc() if descending else Notification.id.asc())
+    return query.order_by(*order_by)
+
+
+def explain_query_plan(query):
+    """SQLite EXPLAIN QUERY PLAN çıktısını satır listesi olarak döndür"""
+    statement = query.statement.compile(db.engine, compile_kwargs={'literal_binds': True})
+    rows = db.session.execute(text(f'EXPLAIN QUERY PLAN {statement}')).fetchall()
+    return [row[-1] for row in rows]
+
+
+def full_table_scans(plan):
+    """Plan satırlarından indeks kullanmayan tablo taramalarını ayıkla"""
+    return [line for line in plan if line.startswith('SCAN ') and ' USING ' not in line
+            and 'VIRTUAL TABLE' not in line]
+
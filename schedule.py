@@ -0,0 +1,150 @@
+from collections import OrderedDict, namedtuple
+from datetime import date, timedelta
+import threading
+from sqlalchemy import event, inspect, insert, update
+from sqlalchemy.orm import Session, object_session
+from models import db, Notification, User, BetonSantrali, ScheduleVersion
+from cache import current_versions
+
+# Programda gösterilen döküm bilgisi
+ScheduleEntry = namedtuple('ScheduleEntry', ['id', 'dokum_zamani', 'yibf_no', 'kat_bolge', 'company_name',
+                                             'beton_santrali', 'beton_miktari', 'beton_miktari_m3', 'aciklama'])
+
+WEEKDAY_NAMES = ('Pazartesi', 'Salı', 'Çarşamba', 'Perşembe', 'Cuma', 'Cumartesi', 'Pazar')
+
+MAX_RANGE_DAYS = 31
+DEFAULT_RANGE_DAYS = 7
+# Process içi önbellekte tutulan en fazla (laboratuvar, gün) sayısı
+CACHE_MAX_DAYS = 5000
+
+# (laboratuvar_id, gün) -> (damga, kayıtlar); en son kullanılan sonda
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+
+# ==================== GEÇERSİZ KILMA ====================
+
+def _pending_changes(target):
+    return object_session(target).info.setdefault('schedule_changes', set())
+
+
+def _old_value(target, attr):
+    history = inspect(target).attrs[attr].history
+    return history.deleted[0] if history.deleted else getattr(target, attr)
+
+
+@event.listens_for(Notification, 'after_insert')
+@event.listens_for(Notification, 'after_delete')
+def _notification_changed(mapper, connection, target):
+    _pending_changes(target).add((target.laboratuvar_id, target.dokum_tarihi))
+
+
+@event.listens_for(Notification, 'after_update')
+def _notification_updated(mapper, connection, target):
+    changes = _pending_changes(target)
+    changes.add((target.laboratuvar_id, target.dokum_tarihi))
+    # Laboratuvar ya da tarih değiştiyse eski günün programı da değişir
+    changes.add((_old_value(target, 'laboratuvar_id'), _old_value(target, 'dokum_tarihi')))
+
+
+@event.listens_for(Session, 'after_flush')
+def _flush_schedule_changes(session, flush_context):
+    changes = session.info.pop('schedule_changes', None)
+    if changes:
+        bump_schedule_versions(session.connection(), changes)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_schedule_changes(session, previous_transaction):
+    session.info.pop('schedule_changes', None)
+
+
+def bump_schedule_versions(connection, changes):
+    """(laboratuvar_id, gün) çiftlerinin sürümünü artır (çağıranın transaction'ı içinde)"""
+    table = ScheduleVersion.__table__
+    for lab_id, day in changes:
+        result = connection.execute(
+            update(table).where(table.c.laboratuvar_id == lab_id, table.c.dokum_tarihi == day)
+            .values(version=table.c.version + 1)
+        )
+        if result.rowcount == 0:
+            connection.execute(insert(table).values(laboratuvar_id=lab_id, dokum_tarihi=day, version=1))
+
+
+# ==================== OKUMA ====================
+
+def schedule_range(start_value, end_value, today):
+    """'YYYY-MM-DD' parametrelerinden (başlangıç, bitiş) - en fazla MAX_RANGE_DAYS gün"""
+    def parse(value):
+        try:
+            return date.fromisoformat(value) if value else None
+        except ValueError:
+            return None
+
+    start = parse(start_value) or today
+    end = parse(end_value) or start + timedelta(days=DEFAULT_RANGE_DAYS - 1)
+    if end < start:
+        end = start
+    return start, min(end, start + timedelta(days=MAX_RANGE_DAYS - 1))
+
+
+def schedule_versions(lab_id, start, end):
+    """Aralıktaki günlerin sürümleri (hiç değişmemiş gün: 0) - tek birincil anahtar aralık sorgusu"""
+    rows = db.session.query(ScheduleVersion.dokum_tarihi, ScheduleVersion.version) \
+        .filter(ScheduleVersion.laboratuvar_id == lab_id,
+                ScheduleVersion.dokum_tarihi.between(start, end)).all()
+    return dict(rows)
+
+
+def schedule_query(lab_id, start, end):
+    """Laboratuvarın tarih aralığındaki dökümleri (lab, tarih, dakika indeksi sırasıyla)"""
+    return db.session.query(
+        Notification.id, Notification.dokum_tarihi, Notification.dokum_zamani, Notification.yibf_no,
+        Notification.kat_bolge, User.company_name, BetonSantrali.ad.label('beton_santrali'),
+        Notification.beton_miktari, Notification.beton_miktari_m3, Notification.aciklama,
+    ).join(User, User.id == Notification.user_id) \
+        .join(BetonSantrali, BetonSantrali.id == Notification.beton_santrali_id) \
+        .filter(Notification.laboratuvar_id == lab_id, Notification.dokum_tarihi.between(start, end)) \
+        .order_by(Notification.dokum_tarihi, Notification.dokum_dakika, Notification.id)
+
+
+def lab_schedule(lab_id, start, end, versions=None):
+    """Günlere göre program: [(gün, (ScheduleEntry, ...)), ...]
+
+    Her gün ayrı önbelleklenir; yalnızca sürümü değişen günler veritabanından
+    (tek sorguyla) yeniden yüklenir. Santral ve firma adları değişince de
+    ('plants', 'users' sürümleri) yeniden yüklenir.
+    """
+    if versions is None:
+        versions = schedule_versions(lab_id, start, end)
+    references = current_versions()
+    reference_stamp = (references.get('plants', 0), references.get('users', 0))
+    days = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+
+    result = {}
+    missing = []
+    with _lock:
+        for day in days:
+            cached = _cache.get((lab_id, day))
+            if cached is not None and cached[0] == (versions.get(day, 0),) + reference_stamp:
+                _cache.move_to_end((lab_id, day))
+                result[day] = cached[1]
+            else:
+                missing.append(day)
+
+    if missing:
+        loaded = {day: [] for day in missing}
+        for row in schedule_query(lab_id, missing[0], missing[-1]):
+            if row.dokum_tarihi in loaded:
+                loaded[row.dokum_tarihi].append(ScheduleEntry(
+                    row.id, row.dokum_zamani, row.yibf_no, row.kat_bolge, row.company_name,
+                    row.beton_santrali, row.beton_miktari, row.beton_miktari_m3, row.aciklama))
+        with _lock:
+            for day, entries in loaded.items():
+                result[day] = tuple(entries)
+                _cache[(lab_id, day)] = ((versions.get(day, 0),) + reference_stamp, result[day])
+            while len(_cache) > CACHE_MAX_DAYS:
+                _cache.popitem(last=False)
+
+    return [(day, result[day]) for day in days]
+
@@ -0,0 +1,99 @@
+from sqlalchemy import column, inspect, literal_column, or_, select, table, text
+from sqlalchemy.exc import OperationalError
+from models import db, Notification
+
+# YİBF, kat/bölge ve açıklama için SQLite FTS5 trigram indeksi.
+# Tablo notifications'ın "external content" indeksidir; trigger'lar ile senkron tutulur.
+FTS_TABLE = 'notifications_fts'
+FTS_COLUMNS = ('yibf_no', 'kat_bolge', 'aciklama')
+
+# Trigram indeksi 3 karakterden kısa aramalarda kullanılamaz
+MIN_TRIGRAM_LENGTH = 3
+
+FTS_SCHEMA = [
+    f"""CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        yibf_no, kat_bolge, aciklama,
+        content='notifications', content_rowid='id', tokenize='trigram'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON notifications BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, yibf_no, kat_bolge, aciklama)
+        VALUES (new.id, new.yibf_no, new.kat_bolge, new.aciklama);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON notifications BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, yibf_no, kat_bolge, aciklama)
+        VALUES ('delete', old.id, old.yibf_no, old.kat_bolge, old.aciklama);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF yibf_no, kat_bolge, aciklama ON notifications BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, yibf_no, kat_bolge, aciklama)
+        VALUES ('delete', old.id, old.yibf_no, old.kat_bolge, old.aciklama);
+        INSERT INTO {FTS_TABLE}(rowid, yibf_no, kat_bolge, aciklama)
+        VALUES (new.id, new.yibf_no, new.kat_bolge, new.aciklama);
+    END""",
+]
+
+# Engine URL -> arama indeksi var mı (her istekte sqlite_master okumamak için)
+_index_available = {}
+
+
+def init_search_index():
+    """Arama indeksini oluştur (yalnızca SQLite, idempotent)"""
+    engine = db.engine
+    if engine.dialect.name != 'sqlite':
+        return False
+
+    if inspect(engine).has_table(FTS_TABLE):
+        # notifications tablosu yeniden oluşturulduysa trigger'ları da silinmiştir
+        with engine.begin() as conn:
+            for statement in FTS_SCHEMA[1:]:
+                conn.execute(text(statement))
+        _index_available[str(engine.url)] = True
+        return True
+
+    try:
+        with engine.begin() as conn:
+            for statement in FTS_SCHEMA:
+                conn.execute(text(statement))
+            # Mevcut bildirimleri indekse ekle
+            conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+    except OperationalError as e:
+        # SQLite FTS5/trigram desteği olmadan derlenmiş olabilir (SQLite < 3.34)
+        print(f"Arama indeksi oluşturulamadı, LIKE aramasına dönülecek: {e}")
+        _index_available[str(engine.url)] = False
+        return False
+
+    _index_available[str(engine.url)] = True
+    return True
+
+
+def search_index_available():
+    """Bu veritabanında FTS5 arama indeksi kullanılabilir mi?"""
+    engine = db.engine
+    key = str(engine.url)
+    if key not in _index_available:
+        _index_available[key] = (engine.dialect.name == 'sqlite' and
+                                 inspect(engine).has_table(FTS_TABLE))
+    return _index_available[key]
+
+
+def _fts_match_query(columns, term):
+    """FTS5 MATCH ifadesi: sütun filtresi + tırnaklı phrase (alt metin eşleşmesi)"""
+    phrase = '"' + term.replace('"', '""') + '"'
+    return '{' + ' '.join(columns) + '} : ' + phrase
+
+
+def text_search_condition(columns, term, indexed=True):
+    """Verilen sütunlarda alt metin araması için WHERE koşulu döndür
+
+    SQLite'ta trigram indeksi kullanılır; diğer veritabanlarında veya çok kısa
+    aramalarda LIKE '%...%' aramasına dönülür. İndeks yalnızca notifications
+    tablosunu kapsar; arşiv dahil sorgularda indexed=False verilir.
+    """
+    if indexed and len(term) >= MIN_TRIGRAM_LENGTH and search_index_available():
+        fts = table(FTS_TABLE, column('rowid'))
+        matching_ids = select(fts.c.rowid).where(
+            literal_column(FTS_TABLE).op('MATCH')(_fts_match_query(columns, term))
+        )
+        return Notification.id.in_(matching_ids)
+
+    return or_(*[getattr(Notification, name).contains(term) for name in columns])
+
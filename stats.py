@@ -0,0 +1,346 @@
+from collections import Counter
+from datetime import date
+from decimal import Decimal
+from sqlalchemy import delete, event, func, insert, inspect, select, union_all, update
+from sqlalchemy.orm import Session, object_session
+from models import (db, User, Notification, ArchivedNotification, Laboratuvar, BetonSantrali, StatCounter,
+                    MonthlyRollup)
+
+# Admin paneli sayaç anahtarları
+USERS_KEY = 'users'
+NOTIFICATIONS_KEY = 'notifications'
+LABS_ACTIVE_KEY = 'labs_active'
+PLANTS_ACTIVE_KEY = 'plants_active'
+
+
+# Aylık özetin anahtar ve değer alanları (bildirimdeki adlarıyla)
+ROLLUP_FIELDS = ('dokum_tarihi', 'user_id', 'beton_santrali_id', 'laboratuvar_id', 'beton_miktari_m3')
+
+
+def daily_key(day):
+    """Günlük bildirim sayacı anahtarı"""
+    return f'notifications:{day.isoformat()}'
+
+
+# ==================== SAYAÇ GÜNCELLEME ====================
+
+def _pending_deltas(target):
+    """Nesnenin session'ında bu flush için biriken sayaç farkları"""
+    return object_session(target).info.setdefault('counter_deltas', Counter())
+
+
+def _pending_rollups(target):
+    """Nesnenin session'ında bu flush için biriken aylık özet farkları"""
+    return object_session(target).info.setdefault('rollup_deltas', {})
+
+
+def _rollup_values(target, previous=False):
+    """Bildirimin ROLLUP_FIELDS değerleri (previous=True: flush öncesi değerler)"""
+    values = []
+    for attr in ROLLUP_FIELDS:
+        history = inspect(target).attrs[attr].history
+        values.append(history.deleted[0] if previous and history.deleted else getattr(target, attr))
+    return values
+
+
+def _history_change(target, attr):
+    """(eski değer, yeni değer) - değişmediyse None"""
+    history = inspect(target).attrs[attr].history
+    if not history.has_changes():
+        return None
+    old = history.deleted[0] if history.deleted else None
+    new = history.added[0] if history.added else None
+    return old, new
+
+
+def notification_deltas(added=(), removed=()):
+    """Eklenen/silinen bildirimlerin (dokum_tarihi listesi) sayaç farkları"""
+    deltas = Counter()
+    for day in added:
+        deltas[NOTIFICATIONS_KEY] += 1
+        deltas[daily_key(day)] += 1
+    for day in removed:
+        deltas[NOTIFICATIONS_KEY] -= 1
+        deltas[daily_key(day)] -= 1
+    return deltas
+
+
+def add_rollup_delta(deltas, dokum_tarihi, user_id, beton_santrali_id, laboratuvar_id, beton_miktari_m3,
+                     sign=1):
+    """Bir bildirimin aylık özetteki payını farklara ekle (sign=-1: çıkar)"""
+    key = (dokum_tarihi.replace(day=1), user_id, beton_santrali_id, laboratuvar_id)
+    count, total = deltas.get(key, (0, Decimal(0)))
+    deltas[key] = (count + sign, total + sign * (beton_miktari_m3 or 0))
+
+
+def apply_counter_deltas(connection, deltas):
+    """Sayaç farklarını veritabanına yaz (çağıranın transaction'ı içinde)"""
+    table = StatCounter.__table__
+    for key, delta in deltas.items():
+        if not delta:
+            continue
+        result = connection.execute(
+            update(table).where(table.c.key == key).values(value=table.c.value + delta)
+        )
+        if result.rowcount == 0:
+            connection.execute(insert(table).values(key=key, value=delta))
+
+
+def apply_rollup_deltas(connection, deltas):
+    """Aylık özet farklarını veritabanına yaz (çağıranın transaction'ı içinde)"""
+    table = MonthlyRollup.__table__
+    for (month, user_id, plant_id, lab_id), (count, total) in deltas.items():
+        if not count and not total:
+            continue
+        conditions = (table.c.month == month, table.c.user_id == user_id,
+                      table.c.beton_santrali_id == plant_id, table.c.laboratuvar_id == lab_id)
+        result = connection.execute(
+            update(table).where(*conditions).values(notification_count=table.c.notification_count + count,
+                                                    total_m3=table.c.total_m3 + total)
+        )
+        if result.rowcount == 0:
+            connection.execute(insert(table).values(month=month, user_id=user_id, beton_santrali_id=plant_id,
+                                                    laboratuvar_id=lab_id, notification_count=count,
+                                                    total_m3=total))
+        elif count < 0:
+            # Bildirimi kalmayan kombinasyonlar tutulmaz
+            connection.execute(delete(table).where(*conditions, table.c.notification_count <= 0))
+
+
+@event.listens_for(Notification, 'after_insert')
+def _notification_inserted(mapper, connection, target):
+    _pending_deltas(target).update(notification_deltas(added=[target.dokum_tarihi]))
+    add_rollup_delta(_pending_rollups(target), *_rollup_values(target))
+
+
+@event.listens_for(Notification, 'after_delete')
+def _notification_deleted(mapper, connection, target):
+    _pending_deltas(target).update(notification_deltas(removed=[target.dokum_tarihi]))
+    add_rollup_delta(_pending_rollups(target), *_rollup_values(target, previous=True), sign=-1)
+
+
+@event.listens_for(Notification, 'after_update')
+def _notification_updated(mapper, connection, target):
+    change = _history_change(target, 'dokum_tarihi')
+    if change and change[0] is not None:
+        deltas = _pending_deltas(target)
+        deltas[daily_key(change[0])] -= 1
+        deltas[daily_key(change[1])] += 1
+    
+    # Ay, firma, santral, laboratuvar ya da miktar değiştiyse eski paydan yeni paya taşınır
+    old, new = _rollup_values(target, previous=True), _rollup_values(target)
+    if old != new:
+        rollups = _pending_rollups(target)
+        add_rollup_delta(rollups, *old, sign=-1)
+        add_rollup_delta(rollups, *new)
+
+
+@event.listens_for(User, 'after_insert')
+def _user_inserted(mapper, connection, target):
+    if target.role == 'user':
+        _pending_deltas(target)[USERS_KEY] += 1
+
+
+@event.listens_for(User, 'after_delete')
+def _user_deleted(mapper, connection, target):
+    if target.role == 'user':
+        _pending_deltas(target)[USERS_KEY] -= 1
+
+
+@event.listens_for(User, 'after_update')
+def _user_updated(mapper, connection, target):
+    change = _history_change(target, 'role')
+    if change and change[0] is not None:
+        _pending_deltas(target)[USERS_KEY] += (change[1] == 'user') - (change[0] == 'user')
+
+
+def _register_active_counter(model, key):
+    """is_active alanı olan referans tabloları için aktif kayıt sayacı"""
+    @event.listens_for(model, 'after_insert')
+    def inserted(mapper, connection, target):
+        if target.is_active:
+            _pending_deltas(target)[key] += 1
+
+    @event.listens_for(model, 'after_delete')
+    def deleted(mapper, connection, target):
+        if target.is_active:
+            _pending_deltas(target)[key] -= 1
+
+    @event.listens_for(model, 'after_update')
+    def updated(mapper, connection, target):
+        change = _history_change(target, 'is_active')
+        if change and change[0] is not None:
+            _pending_deltas(target)[key] += bool(change[1]) - bool(change[0])
+
+
+_register_active_counter(Laboratuvar, LABS_ACTIVE_KEY)
+_register_active_counter(BetonSantrali, PLANTS_ACTIVE_KEY)
+
+
+@event.listens_for(Session, 'after_flush')
+def _flush_counter_deltas(session, flush_context):
+    """Flush sırasında biriken farkları aynı transaction içinde sayaçlara ve aylık özetlere yaz"""
+    deltas = session.info.pop('counter_deltas', None)
+    if deltas:
+        apply_counter_deltas(session.connection(), deltas)
+    rollups = session.info.pop('rollup_deltas', None)
+    if rollups:
+        apply_rollup_deltas(session.connection(), rollups)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_counter_deltas(session, previous_transaction):
+    """Başarısız flush'tan kalan farkları at"""
+    session.info.pop('counter_deltas', None)
+    session.info.pop('rollup_deltas', None)
+
+
+# ==================== OKUMA VE MUTABAKAT ====================
+
+def read_counters(keys):
+    """Verilen sayaçları tek sorguda oku (olmayanlar 0)"""
+    rows = db.session.execute(
+        select(StatCounter.key, StatCounter.value).where(StatCounter.key.in_(keys))
+    ).all()
+    values = dict.fromkeys(keys, 0)
+    values.update(rows)
+    return values
+
+
+def compute_counters():
+    """Sayaçların gerçek değerlerini kaynak tablolardan hesapla"""
+    values = {
+        USERS_KEY: User.query.filter_by(role='user').count(),
+        NOTIFICATIONS_KEY: Notification.query.count(),
+        LABS_ACTIVE_KEY: Laboratuvar.query.filter_by(is_active=True).count(),
+        PLANTS_ACTIVE_KEY: BetonSantrali.query.filter_by(is_active=True).count(),
+    }
+    daily = db.session.query(Notification.dokum_tarihi, func.count(Notification.id)) \
+        .group_by(Notification.dokum_tarihi).all()
+    for day, count in daily:
+        values[daily_key(day)] = count
+    return values
+
+
+def reconcile_counters(repair=True):
+    """Sayaçları gerçek değerlerle karşılaştır, sapmaları döndür ve (istenirse) düzelt
+
+    Dönen sözlük: anahtar -> (sayaçtaki değer, gerçek değer)
+    """
+    expected = compute_counters()
+    stored = dict(db.session.query(StatCounter.key, StatCounter.value).all())
+
+    drift = {}
+    for key in set(expected) | set(stored):
+        actual = expected.get(key, 0)
+        current = stored.get(key)
+        if current != actual and not (current is None and actual == 0):
+            drift[key] = (current, actual)
+
+    if repair and drift:
+        for key, (current, actual) in drift.items():
+            if current is None:
+                db.session.add(StatCounter(key=key, value=actual))
+            elif actual == 0 and key not in expected:
+                StatCounter.query.filter_by(key=key).delete()
+            else:
+                StatCounter.query.filter_by(key=key).update({StatCounter.value: actual})
+        db.session.commit()
+
+    return drift
+
+# ==================== AYLIK ÖZETLER ====================
+# İstatistik sayfası bildirim tablosunu taramaz; yalnızca monthly_rollups okunur.
+
+DEFAULT_STAT_MONTHS = 12
+MAX_STAT_MONTHS = 60
+
+# Dağılım tabloları: boyut adı -> (özet sütunu, referans model, gösterilecek ad)
+ROLLUP_DIMENSIONS = {
+    'company': (MonthlyRollup.user_id, User, User.company_name),
+    'plant': (MonthlyRollup.beton_santrali_id, BetonSantrali, BetonSantrali.ad),
+    'lab': (MonthlyRollup.laboratuvar_id, Laboratuvar, Laboratuvar.ad),
+}
+
+
+def _add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return month.replace(year=index // 12, month=index % 12 + 1, day=1)
+
+
+def month_range(start_value, end_value, today):
+    """'YYYY-MM' parametrelerinden (ilk ay, son ay) - en fazla MAX_STAT_MONTHS ay"""
+    def parse(value):
+        try:
+            return date.fromisoformat(f'{value}-01') if value else None
+        except ValueError:
+            return None
+
+    end = parse(end_value) or today.replace(day=1)
+    start = parse(start_value) or _add_months(end, 1 - DEFAULT_STAT_MONTHS)
+    if start > end:
+        start = end
+    return max(start, _add_months(end, 1 - MAX_STAT_MONTHS)), end
+
+
+def monthly_totals(start_month, end_month):
+    """Aylara göre (ay, döküm sayısı, m³) - aralıktaki boş aylar dahil"""
+    rows = db.session.query(MonthlyRollup.month, func.sum(MonthlyRollup.notification_count),
+                            func.sum(MonthlyRollup.total_m3)) \
+        .filter(MonthlyRollup.month.between(start_month, end_month)) \
+        .group_by(MonthlyRollup.month).all()
+    totals = {month: (count, total) for month, count, total in rows}
+
+    result = []
+    month = start_month
+    while month <= end_month:
+        count, total = totals.get(month, (0, Decimal(0)))
+        result.append((month, count, total))
+        month = _add_months(month, 1)
+    return result
+
+
+def rollup_breakdown_query(dimension, start_month, end_month):
+    """Aralıktaki toplamların firma/santral/laboratuvar dağılımı (m³'e göre azalan)"""
+    column, model, name = ROLLUP_DIMENSIONS[dimension]
+    return db.session.query(name.label('name'),
+                            func.sum(MonthlyRollup.notification_count).label('notifications'),
+                            func.sum(MonthlyRollup.total_m3).label('m3')) \
+        .join(model, model.id == column) \
+        .filter(MonthlyRollup.month.between(start_month, end_month)) \
+        .group_by(column, name) \
+        .order_by(func.sum(MonthlyRollup.total_m3).desc(), name)
+
+
+def rebuild_rollups():
+    """Aylık özetleri bildirim ve arşiv tablolarından baştan oluştur
+
+    Arşive taşınan bildirimler de istatistiklerde kalır. Dönen değer: (özet satırı sayısı, önceki hali farklı olan satır sayısı).
+    Artımlı güncellemeler tutarlıysa ikinci değer 0 olur.
+    """
+    def snapshot():
+        return {(row.month, row.user_id, row.beton_santrali_id, row.laboratuvar_id):
+                (row.notification_count, Decimal(row.total_m3).quantize(Decimal('0.01')))
+                for row in db.session.query(MonthlyRollup).all()}
+
+    before = snapshot()
+    notifications = union_all(*[
+        select(*[table.c[name] for name in ROLLUP_FIELDS])
+        for table in (Notification.__table__, ArchivedNotification.__table__)
+    ]).subquery()
+    month = func.date(notifications.c.dokum_tarihi, 'start of month')
+    group = (month, notifications.c.user_id, notifications.c.beton_santrali_id, notifications.c.laboratuvar_id)
+    source = select(*group, func.count(),
+                    func.coalesce(func.sum(notifications.c.beton_miktari_m3), 0)).group_by(*group)
+
+    table = MonthlyRollup.__table__
+    db.session.execute(delete(table))
+    db.session.execute(insert(table).from_select(
+        ['month', 'user_id', 'beton_santrali_id', 'laboratuvar_id', 'notification_count', 'total_m3'], source))
+    db.session.commit()
+    db.session.expire_all()
+
+    after = snapshot()
+    changed = sum(1 for key in set(before) | set(after) if before.get(key) != after.get(key))
+    return len(after), changed
+